@@ -1,7 +1,9 @@
 from typing import Sequence, Callable, Optional
 import networkx as nx
 from grakn.client import Grakn, GraknSession, SessionType, GraknOptions, TransactionType
-from kglib.utils.graph.thing.queries_to_networkx_graph import build_graph_from_queries
+from kglib.utils.graph.thing.queries_to_networkx_graph import build_graph_from_queries, \
+    build_graphs_from_queries_concurrently
+from kglib.utils.graph.thing.subgraph_cache import SubgraphCache
 
 
 class GraknNetworkxDataSet:
@@ -19,6 +21,8 @@ class GraknNetworkxDataSet:
         session: Optional[GraknSession] = None,
         infer: bool = True,
         transform: Optional[Callable[[nx.Graph], nx.Graph]] = None,
+        max_workers: Optional[int] = None,
+        cache: Optional[SubgraphCache] = None,
     ):
         assert (database and uri) or session
         self._example_indices = example_indices
@@ -28,6 +32,8 @@ class GraknNetworkxDataSet:
         self._uri = uri
         self._database = database
         self._grakn_session = session
+        self._max_workers = max_workers
+        self._cache = cache
 
     @property
     def grakn_session(self):
@@ -49,17 +55,51 @@ class GraknNetworkxDataSet:
         return len(self._example_indices)
 
     def __getitem__(self, idx):
+        if self._max_workers is not None:
+            return self.get_items([idx])[0]
+
         print(type(self._grakn_session))
         example_id = self._example_indices[idx]
         print(f"Fetching subgraph for example {example_id}")
         graph_query_handles = self.get_query_handles_for_id(example_id)
 
+        if self._cache is not None:
+            graph = self._cache.get_or_build(graph_query_handles, self._build_graph)
+        else:
+            graph = self._build_graph(graph_query_handles)
+        return self._finalise(graph, example_id)
+
+    def _build_graph(self, graph_query_handles):
         options = GraknOptions.core()
         options.infer = self._infer
 
         with self.grakn_session.transaction(TransactionType.READ, options=options) as tx:
             # Build a graph from the queries, samplers, and query graphs
-            graph = build_graph_from_queries(graph_query_handles, tx)
+            return build_graph_from_queries(graph_query_handles, tx)
+
+    def get_items(self, idxs):
+        """
+        Fetches the subgraphs of several examples at once, running all of their queries concurrently over the
+        session, with at most `max_workers` read transactions open at a time (8 if `max_workers` was not given).
+        """
+        example_ids = [self._example_indices[idx] for idx in idxs]
+        print(f"Fetching subgraphs for examples {example_ids}")
+        query_handles_per_example = [self.get_query_handles_for_id(example_id) for example_id in example_ids]
+
+        if self._cache is not None:
+            graphs = self._cache.get_or_build_many(query_handles_per_example, self._build_graphs_concurrently)
+        else:
+            graphs = self._build_graphs_concurrently(query_handles_per_example)
+        return [self._finalise(graph, example_id) for graph, example_id in zip(graphs, example_ids)]
+
+    def _build_graphs_concurrently(self, query_handles_per_example):
+        options = GraknOptions.core()
+        options.infer = self._infer
+
+        return build_graphs_from_queries_concurrently(query_handles_per_example, self.grakn_session, options,
+                                                      max_workers=self._max_workers or 8)
+
+    def _finalise(self, graph, example_id):
         graph.name = example_id
         if self._transform:
             graph = self._transform(graph)
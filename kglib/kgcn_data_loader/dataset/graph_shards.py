@@ -0,0 +1,183 @@
+#
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+#
+
+
+import os
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+# The fields of a graph_nets data dict, each stored in its own .npy file
+FIELDS = ('nodes', 'edges', 'receivers', 'senders', 'globals', 'n_node', 'n_edge')
+INDEX_FILE = 'index.npy'
+INPUT_DIRECTORY = 'input'
+TARGET_DIRECTORY = 'target'
+
+
+def _field_path(directory, field):
+    return os.path.join(directory, f'{field}.npy')
+
+
+def write_graph_shard(directory, data_dicts):
+    """
+    Writes graph_nets data dicts to a shard: a directory holding one .npy file per field, in which the graphs are
+    concatenated as they would be in a `GraphsTuple`, and an index of where each graph's nodes and edges start. The
+    arrays are filled through memory maps one graph at a time, so they are never built in memory as a whole
+
+    Args:
+        directory: The directory to write the shard to, created if it doesn't exist
+        data_dicts: A sequence of data dicts, all with the same feature sizes. Senders and receivers index into each
+            graph's own nodes
+    """
+    if len(data_dicts) == 0:
+        raise ValueError('Cannot write a shard of no graphs')
+
+    n_node = np.array([len(data_dict['nodes']) for data_dict in data_dicts], dtype=np.int32)
+    n_edge = np.array([len(data_dict['senders']) for data_dict in data_dicts], dtype=np.int32)
+    node_offsets = np.concatenate([[0], np.cumsum(n_node, dtype=np.int64)])
+    edge_offsets = np.concatenate([[0], np.cumsum(n_edge, dtype=np.int64)])
+
+    num_nodes, num_edges = int(node_offsets[-1]), int(edge_offsets[-1])
+
+    os.makedirs(directory, exist_ok=True)
+    first = data_dicts[0]
+    arrays = {
+        'nodes': open_memmap(_field_path(directory, 'nodes'), mode='w+', dtype=first['nodes'].dtype,
+                             shape=(num_nodes,) + first['nodes'].shape[1:]),
+        'edges': open_memmap(_field_path(directory, 'edges'), mode='w+', dtype=first['edges'].dtype,
+                             shape=(num_edges,) + first['edges'].shape[1:]),
+        'receivers': open_memmap(_field_path(directory, 'receivers'), mode='w+', dtype=np.int32,
+                                 shape=(num_edges,)),
+        'senders': open_memmap(_field_path(directory, 'senders'), mode='w+', dtype=np.int32,
+                               shape=(num_edges,)),
+        'globals': open_memmap(_field_path(directory, 'globals'), mode='w+', dtype=first['globals'].dtype,
+                               shape=(len(data_dicts),) + np.shape(first['globals'])),
+    }
+
+    for i, data_dict in enumerate(data_dicts):
+        node_slice = slice(node_offsets[i], node_offsets[i + 1])
+        edge_slice = slice(edge_offsets[i], edge_offsets[i + 1])
+        arrays['nodes'][node_slice] = data_dict['nodes']
+        arrays['edges'][edge_slice] = data_dict['edges']
+        # Stored as they are in a GraphsTuple, indexing into the nodes of the whole shard
+        arrays['receivers'][edge_slice] = np.asarray(data_dict['receivers']) + node_offsets[i]
+        arrays['senders'][edge_slice] = np.asarray(data_dict['senders']) + node_offsets[i]
+        arrays['globals'][i] = data_dict['globals']
+
+    for array in arrays.values():
+        array.flush()
+    del arrays
+
+    np.save(_field_path(directory, 'n_node'), n_node)
+    np.save(_field_path(directory, 'n_edge'), n_edge)
+    np.save(os.path.join(directory, INDEX_FILE), np.stack([node_offsets, edge_offsets], axis=1))
+
+
+class GraphShard:
+    """
+    Reads a shard written by `write_graph_shard`. The arrays are memory-mapped read-only, so opening a shard is
+    immediate, only the pages that are read are loaded, and processes reading the same shard share the OS page cache
+    """
+    def __init__(self, directory):
+        """
+        Args:
+            directory: The directory the shard was written to
+        """
+        self.directory = directory
+        self.fields = {field: np.load(_field_path(directory, field), mmap_mode='r') for field in FIELDS}
+        index = np.load(os.path.join(directory, INDEX_FILE))
+        self._node_offsets = index[:, 0]
+        self._edge_offsets = index[:, 1]
+
+    def __len__(self):
+        return len(self.fields['n_node'])
+
+    def __getitem__(self, i):
+        """
+        Args:
+            i: Index of a graph in the shard
+
+        Returns:
+            The graph as a data dict. Its nodes, edges and globals are views of the memory-mapped arrays
+        """
+        if not -len(self) <= i < len(self):
+            raise IndexError(f'Graph index {i} is out of range for a shard of {len(self)} graphs')
+        i = i % len(self)
+        data_dict = self.get_range(i, i + 1)
+        data_dict['globals'] = data_dict['globals'][0]
+        data_dict['n_node'] = data_dict['n_node'][0]
+        data_dict['n_edge'] = data_dict['n_edge'][0]
+        return data_dict
+
+    def get_range(self, start, stop):
+        """
+        Slices the graphs [start, stop) from the shard, as they would be held in a `GraphsTuple`
+
+        Args:
+            start: Index of the first graph
+            stop: Index after the last graph
+
+        Returns:
+            A dict of the `GraphsTuple` fields of the graphs. All are views of the memory-mapped arrays, apart from the
+            senders and receivers, which are shifted to index into the graphs' own nodes
+        """
+        node_slice = slice(self._node_offsets[start], self._node_offsets[stop])
+        edge_slice = slice(self._edge_offsets[start], self._edge_offsets[stop])
+        node_offset = np.int32(self._node_offsets[start])
+        return dict(
+            nodes=self.fields['nodes'][node_slice],
+            edges=self.fields['edges'][edge_slice],
+            receivers=self.fields['receivers'][edge_slice] - node_offset,
+            senders=self.fields['senders'][edge_slice] - node_offset,
+            globals=self.fields['globals'][start:stop],
+            n_node=self.fields['n_node'][start:stop],
+            n_edge=self.fields['n_edge'][start:stop],
+        )
+
+
+def write_input_and_target_shards(directory, input_data_dicts, target_data_dicts):
+    """
+    Writes preprocessed input and target graphs, such as those from `encode_graphs_to_data_dicts`, to shards in
+    subdirectories of `directory`, to be read back by `GraphShardDataSet`
+    """
+    if len(input_data_dicts) != len(target_data_dicts):
+        raise ValueError(f'Got {len(input_data_dicts)} input graphs but {len(target_data_dicts)} target graphs')
+    write_graph_shard(os.path.join(directory, INPUT_DIRECTORY), input_data_dicts)
+    write_graph_shard(os.path.join(directory, TARGET_DIRECTORY), target_data_dicts)
+
+
+class GraphShardDataSet:
+    """
+    Loading preprocessed input and target graphs from shards written by `write_input_and_target_shards`, so that
+    training can start without querying Grakn or encoding the graphs again.
+    Each item is a pair of input and target data dicts, read as views of the memory-mapped shards.
+    """
+    def __init__(self, directory):
+        self.directory = directory
+        self.inputs = GraphShard(os.path.join(directory, INPUT_DIRECTORY))
+        self.targets = GraphShard(os.path.join(directory, TARGET_DIRECTORY))
+
+    def __len__(self):
+        return len(self.inputs)
+
+    def __getitem__(self, idx):
+        return self.inputs[idx], self.targets[idx]
+
+    def get_range(self, start, stop):
+        return self.inputs.get_range(start, stop), self.targets.get_range(start, stop)
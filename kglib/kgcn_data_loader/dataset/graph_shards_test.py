@@ -0,0 +1,122 @@
+#
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+#
+
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from kglib.kgcn_data_loader.dataset.graph_shards import write_graph_shard, GraphShard, \
+    write_input_and_target_shards, GraphShardDataSet
+
+
+def create_data_dict(num_nodes, offset=0):
+    return dict(
+        nodes=np.arange(num_nodes * 3, dtype=np.float32).reshape(num_nodes, 3) + offset,
+        edges=np.full((num_nodes - 1, 2), offset, dtype=np.float32),
+        senders=np.arange(num_nodes - 1, dtype=np.int32),
+        receivers=np.arange(1, num_nodes, dtype=np.int32),
+        globals=np.array([offset, 0], dtype=np.float32),
+    )
+
+
+class TestGraphShard(unittest.TestCase):
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self._directory.name, 'shard')
+        self.data_dicts = [create_data_dict(3), create_data_dict(1, offset=10), create_data_dict(4, offset=20)]
+        write_graph_shard(self.directory, self.data_dicts)
+        self.shard = GraphShard(self.directory)
+
+    def tearDown(self):
+        del self.shard
+        self._directory.cleanup()
+
+    def test_length_is_the_number_of_graphs(self):
+        self.assertEqual(3, len(self.shard))
+
+    def test_arrays_are_memory_mapped(self):
+        self.assertIsInstance(self.shard.fields['nodes'], np.memmap)
+
+    def test_graphs_are_read_back_unchanged(self):
+        for i, expected in enumerate(self.data_dicts):
+            with self.subTest(i=i):
+                data_dict = self.shard[i]
+                for field in ('nodes', 'edges', 'senders', 'receivers', 'globals'):
+                    np.testing.assert_array_equal(expected[field], data_dict[field])
+                self.assertEqual(len(expected['nodes']), data_dict['n_node'])
+                self.assertEqual(len(expected['senders']), data_dict['n_edge'])
+
+    def test_negative_index_reads_from_the_end(self):
+        np.testing.assert_array_equal(self.data_dicts[-1]['nodes'], self.shard[-1]['nodes'])
+
+    def test_index_out_of_range_raises(self):
+        with self.assertRaises(IndexError):
+            self.shard[3]
+
+    def test_stored_senders_index_into_the_whole_shard(self):
+        np.testing.assert_array_equal([0, 1, 4, 5, 6], self.shard.fields['senders'])
+        np.testing.assert_array_equal([1, 2, 5, 6, 7], self.shard.fields['receivers'])
+
+    def test_range_shares_memory_with_the_shard(self):
+        graphs = self.shard.get_range(1, 3)
+        self.assertTrue(np.shares_memory(graphs['nodes'], self.shard.fields['nodes']))
+        self.assertTrue(np.shares_memory(graphs['edges'], self.shard.fields['edges']))
+
+    def test_range_senders_index_into_its_own_nodes(self):
+        graphs = self.shard.get_range(1, 3)
+        np.testing.assert_array_equal([1, 2, 3], graphs['senders'])
+        np.testing.assert_array_equal([2, 3, 4], graphs['receivers'])
+        np.testing.assert_array_equal([1, 4], graphs['n_node'])
+        self.assertEqual(5, len(graphs['nodes']))
+
+    def test_writing_no_graphs_raises(self):
+        with self.assertRaises(ValueError):
+            write_graph_shard(os.path.join(self._directory.name, 'empty'), [])
+
+
+class TestGraphShardDataSet(unittest.TestCase):
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.inputs = [create_data_dict(2), create_data_dict(3, offset=1)]
+        self.targets = [create_data_dict(2, offset=5), create_data_dict(3, offset=6)]
+        write_input_and_target_shards(self._directory.name, self.inputs, self.targets)
+        self.dataset = GraphShardDataSet(self._directory.name)
+
+    def tearDown(self):
+        del self.dataset
+        self._directory.cleanup()
+
+    def test_items_are_input_and_target_graphs(self):
+        input_graph, target_graph = self.dataset[1]
+        np.testing.assert_array_equal(self.inputs[1]['nodes'], input_graph['nodes'])
+        np.testing.assert_array_equal(self.targets[1]['nodes'], target_graph['nodes'])
+        self.assertEqual(2, len(self.dataset))
+
+    def test_mismatched_numbers_of_graphs_raises(self):
+        with self.assertRaises(ValueError):
+            write_input_and_target_shards(os.path.join(self._directory.name, 'other'), self.inputs, self.targets[:1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+#
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+#
+
+import networkx as nx
+import numpy as np
+
+from kglib.kgcn_data_loader.encoding.standard_encode import input_features, target_features
+
+
+class EncodedGraph:
+    """
+    A compact, columnar representation of a graph whose types and values have been encoded. Nodes are numbered from 0
+    in the order of the arrays, and each edge is stored as a sender, a receiver, and its type (role) id. Every node and
+    edge takes a few bytes per field, rather than a dict of its own as in a networkx graph.
+    """
+    __slots__ = ('node_types', 'node_values', 'node_solutions', 'senders', 'receivers', 'edge_types',
+                 'edge_solutions', 'concepts', 'name')
+
+    def __init__(self, node_types, node_values, node_solutions, senders, receivers, edge_types, edge_solutions,
+                 concepts=None, name=None):
+        """
+        Args:
+            node_types: Integer array of the index of each node's type
+            node_values: Float array of the encoded value of each node
+            node_solutions: Integer array of the solution of each node
+            senders: Integer array of the sending node of each edge
+            receivers: Integer array of the receiving node of each edge
+            edge_types: Integer array of the index of each edge's type (role)
+            edge_solutions: Integer array of the solution of each edge
+            concepts: Optional sequence of the original node of each node, such as its Thing
+            name: Optional name of the graph
+        """
+        self.node_types = np.asarray(node_types, dtype=np.int32)
+        self.node_values = np.asarray(node_values, dtype=np.float32)
+        self.node_solutions = np.asarray(node_solutions, dtype=np.int8)
+        self.senders = np.asarray(senders, dtype=np.int32)
+        self.receivers = np.asarray(receivers, dtype=np.int32)
+        self.edge_types = np.asarray(edge_types, dtype=np.int32)
+        self.edge_solutions = np.asarray(edge_solutions, dtype=np.int8)
+        self.concepts = concepts
+        self.name = name
+
+    @property
+    def n_node(self):
+        return len(self.node_types)
+
+    @property
+    def n_edge(self):
+        return len(self.senders)
+
+    @classmethod
+    def from_networkx(cls, graph, encoder, solution_attribute='solution'):
+        """
+        Encodes a graph of Grakn concepts straight into arrays, with the same encoding as `SchemaEncoder.encode_types`
+        and `SchemaEncoder.encode_values`, but without writing anything to the graph's data
+
+        Args:
+            graph: The graph to encode, with 'type', 'value' (for attributes) and `solution_attribute` on each node and
+                'type' and `solution_attribute` on each edge
+            encoder: The `SchemaEncoder` to encode types and values with
+            solution_attribute: The name of the data field holding the solution of each node and edge
+
+        Returns:
+            An `EncodedGraph`, its nodes in the order iterated by `graph`, with `graph`'s nodes as the concepts
+        """
+        nodes = list(graph.nodes)
+        node_data = [graph.nodes[node] for node in nodes]
+        node_types = encoder.encode_node_types(node_data)
+        node_values = encoder.encode_node_values(node_data, node_types)
+
+        node_index = {node: i for i, node in enumerate(nodes)}
+        edges = list(graph.edges(data=True))
+        edge_data = [data for _, _, data in edges]
+
+        return cls(node_types=node_types,
+                   node_values=node_values,
+                   node_solutions=[data[solution_attribute] for data in node_data],
+                   senders=[node_index[sender] for sender, _, _ in edges],
+                   receivers=[node_index[receiver] for _, receiver, _ in edges],
+                   edge_types=encoder.encode_edge_types(edge_data),
+                   edge_solutions=[data[solution_attribute] for data in edge_data],
+                   concepts=nodes,
+                   name=graph.graph.get('name'))
+
+    def add_reverse_edges(self):
+        """
+        Duplicates every edge in the reverse direction, as `duplicate_edges_in_reverse` does for networkx graphs
+
+        Returns:
+            A new `EncodedGraph`, with the reversed edges after the originals
+        """
+        return EncodedGraph(self.node_types, self.node_values, self.node_solutions,
+                            np.concatenate([self.senders, self.receivers]),
+                            np.concatenate([self.receivers, self.senders]),
+                            np.tile(self.edge_types, 2),
+                            np.tile(self.edge_solutions, 2),
+                            self.concepts, self.name)
+
+    def to_networkx(self, label_attribute='concept', solution_attribute='solution'):
+        """
+        Returns:
+            A networkx MultiDiGraph, with nodes labelled by integers, holding the same fields as a graph encoded with
+            `SchemaEncoder`: 'categorical_type', 'encoded_value' and the solution on each node and edge, plus the
+            concept of each node under `label_attribute`
+        """
+        graph = nx.MultiDiGraph(name=self.name) if self.name is not None else nx.MultiDiGraph()
+        concepts = self.concepts if self.concepts is not None else [None] * self.n_node
+        graph.add_nodes_from(
+            (i, {label_attribute: concept, 'categorical_type': typ, 'encoded_value': value, solution_attribute: solution})
+            for i, (concept, typ, value, solution) in enumerate(zip(concepts, self.node_types.tolist(),
+                                                                   self.node_values.tolist(),
+                                                                   self.node_solutions.tolist())))
+        graph.add_edges_from(
+            (sender, receiver, {'categorical_type': typ, 'encoded_value': 0, solution_attribute: solution})
+            for sender, receiver, typ, solution in zip(self.senders.tolist(), self.receivers.tolist(),
+                                                       self.edge_types.tolist(), self.edge_solutions.tolist()))
+        return graph
+
+    def node_features(self, preexists_solution=0):
+        """
+        Returns:
+            float32 array of shape [n_node, 3]: whether each node pre-exists, its type and its encoded value
+        """
+        return input_features(self.node_solutions, self.node_types, self.node_values, preexists_solution)
+
+    def edge_features(self, preexists_solution=0):
+        """
+        Returns:
+            float32 array of shape [n_edge, 3]: whether each edge pre-exists, its type and its encoded value, 0
+        """
+        return input_features(self.edge_solutions, self.edge_types, np.zeros(self.n_edge, dtype=np.float32),
+                              preexists_solution)
+
+    def to_data_dicts(self):
+        """
+        Creates the input and target graphs as graph_nets data dicts, the same as `create_input_and_target_data_dicts`
+        gives for the networkx form of this graph
+
+        Returns:
+            The input data dict and the target data dict
+        """
+        structure = dict(senders=self.senders, receivers=self.receivers, n_node=self.n_node, n_edge=self.n_edge)
+        input_data_dict = dict(nodes=self.node_features(),
+                               edges=self.edge_features(),
+                               globals=np.zeros(5, dtype=np.float32),
+                               **structure)
+        target_data_dict = dict(nodes=target_features(self.node_solutions),
+                                edges=target_features(self.edge_solutions),
+                                globals=np.zeros(5, dtype=np.float32),
+                                **structure)
+        return input_data_dict, target_data_dict
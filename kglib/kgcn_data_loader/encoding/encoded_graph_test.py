@@ -0,0 +1,108 @@
+#
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+#
+
+import unittest
+
+import networkx as nx
+import numpy as np
+
+from kglib.kgcn_data_loader.encoding.encoded_graph import EncodedGraph
+from kglib.kgcn_data_loader.encoding.standard_encode import SchemaEncoder, create_input_and_target_data_dicts
+from kglib.kgcn_data_loader.utils import duplicate_edges_in_reverse
+
+NODE_TYPES = ['person', 'name', 'age', 'employment']
+EDGE_TYPES = ['has', 'employee']
+
+
+def create_graph():
+    graph = nx.MultiDiGraph(name=7)
+    graph.add_node('p', type='person', solution=0)
+    graph.add_node('n', type='name', value='Bob', solution=0)
+    graph.add_node('a', type='age', value=25, solution=1)
+    graph.add_node('e', type='employment', solution=2)
+    graph.add_edge('p', 'n', type='has', solution=0)
+    graph.add_edge('p', 'a', type='has', solution=1)
+    graph.add_edge('e', 'p', type='employee', solution=2)
+    return graph
+
+
+def sorted_edge_rows(data_dict):
+    return sorted(zip(data_dict['senders'].tolist(), data_dict['receivers'].tolist(),
+                      map(tuple, data_dict['edges'].tolist())))
+
+
+class TestEncodedGraph(unittest.TestCase):
+
+    def setUp(self):
+        self.encoder = SchemaEncoder(NODE_TYPES, EDGE_TYPES, {'name': ['Alice', 'Bob']}, {'age': (0, 100)})
+
+    def test_arrays_are_encoded_as_expected(self):
+        encoded_graph = EncodedGraph.from_networkx(create_graph(), self.encoder)
+
+        np.testing.assert_array_equal([0, 1, 2, 3], encoded_graph.node_types)
+        np.testing.assert_allclose([0, 1, 0.25, 0], encoded_graph.node_values)
+        np.testing.assert_array_equal([0, 1, 2], encoded_graph.node_solutions[[0, 2, 3]])
+        np.testing.assert_array_equal([0, 0, 3], encoded_graph.senders)
+        np.testing.assert_array_equal([1, 2, 0], encoded_graph.receivers)
+        np.testing.assert_array_equal([0, 0, 1], encoded_graph.edge_types)
+        self.assertEqual(['p', 'n', 'a', 'e'], encoded_graph.concepts)
+        self.assertEqual(7, encoded_graph.name)
+
+    def test_graph_is_not_modified(self):
+        graph = create_graph()
+        EncodedGraph.from_networkx(graph, self.encoder)
+        self.assertEqual({'type', 'value', 'solution'}, set(graph.nodes['n'].keys()))
+
+    def test_reverse_edges_are_added_after_originals(self):
+        encoded_graph = EncodedGraph.from_networkx(create_graph(), self.encoder).add_reverse_edges()
+
+        np.testing.assert_array_equal([0, 0, 3, 1, 2, 0], encoded_graph.senders)
+        np.testing.assert_array_equal([1, 2, 0, 0, 0, 3], encoded_graph.receivers)
+        np.testing.assert_array_equal([0, 0, 1, 0, 0, 1], encoded_graph.edge_types)
+        np.testing.assert_array_equal([0, 1, 2, 0, 1, 2], encoded_graph.edge_solutions)
+
+    def test_data_dicts_match_networkx_encoding(self):
+        graph = self.encoder.encode_values(create_graph())
+        graph = nx.convert_node_labels_to_integers(graph, label_attribute='concept')
+        graph = self.encoder.encode_types(duplicate_edges_in_reverse(graph))
+        expected_input, expected_target = create_input_and_target_data_dicts(graph)
+
+        encoded_graph = EncodedGraph.from_networkx(create_graph(), self.encoder).add_reverse_edges()
+        input_data_dict, target_data_dict = encoded_graph.to_data_dicts()
+
+        np.testing.assert_array_equal(expected_input['nodes'], input_data_dict['nodes'])
+        np.testing.assert_array_equal(expected_target['nodes'], target_data_dict['nodes'])
+        self.assertEqual(sorted_edge_rows(expected_input), sorted_edge_rows(input_data_dict))
+        self.assertEqual(sorted_edge_rows(expected_target), sorted_edge_rows(target_data_dict))
+        self.assertEqual(np.float32, input_data_dict['nodes'].dtype)
+        self.assertEqual(np.float32, input_data_dict['edges'].dtype)
+        self.assertEqual((expected_input['n_node'], expected_input['n_edge']),
+                         (input_data_dict['n_node'], input_data_dict['n_edge']))
+
+    def test_to_networkx(self):
+        encoded_graph = EncodedGraph.from_networkx(create_graph(), self.encoder)
+        graph = encoded_graph.to_networkx()
+
+        self.assertEqual({'concept': 'a', 'categorical_type': 2, 'encoded_value': 0.25, 'solution': 1}, graph.nodes[2])
+        self.assertEqual([(0, 1), (0, 2), (3, 0)], list(graph.edges()))
+        self.assertEqual(7, graph.name)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -64,6 +64,146 @@ def encode_types(graph, iterator_func, types):
     return graph
 
 
+def lookup_indices(index, keys, num_keys):
+    """
+    Look up the index of every key in a dict built from a list of keys, raising a ValueError for an unknown key as
+    `list.index` does
+
+    Args:
+        index: dict mapping each key to its integer index
+        keys: iterable of keys to look up
+        num_keys: the number of keys in `keys`
+
+    Returns:
+        Integer numpy array of the indices
+    """
+    try:
+        return np.fromiter((index[key] for key in keys), dtype=np.int64, count=num_keys)
+    except KeyError as e:
+        raise ValueError(f'{e.args[0]!r} is not in list') from None
+
+
+class SchemaEncoder:
+    """
+    Encodes the types and attribute values of graphs, giving the same results as `encode_types` and `encode_values`.
+    The lookup tables for the schema's types and categories are built once, on construction, and each graph is then
+    encoded with NumPy operations over all of its nodes or edges at once, rather than by searching the list of types
+    for every node and edge.
+    """
+    def __init__(self, node_types, edge_types, categorical_attributes=None, continuous_attributes=None):
+        """
+        Args:
+            node_types: The full list of node types to be encoded in this order
+            edge_types: The full list of edge types to be encoded in this order
+            categorical_attributes: dict of categorical attribute types, values: the list of their categories
+            continuous_attributes: dict of continuous attribute types, values: tuple of their (min, max) values
+        """
+        self._node_type_index = {typ: i for i, typ in enumerate(node_types)}
+        self._edge_type_index = {typ: i for i, typ in enumerate(edge_types)}
+
+        num_node_types = len(node_types)
+        self._is_categorical = np.zeros(num_node_types, dtype=bool)
+        self._category_index = dict()
+        for typ, categories in (categorical_attributes or {}).items():
+            if typ in self._node_type_index:
+                type_index = self._node_type_index[typ]
+                self._is_categorical[type_index] = True
+                self._category_index[type_index] = {category: i for i, category in enumerate(categories)}
+
+        self._is_continuous = np.zeros(num_node_types, dtype=bool)
+        self._continuous_min = np.zeros(num_node_types, dtype=np.float64)
+        self._continuous_range = np.ones(num_node_types, dtype=np.float64)
+        for typ, (min_val, max_val) in (continuous_attributes or {}).items():
+            if typ in self._node_type_index and not self._is_categorical[self._node_type_index[typ]]:
+                type_index = self._node_type_index[typ]
+                self._is_continuous[type_index] = True
+                self._continuous_min[type_index] = min_val
+                self._continuous_range[type_index] = max_val - min_val
+
+    def encode_node_types(self, node_data):
+        """
+        Args:
+            node_data: list of the data dicts of nodes
+
+        Returns:
+            Integer array of the index of each node's type
+        """
+        return lookup_indices(self._node_type_index, (data['type'] for data in node_data), len(node_data))
+
+    def encode_edge_types(self, edge_data):
+        """
+        Args:
+            edge_data: list of the data dicts of edges
+
+        Returns:
+            Integer array of the index of each edge's type
+        """
+        return lookup_indices(self._edge_type_index, (data['type'] for data in edge_data), len(edge_data))
+
+    def encode_node_values(self, node_data, node_type_indices):
+        """
+        Args:
+            node_data: list of the data dicts of nodes
+            node_type_indices: Integer array of the index of each node's type, as given by `encode_node_types`
+
+        Returns:
+            Float array of the encoded value of each node: the category index for categorical attributes, the value
+            scaled by its min and max for continuous attributes, and 0 for all other nodes
+        """
+        encoded_values = np.zeros(len(node_data), dtype=np.float64)
+
+        continuous = np.flatnonzero(self._is_continuous[node_type_indices])
+        if len(continuous) > 0:
+            values = np.fromiter((node_data[i]['value'] for i in continuous), dtype=np.float64, count=len(continuous))
+            continuous_types = node_type_indices[continuous]
+            encoded_values[continuous] = ((values - self._continuous_min[continuous_types])
+                                          / self._continuous_range[continuous_types])
+
+        categorical = np.flatnonzero(self._is_categorical[node_type_indices])
+        if len(categorical) > 0:
+            # Group the categorical nodes by type, so that each type's categories are looked up in one call
+            categorical_types = node_type_indices[categorical]
+            for type_index in np.unique(categorical_types):
+                nodes = categorical[categorical_types == type_index]
+                encoded_values[nodes] = lookup_indices(self._category_index[type_index],
+                                                       (node_data[i]['value'] for i in nodes), len(nodes))
+
+        return encoded_values
+
+    def encode_values(self, graph):
+        """
+        Encodes attribute values as `encode_values` does, storing them as 'encoded_value' on every node and edge
+
+        Returns:
+            The graph, which is also is updated in-place
+        """
+        node_data = list(multidigraph_node_data_iterator(graph))
+        encoded_values = self.encode_node_values(node_data, self.encode_node_types(node_data))
+        for data, encoded_value in zip(node_data, encoded_values.tolist()):
+            data['encoded_value'] = encoded_value
+        for edge_data in multidigraph_edge_data_iterator(graph):
+            edge_data['encoded_value'] = 0
+        return graph
+
+    def encode_types(self, graph):
+        """
+        Encodes types as `encode_types` does, for both nodes and edges, storing them as 'categorical_type'
+
+        Returns:
+            The graph, which is also is updated in-place
+        """
+        node_data = list(multidigraph_node_data_iterator(graph))
+        for data, type_index in zip(node_data, self.encode_node_types(node_data).tolist()):
+            data['categorical_type'] = type_index
+        edge_data = list(multidigraph_edge_data_iterator(graph))
+        for data, type_index in zip(edge_data, self.encode_edge_types(edge_data).tolist()):
+            data['categorical_type'] = type_index
+        return graph
+
+
+SOLUTION_ONE_HOT_ENCODING = np.array([[1., 0., 0.], [0., 1., 0.], [0., 0., 1.]], dtype=np.float32)
+
+
 def create_input_graph(graph):
     input_graph = graph.copy()
 
@@ -83,10 +223,9 @@ def create_input_graph(graph):
 
 def create_target_graph(graph):
     target_graph = graph.copy()
-    solution_one_hot_encoding = np.array([[1., 0., 0.], [0., 1., 0.], [0., 0., 1.]], dtype=np.float32)
 
     for data in multidigraph_data_iterator(target_graph):
-        features = solution_one_hot_encoding[data["solution"]]
+        features = SOLUTION_ONE_HOT_ENCODING[data["solution"]]
         data.clear()
         data["features"] = features
 
@@ -94,6 +233,88 @@ def create_target_graph(graph):
     return target_graph
 
 
+def encoded_data_arrays(data_dicts):
+    """
+    Gathers the encoded fields of node or edge data into arrays
+
+    Args:
+        data_dicts: list of node or edge data dicts, each with 'solution', 'categorical_type' and 'encoded_value'
+
+    Returns:
+        Arrays of the solution, categorical type and encoded value of each node or edge
+    """
+    count = len(data_dicts)
+    solutions = np.fromiter((data['solution'] for data in data_dicts), dtype=np.int64, count=count)
+    types = np.fromiter((data['categorical_type'] for data in data_dicts), dtype=np.float32, count=count)
+    values = np.fromiter((data['encoded_value'] for data in data_dicts), dtype=np.float32, count=count)
+    return solutions, types, values
+
+
+def input_features(solutions, types, values, preexists_solution=0):
+    """
+    Stacks the input features of many nodes or edges at once, as `create_input_graph` does for each one
+
+    Args:
+        solutions: array of the solution of each element
+        types: array of the encoded type of each element
+        values: array of the encoded value of each element
+        preexists_solution: the solution value of elements that pre-exist
+
+    Returns:
+        float32 array of shape [count, 3]: whether the element pre-exists, its type and its encoded value
+    """
+    features = np.empty((len(solutions), 3), dtype=np.float32)
+    features[:, 0] = solutions == preexists_solution
+    features[:, 1] = types
+    features[:, 2] = values
+    return features
+
+
+def target_features(solutions):
+    """
+    One-hot encodes the solutions of many nodes or edges at once, as `create_target_graph` does for each one
+
+    Returns:
+        float32 array of shape [count, 3]
+    """
+    return SOLUTION_ONE_HOT_ENCODING[solutions]
+
+
+def create_input_and_target_data_dicts(graph):
+    """
+    Creates the input and target graphs of an encoded graph directly as data dicts of arrays, in the format used by
+    graph_nets. The result is the same as converting `create_input_graph(graph)` and `create_target_graph(graph)` with
+    `graph_nets.utils_np.networkx_to_data_dict`, but is made in one pass over the graph, without copying it or
+    creating a feature vector per node and edge.
+
+    Args:
+        graph: A graph with nodes labelled by consecutive integers from 0, with types and values already encoded
+
+    Returns:
+        The input data dict and the target data dict
+    """
+    node_data = [data for _, data in graph.nodes(data=True)]
+    edges = list(graph.edges(data=True))
+    edge_data = [data for _, _, data in edges]
+
+    node_solutions, node_types, node_values = encoded_data_arrays(node_data)
+    edge_solutions, edge_types, edge_values = encoded_data_arrays(edge_data)
+
+    senders = np.fromiter((sender for sender, _, _ in edges), dtype=np.int32, count=len(edges))
+    receivers = np.fromiter((receiver for _, receiver, _ in edges), dtype=np.int32, count=len(edges))
+
+    structure = dict(senders=senders, receivers=receivers, n_node=len(node_data), n_edge=len(edges))
+    input_data_dict = dict(nodes=input_features(node_solutions, node_types, node_values),
+                           edges=input_features(edge_solutions, edge_types, edge_values),
+                           globals=np.zeros(5, dtype=np.float32),
+                           **structure)
+    target_data_dict = dict(nodes=target_features(node_solutions),
+                            edges=target_features(edge_solutions),
+                            globals=np.zeros(5, dtype=np.float32),
+                            **structure)
+    return input_data_dict, target_data_dict
+
+
 def stack_features(features):
     """
     Stacks features together into a single vector
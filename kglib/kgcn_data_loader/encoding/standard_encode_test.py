@@ -19,9 +19,12 @@
 
 import unittest
 
+import networkx as nx
 import numpy as np
 
-from kglib.kgcn_data_loader.encoding.standard_encode import stack_features
+from kglib.kgcn_data_loader.encoding.standard_encode import stack_features, encode_values, encode_types, \
+    SchemaEncoder, create_input_graph, create_target_graph, create_input_and_target_data_dicts
+from kglib.utils.graph.iterate import multidigraph_node_data_iterator, multidigraph_edge_data_iterator
 
 
 class TestAugmentDataFields(unittest.TestCase):
@@ -45,5 +48,127 @@ class TestAugmentDataFields(unittest.TestCase):
         np.testing.assert_equal(stacked, expected)
 
 
+NODE_TYPES = ['person', 'name', 'age', 'employment']
+EDGE_TYPES = ['has', 'employee']
+CATEGORICAL_ATTRIBUTES = {'name': ['Alice', 'Bob']}
+CONTINUOUS_ATTRIBUTES = {'age': (0, 100)}
+
+
+def create_graph():
+    graph = nx.MultiDiGraph()
+    graph.add_node(0, type='person')
+    graph.add_node(1, type='name', value='Bob')
+    graph.add_node(2, type='age', value=25)
+    graph.add_node(3, type='employment')
+    graph.add_node(4, type='name', value='Alice')
+    graph.add_edge(0, 1, type='has')
+    graph.add_edge(0, 2, type='has')
+    graph.add_edge(3, 0, type='employee')
+    return graph
+
+
+class TestSchemaEncoder(unittest.TestCase):
+
+    def setUp(self):
+        self.encoder = SchemaEncoder(NODE_TYPES, EDGE_TYPES, CATEGORICAL_ATTRIBUTES, CONTINUOUS_ATTRIBUTES)
+
+    def test_values_encoded_as_by_encode_values(self):
+        graph = self.encoder.encode_values(create_graph())
+        expected_graph = encode_values(create_graph(), CATEGORICAL_ATTRIBUTES, CONTINUOUS_ATTRIBUTES)
+
+        self.assertEqual([0, 1, 0.25, 0, 0], [data['encoded_value'] for _, data in graph.nodes(data=True)])
+        self.assertEqual(list(expected_graph.nodes(data=True)), list(graph.nodes(data=True)))
+        self.assertEqual(list(expected_graph.edges(data=True)), list(graph.edges(data=True)))
+
+    def test_interleaved_categorical_types_encoded_as_by_encode_values(self):
+        node_types = NODE_TYPES + ['colour']
+        categorical_attributes = dict(CATEGORICAL_ATTRIBUTES, colour=['red', 'green', 'blue'])
+        encoder = SchemaEncoder(node_types, EDGE_TYPES, categorical_attributes, CONTINUOUS_ATTRIBUTES)
+
+        def create_colourful_graph():
+            graph = create_graph()
+            graph.add_node(5, type='colour', value='blue')
+            graph.add_node(6, type='name', value='Alice')
+            graph.add_node(7, type='colour', value='red')
+            return graph
+
+        graph = encoder.encode_values(create_colourful_graph())
+        expected_graph = encode_values(create_colourful_graph(), categorical_attributes, CONTINUOUS_ATTRIBUTES)
+
+        self.assertEqual([0, 1, 0.25, 0, 0, 2, 0, 0], [data['encoded_value'] for _, data in graph.nodes(data=True)])
+        self.assertEqual(list(expected_graph.nodes(data=True)), list(graph.nodes(data=True)))
+
+    def test_types_encoded_as_by_encode_types(self):
+        graph = self.encoder.encode_types(create_graph())
+        expected_graph = encode_types(create_graph(), multidigraph_node_data_iterator, NODE_TYPES)
+        expected_graph = encode_types(expected_graph, multidigraph_edge_data_iterator, EDGE_TYPES)
+
+        self.assertEqual([0, 1, 2, 3, 1], [data['categorical_type'] for _, data in graph.nodes(data=True)])
+        self.assertEqual(list(expected_graph.nodes(data=True)), list(graph.nodes(data=True)))
+        self.assertEqual(list(expected_graph.edges(data=True)), list(graph.edges(data=True)))
+
+    def test_exception_raised_for_unknown_type(self):
+        graph = create_graph()
+        graph.add_node(5, type='company')
+
+        with self.assertRaises(ValueError) as context:
+            self.encoder.encode_types(graph)
+
+        self.assertEqual("'company' is not in list", str(context.exception))
+
+    def test_exception_raised_for_unknown_category(self):
+        graph = create_graph()
+        graph.add_node(5, type='name', value='Carol')
+
+        with self.assertRaises(ValueError):
+            self.encoder.encode_values(graph)
+
+
+class TestCreateInputAndTargetDataDicts(unittest.TestCase):
+
+    def setUp(self):
+        encoder = SchemaEncoder(NODE_TYPES, EDGE_TYPES, CATEGORICAL_ATTRIBUTES, CONTINUOUS_ATTRIBUTES)
+        graph = encoder.encode_types(encoder.encode_values(create_graph()))
+        for solution, (_, data) in zip([0, 0, 1, 2, 0], graph.nodes(data=True)):
+            data['solution'] = solution
+        for solution, (_, _, data) in zip([0, 2, 1], graph.edges(data=True)):
+            data['solution'] = solution
+        self.graph = graph
+        self.input_data_dict, self.target_data_dict = create_input_and_target_data_dicts(graph)
+
+    def test_input_features_match_create_input_graph(self):
+        input_graph = create_input_graph(self.graph)
+
+        np.testing.assert_array_equal(np.stack([data['features'] for _, data in input_graph.nodes(data=True)]),
+                                      self.input_data_dict['nodes'])
+        np.testing.assert_array_equal(np.stack([data['features'] for _, _, data in input_graph.edges(data=True)]),
+                                      self.input_data_dict['edges'])
+        np.testing.assert_array_equal(input_graph.graph['features'], self.input_data_dict['globals'])
+
+    def test_target_features_match_create_target_graph(self):
+        target_graph = create_target_graph(self.graph)
+
+        np.testing.assert_array_equal(np.stack([data['features'] for _, data in target_graph.nodes(data=True)]),
+                                      self.target_data_dict['nodes'])
+        np.testing.assert_array_equal(np.stack([data['features'] for _, _, data in target_graph.edges(data=True)]),
+                                      self.target_data_dict['edges'])
+
+    def test_features_are_float32(self):
+        for data_dict in [self.input_data_dict, self.target_data_dict]:
+            self.assertEqual(np.float32, data_dict['nodes'].dtype)
+            self.assertEqual(np.float32, data_dict['edges'].dtype)
+
+    def test_structure_is_as_expected(self):
+        for data_dict in [self.input_data_dict, self.target_data_dict]:
+            np.testing.assert_array_equal(np.array([0, 0, 3], dtype=np.int32), data_dict['senders'])
+            np.testing.assert_array_equal(np.array([1, 2, 0], dtype=np.int32), data_dict['receivers'])
+            self.assertEqual(5, data_dict['n_node'])
+            self.assertEqual(3, data_dict['n_edge'])
+
+    def test_graph_is_not_modified(self):
+        self.assertEqual({'type', 'value', 'encoded_value', 'categorical_type', 'solution'},
+                         set(self.graph.nodes[1].keys()))
+
+
 if __name__ == "__main__":
     unittest.main()
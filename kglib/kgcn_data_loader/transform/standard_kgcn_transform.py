@@ -1,12 +1,8 @@
 import networkx as nx
-from kglib.utils.graph.iterate import (
-    multidigraph_node_data_iterator,
-    multidigraph_data_iterator,
-    multidigraph_edge_data_iterator,
-)
+from kglib.utils.graph.iterate import multidigraph_data_iterator
 
-from kglib.kgcn_data_loader.encoding.standard_encode import encode_types, encode_values, stack_features
-from kglib.kgcn_data_loader.utils import duplicate_edges_in_reverse
+from kglib.kgcn_data_loader.encoding.encoded_graph import EncodedGraph
+from kglib.kgcn_data_loader.encoding.standard_encode import stack_features, SchemaEncoder
 
 
 class StandardKGCNNetworkxTransform:
@@ -48,35 +44,47 @@ class StandardKGCNNetworkxTransform:
         self.continuous = continuous or {}
         self.duplicate = duplicate_in_reverse
         self.label_attribute = label_attribute
+        self.encoder = SchemaEncoder(node_types, edge_types, self.categorical, self.continuous)
 
     def __call__(self, graph):
         if self.obfuscate:
             obfuscate_labels(graph, self.obfuscate)
-        # Encode attribute values as number
-        graph = encode_values(graph, self.categorical, self.continuous)
-        graph = nx.convert_node_labels_to_integers(
-            graph, label_attribute=self.label_attribute
-        )
+        # Encode node and edge types and attribute values as numbers, straight into arrays. Whether an element
+        # pre-exists is read from "solution", as in `create_feature_vector`, whatever the target is
+        encoded_graph = EncodedGraph.from_networkx(graph, self.encoder)
+        node_targets = [data[self.target_name] for _, data in graph.nodes(data=True)]
+        edge_targets = [data[self.target_name] for _, _, data in graph.edges(data=True)]
         if self.duplicate:
-            graph = duplicate_edges_in_reverse(graph)
-        # Node or Edge Type as int
-        graph = encode_types(graph, multidigraph_node_data_iterator, self.node_types)
-        graph = encode_types(graph, multidigraph_edge_data_iterator, self.edge_types)
-
-        for data in multidigraph_node_data_iterator(graph):
-            features = create_feature_vector(data)
-            target = data[self.target_name]
-            data.clear()
-            data["x"] = features
-            data["y"] = target
-
-        for data in multidigraph_edge_data_iterator(graph):
-            features = create_feature_vector(data)
-            target = data[self.target_name]
-            data.clear()
-            data["edge_attr"] = features
-            data["y_edge"] = target
-
+            # The reversed edges follow the originals, in the same order
+            encoded_graph = encoded_graph.add_reverse_edges()
+            edge_targets = edge_targets * 2
+        transformed_graph = self.to_networkx(encoded_graph, node_targets, edge_targets)
+        transformed_graph.graph.update(graph.graph)
+        return transformed_graph
+
+    def to_networkx(self, encoded_graph, node_targets, edge_targets):
+        """
+        Creates the graph to ingest, with nodes labelled by integers, from the arrays of an encoded graph and the target
+        of each of its nodes and edges
+        """
+        # Elements with solution -1 pre-exist, as in `create_feature_vector`
+        node_features = encoded_graph.node_features(preexists_solution=-1)
+        edge_features = encoded_graph.edge_features(preexists_solution=-1)
+
+        graph = nx.MultiDiGraph()
+        graph.add_nodes_from(
+            (i, {"x": features, "y": target})
+            for i, (features, target) in enumerate(zip(node_features, node_targets))
+        )
+        graph.add_edges_from(
+            (sender, receiver, {"edge_attr": features, "y_edge": target})
+            for sender, receiver, features, target in zip(
+                encoded_graph.senders.tolist(),
+                encoded_graph.receivers.tolist(),
+                edge_features,
+                edge_targets,
+            )
+        )
         return graph
 
 
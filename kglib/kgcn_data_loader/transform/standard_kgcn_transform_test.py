@@ -0,0 +1,62 @@
+#
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+#
+
+
+import unittest
+
+import networkx as nx
+import numpy as np
+
+from kglib.kgcn_data_loader.transform.standard_kgcn_transform import StandardKGCNNetworkxTransform, \
+    create_feature_vector
+
+
+class TestStandardKGCNNetworkxTransform(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = nx.MultiDiGraph()
+        self.graph.add_node('p', type='person', solution=-1, label=1)
+        self.graph.add_node('a', type='age', value=50, solution=0, label=2)
+        self.graph.add_edge('p', 'a', type='has', solution=-1, label=0)
+        self.transform = StandardKGCNNetworkxTransform(['person', 'age'], ['has'], target_name='label',
+                                                       continuous={'age': (0, 100)})
+
+    def test_features_read_preexistence_from_solution_not_target(self):
+        graph = self.transform(self.graph)
+
+        np.testing.assert_array_equal([1, 0, 0], graph.nodes[0]['x'])
+        np.testing.assert_array_equal([0, 1, 0.5], graph.nodes[1]['x'])
+        for _, _, data in graph.edges(data=True):
+            np.testing.assert_array_equal([1, 0, 0], data['edge_attr'])
+
+    def test_features_match_create_feature_vector(self):
+        graph = self.transform(self.graph)
+
+        expected = create_feature_vector(dict(solution=0, categorical_type=1, encoded_value=0.5))
+        np.testing.assert_array_equal(expected, graph.nodes[1]['x'])
+
+    def test_targets_are_read_from_target_name(self):
+        graph = self.transform(self.graph)
+
+        self.assertEqual([1, 2], [data['y'] for _, data in graph.nodes(data=True)])
+        self.assertEqual([0, 0], [data['y_edge'] for _, _, data in graph.edges(data=True)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -17,6 +17,7 @@
 #  under the License.
 #
 
+import numpy as np
 from grakn.client import *
 from kglib.utils.grakn.type.type import get_thing_types, get_role_types
 from typing import List
@@ -38,6 +39,28 @@ def duplicate_edges_in_reverse(graph):
     return graph
 
 
+def original_edge_rows(graphs, duplicated_graphs):
+    """
+    Finds the rows of graphs' original edges among the edges of the same graphs duplicated in reverse by
+    `duplicate_edges_in_reverse`, with the edges of all of the graphs concatenated as in a `GraphsTuple`. An original
+    edge keeps its sender, receiver and key when duplicated, so is found by them
+
+    Args:
+        graphs: The graphs without their edges duplicated
+        duplicated_graphs: Copies of the graphs, in the same order, with their edges duplicated in reverse
+
+    Returns:
+        Array of the row of each original edge of all of the graphs, in the order the graphs iterate over their edges
+    """
+    rows = []
+    offset = 0
+    for graph, duplicated_graph in zip(graphs, duplicated_graphs):
+        row_of_edge = {edge: row for row, edge in enumerate(duplicated_graph.edges(keys=True))}
+        rows.extend(offset + row_of_edge[edge] for edge in graph.edges(keys=True))
+        offset += len(row_of_edge)
+    return np.array(rows, dtype=np.int64)
+
+
 def apply_logits_to_graphs(graph, logits_graph):
     """
     Take in a graph that describes the logits of the graph of interest, and store those logits on the graph as the
@@ -65,6 +88,127 @@ def apply_logits_to_graphs(graph, logits_graph):
     return graph
 
 
+def softmax(x, axis=-1):
+    """
+    Softmax of `x` along `axis`. The maximum along the axis is subtracted before exponentiating, which leaves the
+    result unchanged but stops large logits from overflowing
+    """
+    x = np.asarray(x)
+    exps = np.exp(x - np.max(x, axis=axis, keepdims=True))
+    return exps / np.sum(exps, axis=axis, keepdims=True)
+
+
+def decode_predictions(logits):
+    """
+    Decodes the logits of many nodes or edges at once
+
+    Args:
+        logits: Array of shape [count, num_classes], such as the nodes or edges of a model's output `GraphsTuple`
+
+    Returns:
+        The probability of each class for each element, and the index of the most probable class of each element
+    """
+    probabilities = softmax(logits, axis=-1)
+    return probabilities, np.argmax(logits, axis=-1)
+
+
+def split_rows(rows, counts):
+    """
+    Splits the concatenated node or edge rows of many graphs, as held in a `GraphsTuple`, into a view per graph
+
+    Args:
+        rows: Array of the rows of all of the graphs
+        counts: The number of rows belonging to each graph, such as a `GraphsTuple`'s `n_node` or `n_edge`
+
+    Returns:
+        A list of arrays, one per graph
+    """
+    return np.split(rows, np.cumsum(counts)[:-1])
+
+
+def _apply_rows(data_dicts, count, arrays, element):
+    for name, array in arrays.items():
+        if len(array) != count:
+            raise ValueError(f'Got {len(array)} rows of {name} for a graph with {count} {element}s')
+    names = list(arrays)
+    for data, *row in zip(data_dicts, *(arrays[name] for name in names)):
+        data.update(zip(names, row))
+
+
+def apply_arrays_to_graph(graph, node_arrays, edge_arrays):
+    """
+    Stores rows of arrays on a graph's nodes and edges as properties. The rows must be in the order that the graph
+    iterates over its nodes and edges, which is the order used to create its data dict by
+    `create_input_and_target_data_dicts` or graph_nets, and so the order of a model's outputs for it. Rows are matched
+    to nodes and edges by position, so none need to be looked up
+
+    Args:
+        graph: Graph to store the rows on
+        node_arrays: Dict of property name to an array with a row per node
+        edge_arrays: Dict of property name to an array with a row per edge
+
+    Returns:
+        The graph, with the properties added
+    """
+    _apply_rows((data for _, data in graph.nodes(data=True)), graph.number_of_nodes(), node_arrays, 'node')
+    _apply_rows((data for _, _, data in graph.edges(data=True)), graph.number_of_edges(), edge_arrays, 'edge')
+    return graph
+
+
+def apply_rows_to_graphs(graphs, n_node, n_edge, node_arrays, edge_arrays):
+    """
+    Stores the rows of arrays holding the nodes and edges of many graphs, concatenated as in a `GraphsTuple`, on each
+    of the graphs, as `apply_arrays_to_graph` does for one graph
+
+    Args:
+        graphs: The graphs, in the order their rows are concatenated in
+        n_node: The number of nodes in each graph
+        n_edge: The number of edges in each graph
+        node_arrays: Dict of property name to an array with a row per node of all of the graphs
+        edge_arrays: Dict of property name to an array with a row per edge of all of the graphs
+
+    Returns:
+        The graphs, with the properties added
+    """
+    node_rows = {name: split_rows(array, n_node) for name, array in node_arrays.items()}
+    edge_rows = {name: split_rows(array, n_edge) for name, array in edge_arrays.items()}
+    for i, graph in enumerate(graphs):
+        apply_arrays_to_graph(graph,
+                              {name: rows[i] for name, rows in node_rows.items()},
+                              {name: rows[i] for name, rows in edge_rows.items()})
+    return graphs
+
+
+def apply_graphs_tuple_logits_to_graphs(graphs, logits_graphs_tuple, edge_rows=None):
+    """
+    Stores the logits of a numpy `GraphsTuple` on the graphs it was created from as the property 'logits', together
+    with their probabilities as 'probabilities' and the index of the most probable class as 'prediction', decoded by
+    `decode_predictions`. The logits of all of the graphs are decoded at once, and the graphs' rows are found by their
+    offsets in the `GraphsTuple`, rather than by converting it back to networkx graphs
+
+    Args:
+        graphs: The graphs, in the order they were converted to the `GraphsTuple`
+        logits_graphs_tuple: The model's output for the graphs, as a numpy `GraphsTuple`
+        edge_rows: The row of each of the graphs' edges among the `GraphsTuple`'s edges, such as given by
+            `original_edge_rows` for graphs whose edges were duplicated in reverse for the model. If None, the graphs
+            have the same edges as the `GraphsTuple`
+
+    Returns:
+        The graphs, with logits, probabilities and predictions added
+    """
+    nodes, edges = logits_graphs_tuple.nodes, logits_graphs_tuple.edges
+    n_edge = logits_graphs_tuple.n_edge
+    if edge_rows is not None:
+        edges = edges[edge_rows]
+        n_edge = [graph.number_of_edges() for graph in graphs]
+    node_probabilities, node_predictions = decode_predictions(nodes)
+    edge_probabilities, edge_predictions = decode_predictions(edges)
+    return apply_rows_to_graphs(
+        graphs, logits_graphs_tuple.n_node, n_edge,
+        dict(logits=nodes, probabilities=node_probabilities, prediction=node_predictions),
+        dict(logits=edges, probabilities=edge_probabilities, prediction=edge_predictions))
+
+
 def get_node_types_for_training(session: GraknSession, types_to_ignore: List[str]) -> List[str]:
     """
     Takes in a list of node types to ignore and returns all node types in schema that are not to be ignored.
@@ -25,7 +25,10 @@ import numpy as np
 from kglib.utils.grakn.object.thing import Thing
 from kglib.utils.graph.test.case import GraphTestCase
 
-from kglib.kgcn_data_loader.utils import duplicate_edges_in_reverse, apply_logits_to_graphs
+from graph_nets.graphs import GraphsTuple
+
+from kglib.kgcn_data_loader.utils import duplicate_edges_in_reverse, apply_logits_to_graphs, apply_arrays_to_graph, \
+    apply_graphs_tuple_logits_to_graphs, original_edge_rows, softmax, decode_predictions
 
 
 class TestDuplicateEdgesInReverse(GraphTestCase):
@@ -65,6 +68,23 @@ class TestDuplicateEdgesInReverse(GraphTestCase):
         self.assertGraphsEqual(expected_graph, graph)
 
 
+class TestOriginalEdgeRows(unittest.TestCase):
+
+    def test_rows_of_original_edges_are_found_across_graphs(self):
+        graphs = []
+        for num_nodes in [3, 2]:
+            graph = nx.MultiDiGraph()
+            graph.add_nodes_from(range(num_nodes))
+            graph.add_edges_from((i + 1, i) for i in range(num_nodes - 1))
+            graphs.append(graph)
+        duplicated_graphs = [duplicate_edges_in_reverse(graph.copy()) for graph in graphs]
+
+        rows = original_edge_rows(graphs, duplicated_graphs)
+
+        # The first graph's duplicated edges are (0, 1), (1, 0), (1, 2), (2, 1), and the second's (0, 1), (1, 0)
+        self.assertEqual([1, 3, 5], rows.tolist())
+
+
 class TestApplyLogitsToGraphs(GraphTestCase):
     def test_logits_applied_as_expected(self):
 
@@ -89,5 +109,88 @@ class TestApplyLogitsToGraphs(GraphTestCase):
         self.assertGraphsEqual(expected_graph, graph_with_logits)
 
 
+class TestApplyArraysToGraph(unittest.TestCase):
+
+    def test_rows_applied_to_nodes_and_edges_in_order(self):
+        graph = nx.MultiDiGraph()
+        graph.add_node(0)
+        graph.add_node(1)
+        graph.add_edge(1, 0)
+        graph.add_edge(0, 1)
+
+        apply_arrays_to_graph(graph, dict(logits=np.array([[0, 1], [2, 3]])), dict(logits=np.array([[4, 5], [6, 7]])))
+
+        np.testing.assert_array_equal([2, 3], graph.nodes[1]['logits'])
+        # Edges are iterated by sender, so the edge from node 0 comes first
+        np.testing.assert_array_equal([4, 5], graph.edges[0, 1, 0]['logits'])
+        np.testing.assert_array_equal([6, 7], graph.edges[1, 0, 0]['logits'])
+
+    def test_exception_raised_if_rows_do_not_match_graph(self):
+        graph = nx.MultiDiGraph()
+        graph.add_node(0)
+        with self.assertRaises(ValueError):
+            apply_arrays_to_graph(graph, dict(logits=np.zeros((2, 3))), {})
+
+
+class TestSoftmax(unittest.TestCase):
+
+    def test_softmax_of_a_vector(self):
+        np.testing.assert_array_almost_equal([0.5, 0.5], softmax(np.array([1., 1.])))
+
+    def test_large_logits_do_not_overflow(self):
+        probabilities = softmax(np.array([1000., 0.]))
+        self.assertFalse(np.any(np.isnan(probabilities)))
+        np.testing.assert_array_almost_equal([1., 0.], probabilities)
+
+    def test_softmax_is_taken_along_the_last_axis(self):
+        probabilities = softmax(np.array([[0., 0.], [np.log(3.), 0.]]))
+        np.testing.assert_array_almost_equal([[0.5, 0.5], [0.75, 0.25]], probabilities)
+
+
+class TestDecodePredictions(unittest.TestCase):
+
+    def test_probabilities_and_predictions_are_per_row(self):
+        probabilities, predictions = decode_predictions(np.array([[0., 2., 1.], [5., -1., 0.]]))
+
+        np.testing.assert_array_almost_equal(np.ones(2), np.sum(probabilities, axis=-1))
+        np.testing.assert_array_equal([1, 0], predictions)
+
+
+class TestApplyGraphsTupleLogitsToGraphs(unittest.TestCase):
+
+    def test_logits_probabilities_and_predictions_applied_to_each_graph(self):
+        graph_a = nx.MultiDiGraph()
+        graph_a.add_edge(0, 1)
+        graph_b = nx.MultiDiGraph()
+        graph_b.add_node(0)
+
+        logits = GraphsTuple(nodes=np.array([[0., 1.], [1000., 0.], [2., 2.]]),
+                             edges=np.array([[0., 3.]]),
+                             receivers=np.array([1]), senders=np.array([0]), globals=None,
+                             n_node=np.array([2, 1]), n_edge=np.array([1, 0]))
+
+        graph_a, graph_b = apply_graphs_tuple_logits_to_graphs([graph_a, graph_b], logits)
+
+        np.testing.assert_array_equal([1000., 0.], graph_a.nodes[1]['logits'])
+        np.testing.assert_array_almost_equal([1., 0.], graph_a.nodes[1]['probabilities'])
+        self.assertEqual(0, graph_a.nodes[1]['prediction'])
+        self.assertEqual(1, graph_a.edges[0, 1, 0]['prediction'])
+        np.testing.assert_array_almost_equal([0.5, 0.5], graph_b.nodes[0]['probabilities'])
+
+    def test_only_the_given_edge_rows_are_applied(self):
+        graph = nx.MultiDiGraph()
+        graph.add_edge(0, 1)
+
+        logits = GraphsTuple(nodes=np.array([[0., 1.], [1., 0.]]),
+                             edges=np.array([[0., 3.], [3., 0.]]),
+                             receivers=np.array([1, 0]), senders=np.array([0, 1]), globals=None,
+                             n_node=np.array([2]), n_edge=np.array([2]))
+
+        graph, = apply_graphs_tuple_logits_to_graphs([graph], logits, edge_rows=np.array([1]))
+
+        np.testing.assert_array_equal([3., 0.], graph.edges[0, 1, 0]['logits'])
+        self.assertEqual(0, graph.edges[0, 1, 0]['prediction'])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -19,6 +19,7 @@
 
 import inspect
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 from grakn.client import *
 
@@ -29,7 +30,8 @@ from kglib.utils.grakn.synthetic.examples.diagnosis.generate import generate_exa
 from kglib.utils.grakn.type.type import get_thing_types, get_role_types
 from kglib.utils.graph.iterate import multidigraph_data_iterator
 from kglib.utils.graph.query.query_graph import QueryGraph
-from kglib.utils.graph.thing.queries_to_networkx_graph import build_graph_from_queries
+from kglib.utils.graph.thing.queries_to_networkx_graph import build_graph_from_queries, \
+    build_graphs_from_queries_concurrently
 
 
 
@@ -112,8 +114,7 @@ def diagnosis_example(num_graphs=100,
                                                  categorical_attributes=CATEGORICAL_ATTRIBUTES,
                                                  output_dir=f"./events/{time.time()}/")
 
-    with session.transaction(TransactionType.WRITE) as tx:
-        write_predictions_to_grakn(ge_graphs, tx)
+    write_predictions_to_grakn_in_bulk(ge_graphs, session)
 
     session.close()
     client.close()
@@ -121,34 +122,47 @@ def diagnosis_example(num_graphs=100,
     return solveds_tr, solveds_ge
 
 
-def create_concept_graphs(example_indices, grakn_session, infer = True):
+def create_concept_graphs(example_indices, grakn_session, infer = True, max_workers=None, cache=None):
     """
     Builds an in-memory graph for each example, with an example_id as an anchor for each example subgraph.
     Args:
         example_indices: The values used to anchor the subgraph queries within the entire knowledge graph
         grakn_session: Grakn Session
+        infer: Whether to use Grakn's inference engine
+        max_workers: If given, the queries of all examples are run concurrently, with at most this many read
+            transactions open at once. Otherwise the examples are built one at a time
+        cache: Optional SubgraphCache. Examples found in the cache are not queried again
 
     Returns:
         In-memory graphs of Grakn subgraphs
     """
 
-    graphs = []
-
     options = GraknOptions.core()
     options.infer = infer
 
-    for example_id in example_indices:
-        print(f'Creating graph for example {example_id}')
-        graph_query_handles = get_query_handles(example_id)
-
-        with grakn_session.transaction(TransactionType.READ, options) as tx:
-            # Build a graph from the queries, samplers, and query graphs
-            graph = build_graph_from_queries(graph_query_handles, tx)
-
+    def build_graphs(query_handles_per_example):
+        if max_workers is not None:
+            print(f'Creating graphs for {len(query_handles_per_example)} examples concurrently')
+            return build_graphs_from_queries_concurrently(query_handles_per_example, grakn_session, options,
+                                                          max_workers=max_workers)
+        graphs = []
+        for graph_query_handles in query_handles_per_example:
+            print(f'Creating graph {len(graphs) + 1} of {len(query_handles_per_example)}')
+            with grakn_session.transaction(TransactionType.READ, options) as tx:
+                # Build a graph from the queries, samplers, and query graphs
+                graphs.append(build_graph_from_queries(graph_query_handles, tx))
+        return graphs
+
+    query_handles_per_example = [get_query_handles(example_id) for example_id in example_indices]
+
+    if cache is None:
+        graphs = build_graphs(query_handles_per_example)
+    else:
+        graphs = cache.get_or_build_many(query_handles_per_example, build_graphs)
+
+    for example_id, graph in zip(example_indices, graphs):
         obfuscate_labels(graph, TYPES_AND_ROLES_TO_OBFUSCATE)
-
         graph.name = example_id
-        graphs.append(graph)
 
     return graphs
 
@@ -292,26 +306,22 @@ def get_query_handles(example_id):
     ]
 
 
-def write_predictions_to_grakn(graphs, tx):
+def prediction_insert_queries(graphs):
     """
-    Take predictions from the ML model, and insert representations of those predictions back into the graph.
+    Creates the Graql queries that insert representations of the ML model's predictions back into the graph
 
     Args:
         graphs: graphs containing the concepts, with their class predictions and class probabilities
-        tx: Grakn write transaction to use
-
-    Returns: None
 
+    Returns:
+        Generator of one insert query per diagnosis predicted to exist
     """
     for graph in graphs:
         for node, data in graph.nodes(data=True):
             if data['prediction'] == 2:
-                concept = data['concept']
-                concept_type = concept.type_label
+                concept_type = data['concept'].type_label
                 if concept_type == 'diagnosis' or concept_type == 'candidate-diagnosis':
-                    neighbours = graph.neighbors(node)
-
-                    for neighbour in neighbours:
+                    for neighbour in graph.succ[node]:
                         concept = graph.nodes[neighbour]['concept']
                         if concept.type_label == 'person':
                             person = concept
@@ -319,18 +329,95 @@ def write_predictions_to_grakn(graphs, tx):
                             disease = concept
 
                     p = data['probabilities']
-                    query = (f'match '
-                             f'$p iid {person.id};'
-                             f'$d iid {disease.id};'
-                             f'$kgcn isa kgcn;'
-                             f'insert '
-                             f'$pd(patient: $p, diagnosed-disease: $d, diagnoser: $kgcn) isa diagnosis,'
-                             f'has probability-exists {p[2]:.3f},'
-                             f'has probability-non-exists {p[1]:.3f},'  
-                             f'has probability-preexists {p[0]:.3f};')
-                    tx.query().insert(query)
+                    yield (f'match '
+                           f'$p iid {person.id};'
+                           f'$d iid {disease.id};'
+                           f'$kgcn isa kgcn;'
+                           f'insert '
+                           f'$pd(patient: $p, diagnosed-disease: $d, diagnoser: $kgcn) isa diagnosis,'
+                           f'has probability-exists {p[2]:.3f},'
+                           f'has probability-non-exists {p[1]:.3f},'
+                           f'has probability-preexists {p[0]:.3f};')
+
+
+def write_predictions_to_grakn(graphs, tx):
+    """
+    Take predictions from the ML model, and insert representations of those predictions back into the graph.
+
+    Args:
+        graphs: graphs containing the concepts, with their class predictions and class probabilities
+        tx: Grakn write transaction to use
+
+    Returns: None
+
+    """
+    for query in prediction_insert_queries(graphs):
+        tx.query().insert(query)
     tx.commit()
 
 
+def insert_in_transaction(grakn_session, queries, max_attempts=3):
+    """
+    Runs insert queries in one write transaction and commits it. If the Grakn client raises an error before the
+    commit is sent, the transaction is retried from the start, since none of its inserts can have been committed. An
+    error raised by or after the commit is not retried: the commit may have been applied on the server, and the
+    inserts are not idempotent, so retrying could insert every prediction twice
+
+    Args:
+        grakn_session: Grakn Session
+        queries: The insert queries
+        max_attempts: Number of times to try the transaction before giving up and raising its exception
+    """
+    for attempt in range(1, max_attempts + 1):
+        commit_sent = False
+        try:
+            with grakn_session.transaction(TransactionType.WRITE) as tx:
+                for query in queries:
+                    tx.query().insert(query)
+                commit_sent = True
+                tx.commit()
+            return
+        except GraknClientException as e:
+            if commit_sent or attempt == max_attempts:
+                raise
+            print(f'Retrying transaction of {len(queries)} inserts after failed attempt {attempt}: {e}')
+
+
+def write_predictions_to_grakn_in_bulk(graphs, grakn_session, queries_per_transaction=500, max_workers=4,
+                                       max_attempts=3):
+    """
+    Inserts representations of the ML model's predictions back into the graph, as `write_predictions_to_grakn` does,
+    but split into write transactions of bounded size, with several transactions committed in parallel
+
+    Args:
+        graphs: graphs containing the concepts, with their class predictions and class probabilities
+        grakn_session: Grakn Session
+        queries_per_transaction: Maximum number of insert queries to make in each write transaction
+        max_workers: Maximum number of write transactions open at once
+        max_attempts: Number of times to try each transaction before giving up on it
+
+    Returns:
+        The number of predictions written
+
+    Raises:
+        RuntimeError: if any transaction still failed after `max_attempts`. The other transactions are committed
+    """
+    queries = list(prediction_insert_queries(graphs))
+    chunks = [queries[start:start + queries_per_transaction]
+              for start in range(0, len(queries), queries_per_transaction)]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(insert_in_transaction, grakn_session, chunk, max_attempts) for chunk in chunks]
+
+    failed_chunks = [i for i, future in enumerate(futures) if future.exception() is not None]
+    if failed_chunks:
+        num_failed = sum(len(chunks[i]) for i in failed_chunks)
+        raise RuntimeError(f'{num_failed} of {len(queries)} predictions were not written, in transactions '
+                           f'{failed_chunks}') from futures[failed_chunks[0]].exception()
+
+    print(f'Wrote {len(queries)} predictions in {len(chunks)} transactions')
+    return len(queries)
+
+
 if __name__ == "__main__":
     diagnosis_example()
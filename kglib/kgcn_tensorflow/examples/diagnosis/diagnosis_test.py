@@ -24,7 +24,8 @@ from grakn.client import *
 import networkx as nx
 import numpy as np
 
-from kglib.kgcn_tensorflow.examples.diagnosis.diagnosis import write_predictions_to_grakn, obfuscate_labels
+from kglib.kgcn_tensorflow.examples.diagnosis.diagnosis import write_predictions_to_grakn, obfuscate_labels, \
+    write_predictions_to_grakn_in_bulk
 from kglib.utils.grakn.object.thing import Thing
 from kglib.utils.graph.test.case import GraphTestCase
 
@@ -91,6 +92,88 @@ class TestWritePredictionsToGrakn(unittest.TestCase):
         tx.commit.assert_called()
 
 
+def create_predicted_graph(person_id, disease_id, diagnosis_id):
+    graph = nx.MultiDiGraph()
+    graph.add_node(0, concept=Thing(person_id, 'person', 'entity'), probabilities=np.array([1.0, 0.0, 0.0]),
+                   prediction=0)
+    graph.add_node(1, concept=Thing(disease_id, 'disease', 'entity'), probabilities=np.array([1.0, 0.0, 0.0]),
+                   prediction=0)
+    graph.add_node(2, concept=Thing(diagnosis_id, 'diagnosis', 'relation'),
+                   probabilities=np.array([0.0, 0.0071, 0.9927]), prediction=2)
+    graph.add_edge(2, 0)
+    graph.add_edge(2, 1)
+    return graph
+
+
+class TestWritePredictionsToGraknInBulk(unittest.TestCase):
+
+    def setUp(self):
+        self.graphs = [create_predicted_graph(f'V{i}', f'V{i}1', f'V{i}2') for i in range(5)]
+        self.session = MagicMock()
+        self.tx = self.session.transaction.return_value.__enter__.return_value
+
+    def test_inserts_are_split_into_bounded_transactions(self):
+        written = write_predictions_to_grakn_in_bulk(self.graphs, self.session, queries_per_transaction=2,
+                                                     max_workers=2)
+
+        self.assertEqual(5, written)
+        self.assertEqual(3, self.session.transaction.call_count)
+        self.session.transaction.assert_called_with(TransactionType.WRITE)
+        self.assertEqual(5, self.tx.query.return_value.insert.call_count)
+        self.assertEqual(3, self.tx.commit.call_count)
+
+    def test_each_prediction_is_inserted(self):
+        write_predictions_to_grakn_in_bulk(self.graphs, self.session, queries_per_transaction=2)
+
+        queries = [call[0][0] for call in self.tx.query.return_value.insert.call_args_list]
+        self.assertEqual(5, len(queries))
+        for i in range(5):
+            self.assertEqual(1, sum(f'$p iid V{i};$d iid V{i}1;' in query for query in queries))
+
+    def test_transaction_failing_before_commit_is_retried(self):
+        insert = self.tx.query.return_value.insert
+        insert.side_effect = [GraknClientException('connection lost')] + [None] * 5
+
+        write_predictions_to_grakn_in_bulk(self.graphs, self.session, queries_per_transaction=2, max_workers=1)
+
+        self.assertEqual(4, self.session.transaction.call_count)
+        self.assertEqual(3, self.tx.commit.call_count)
+
+    def test_transaction_failing_on_commit_is_not_retried(self):
+        self.tx.commit.side_effect = [GraknClientException('commit timed out'), None, None]
+
+        with self.assertRaises(RuntimeError) as context:
+            write_predictions_to_grakn_in_bulk(self.graphs, self.session, queries_per_transaction=2, max_workers=1)
+
+        self.assertEqual('2 of 5 predictions were not written, in transactions [0]', str(context.exception))
+        self.assertEqual(3, self.session.transaction.call_count)
+
+    def test_errors_not_from_the_client_are_not_retried(self):
+        self.tx.query.return_value.insert.side_effect = ValueError('bad query')
+
+        with self.assertRaises(RuntimeError):
+            write_predictions_to_grakn_in_bulk(self.graphs, self.session, queries_per_transaction=2, max_workers=1)
+
+        self.assertEqual(3, self.session.transaction.call_count)
+
+    def test_exception_raised_when_retries_run_out(self):
+        self.tx.query.return_value.insert.side_effect = GraknClientException('connection lost')
+
+        with self.assertRaises(RuntimeError) as context:
+            write_predictions_to_grakn_in_bulk(self.graphs, self.session, queries_per_transaction=2, max_attempts=2)
+
+        self.assertEqual('5 of 5 predictions were not written, in transactions [0, 1, 2]', str(context.exception))
+        self.assertEqual(6, self.session.transaction.call_count)
+        self.tx.commit.assert_not_called()
+
+    def test_no_predictions_opens_no_transactions(self):
+        for graph in self.graphs:
+            graph.nodes[2]['prediction'] = 1
+
+        self.assertEqual(0, write_predictions_to_grakn_in_bulk(self.graphs, self.session))
+        self.session.transaction.assert_not_called()
+
+
 class TestObfuscateLabels(GraphTestCase):
 
     def test_labels_obfuscated_as_expected(self):
@@ -0,0 +1,200 @@
+#
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+#
+
+import numpy as np
+
+
+def contiguous_ranges(starts, lengths):
+    """
+    Concatenates the integer ranges [start, start + length) for each start and length given
+
+    Args:
+        starts: Array of the first value of each range
+        lengths: Array of the length of each range
+
+    Returns:
+        A single array of all of the ranges' values, in order
+    """
+    starts = np.asarray(starts, dtype=np.int64)
+    lengths = np.asarray(lengths, dtype=np.int64)
+    range_offsets = np.cumsum(lengths) - lengths
+    return np.repeat(starts - range_offsets, lengths) + np.arange(np.sum(lengths), dtype=np.int64)
+
+
+class GraphsTupleStore:
+    """
+    Holds many graphs pre-concatenated in a single numpy `GraphsTuple`, from which any subset of the graphs can be
+    gathered into a new, smaller `GraphsTuple`
+    """
+    def __init__(self, graphs_tuple):
+        """
+        Args:
+            graphs_tuple: A numpy `GraphsTuple` of all of the graphs to store
+        """
+        self._graphs_tuple = graphs_tuple
+        self._node_offsets = np.cumsum(graphs_tuple.n_node) - graphs_tuple.n_node
+        self._edge_offsets = np.cumsum(graphs_tuple.n_edge) - graphs_tuple.n_edge
+
+    def __len__(self):
+        return len(self._graphs_tuple.n_node)
+
+    @property
+    def n_node(self):
+        """The number of nodes in each stored graph"""
+        return self._graphs_tuple.n_node
+
+    @property
+    def n_edge(self):
+        """The number of edges in each stored graph"""
+        return self._graphs_tuple.n_edge
+
+    def get(self, indices):
+        """
+        Gathers the graphs at the given indices, in the order given
+
+        Args:
+            indices: Integer array of the indices of the graphs to gather
+
+        Returns:
+            A numpy `GraphsTuple` of the gathered graphs
+        """
+        graphs_tuple = self._graphs_tuple
+        indices = np.asarray(indices, dtype=np.int64)
+
+        n_node = graphs_tuple.n_node[indices]
+        n_edge = graphs_tuple.n_edge[indices]
+        node_index = contiguous_ranges(self._node_offsets[indices], n_node)
+        edge_index = contiguous_ranges(self._edge_offsets[indices], n_edge)
+
+        # Senders and receivers index into the nodes of the whole store, so shift them to index into the batch instead
+        batch_node_offsets = np.cumsum(n_node) - n_node
+        shift = np.repeat(batch_node_offsets - self._node_offsets[indices], n_edge)
+
+        return graphs_tuple.replace(
+            nodes=None if graphs_tuple.nodes is None else graphs_tuple.nodes[node_index],
+            edges=None if graphs_tuple.edges is None else graphs_tuple.edges[edge_index],
+            globals=None if graphs_tuple.globals is None else graphs_tuple.globals[indices],
+            senders=(graphs_tuple.senders[edge_index] + shift).astype(graphs_tuple.senders.dtype),
+            receivers=(graphs_tuple.receivers[edge_index] + shift).astype(graphs_tuple.receivers.dtype),
+            n_node=n_node,
+            n_edge=n_edge)
+
+
+class MiniBatchSampler:
+    """
+    Draws mini-batches of graph indices. The indices are shuffled at the start of every epoch, using a seeded random
+    number generator so that the sequence of batches is reproducible. The final batch of an epoch holds any remaining
+    indices, and so may be smaller than `batch_size`.
+    """
+    def __init__(self, num_graphs, batch_size, seed=None):
+        """
+        Args:
+            num_graphs: The number of graphs to sample from
+            batch_size: The number of graphs in each batch
+            seed: Seed for the shuffling of the graphs
+        """
+        if batch_size < 1:
+            raise ValueError(f'batch_size must be at least 1, got {batch_size}')
+        self._num_graphs = num_graphs
+        self._batch_size = batch_size
+        self._rng = np.random.default_rng(seed)
+        self._epoch = np.empty(0, dtype=np.int64)
+        self._position = 0
+
+    def next_batch(self):
+        """
+        Returns:
+            Integer array of the indices of the graphs in the next batch
+        """
+        if self._position >= len(self._epoch):
+            self._epoch = self._rng.permutation(self._num_graphs)
+            self._position = 0
+        batch = self._epoch[self._position:self._position + self._batch_size]
+        self._position += self._batch_size
+        return batch
+
+
+class BucketedBatchSampler:
+    """
+    Draws mini-batches of graph indices such that every batch holds roughly the same number of nodes and edges in
+    total, so that each training step does a similar amount of work. Graphs are grouped into buckets of similar size
+    (nodes plus edges), with bucket boundaries at quantiles of the sizes, and each batch is drawn from a single bucket,
+    holding as many of its graphs as fit within `max_elements`. A graph larger than `max_elements` is batched alone.
+
+    The graphs within each bucket, and the order of the batches, are shuffled at the start of every epoch using a
+    seeded random number generator, so the sequence of batches is reproducible. The last batch drawn from each bucket
+    in an epoch holds any remaining graphs, and so may be smaller than the rest.
+    """
+    def __init__(self, n_node, n_edge, max_elements, num_buckets=8, seed=None):
+        """
+        Args:
+            n_node: The number of nodes in each graph to sample from
+            n_edge: The number of edges in each graph to sample from
+            max_elements: The greatest total number of nodes and edges to put in a batch
+            num_buckets: The most buckets to group the graphs into. Fewer are used if the graph sizes have fewer
+                distinct quantiles
+            seed: Seed for the shuffling of the graphs
+        """
+        if max_elements < 1:
+            raise ValueError(f'max_elements must be at least 1, got {max_elements}')
+        if num_buckets < 1:
+            raise ValueError(f'num_buckets must be at least 1, got {num_buckets}')
+
+        sizes = np.asarray(n_node, dtype=np.int64) + np.asarray(n_edge, dtype=np.int64)
+        if len(sizes) == 0:
+            raise ValueError('Cannot sample batches from no graphs')
+
+        boundaries = np.unique(np.quantile(sizes, np.linspace(0, 1, num_buckets + 1)[1:-1]))
+        bucket_ids = np.searchsorted(boundaries, sizes, side='left')
+
+        self._buckets = []
+        self._graphs_per_batch = []
+        for bucket_id in np.unique(bucket_ids):
+            bucket = np.flatnonzero(bucket_ids == bucket_id)
+            self._buckets.append(bucket)
+            self._graphs_per_batch.append(max(1, int(max_elements // np.max(sizes[bucket]))))
+
+        self._rng = np.random.default_rng(seed)
+        self._epoch = []
+        self._position = 0
+
+    @property
+    def num_buckets(self):
+        """The number of buckets the graphs were grouped into"""
+        return len(self._buckets)
+
+    def _new_epoch(self):
+        batches = []
+        for bucket, graphs_per_batch in zip(self._buckets, self._graphs_per_batch):
+            shuffled = self._rng.permutation(bucket)
+            batches.extend(shuffled[start:start + graphs_per_batch]
+                           for start in range(0, len(shuffled), graphs_per_batch))
+        return [batches[i] for i in self._rng.permutation(len(batches))]
+
+    def next_batch(self):
+        """
+        Returns:
+            Integer array of the indices of the graphs in the next batch
+        """
+        if self._position >= len(self._epoch):
+            self._epoch = self._new_epoch()
+            self._position = 0
+        batch = self._epoch[self._position]
+        self._position += 1
+        return batch
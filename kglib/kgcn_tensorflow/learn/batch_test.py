@@ -0,0 +1,126 @@
+#
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+#
+
+import unittest
+
+import networkx as nx
+import numpy as np
+from graph_nets import utils_np
+
+from kglib.kgcn_tensorflow.learn.batch import contiguous_ranges, GraphsTupleStore, MiniBatchSampler, \
+    BucketedBatchSampler
+
+
+def create_graph(num_nodes, offset):
+    graph = nx.MultiDiGraph()
+    for node in range(num_nodes):
+        graph.add_node(node, features=np.array([offset, node, 0], dtype=np.float32))
+    for node in range(1, num_nodes):
+        graph.add_edge(node, node - 1, features=np.array([offset, node, 1], dtype=np.float32))
+    graph.graph['features'] = np.full(5, offset, dtype=np.float32)
+    return graph
+
+
+class TestContiguousRanges(unittest.TestCase):
+
+    def test_ranges_are_as_expected(self):
+        ranges = contiguous_ranges(np.array([5, 0, 10]), np.array([2, 3, 0]))
+        np.testing.assert_array_equal(np.array([5, 6, 0, 1, 2]), ranges)
+
+
+class TestGraphsTupleStore(unittest.TestCase):
+
+    def test_gathered_graphs_match_converting_those_graphs_directly(self):
+        graphs = [create_graph(num_nodes, offset) for offset, num_nodes in enumerate([3, 2, 4, 2])]
+        store = GraphsTupleStore(utils_np.networkxs_to_graphs_tuple(graphs))
+
+        gathered = store.get([2, 0, 3])
+        expected = utils_np.networkxs_to_graphs_tuple([graphs[2], graphs[0], graphs[3]])
+
+        self.assertEqual(4, len(store))
+        for field in ['nodes', 'edges', 'globals', 'senders', 'receivers', 'n_node', 'n_edge']:
+            np.testing.assert_array_equal(getattr(expected, field), getattr(gathered, field), err_msg=field)
+
+
+class TestMiniBatchSampler(unittest.TestCase):
+
+    def test_each_epoch_covers_every_graph_once(self):
+        sampler = MiniBatchSampler(5, 2, seed=0)
+
+        epoch = [sampler.next_batch() for _ in range(3)]
+
+        self.assertEqual([2, 2, 1], [len(batch) for batch in epoch])
+        self.assertCountEqual(list(range(5)), np.concatenate(epoch).tolist())
+
+    def test_batches_are_deterministic_given_seed(self):
+        sampler_a = MiniBatchSampler(10, 3, seed=7)
+        sampler_b = MiniBatchSampler(10, 3, seed=7)
+
+        for _ in range(10):
+            np.testing.assert_array_equal(sampler_a.next_batch(), sampler_b.next_batch())
+
+    def test_exception_raised_if_batch_size_is_not_positive(self):
+        with self.assertRaises(ValueError):
+            MiniBatchSampler(10, 0)
+
+
+class TestBucketedBatchSampler(unittest.TestCase):
+
+    def setUp(self):
+        # Ten small graphs of 3 elements and two large graphs of 30 elements
+        self.n_node = np.array([2] * 10 + [10, 10])
+        self.n_edge = np.array([1] * 10 + [20, 20])
+
+    def test_each_epoch_covers_every_graph_once(self):
+        sampler = BucketedBatchSampler(self.n_node, self.n_edge, max_elements=12, num_buckets=2, seed=0)
+
+        epoch = [sampler.next_batch() for _ in range(5)]
+
+        self.assertCountEqual(list(range(12)), np.concatenate(epoch).tolist())
+
+    def test_batches_do_not_mix_sizes_or_exceed_max_elements(self):
+        sampler = BucketedBatchSampler(self.n_node, self.n_edge, max_elements=12, num_buckets=2, seed=0)
+        sizes = self.n_node + self.n_edge
+
+        batches = [sampler.next_batch() for _ in range(5)]
+
+        self.assertEqual(2, sampler.num_buckets)
+        for batch in batches:
+            self.assertEqual(1, len(np.unique(sizes[batch])))
+            self.assertTrue(len(batch) == 1 or np.sum(sizes[batch]) <= 12)
+        self.assertCountEqual([4, 4, 2, 1, 1], [len(batch) for batch in batches])
+
+    def test_graph_larger_than_max_elements_is_batched_alone(self):
+        sampler = BucketedBatchSampler([100], [100], max_elements=10, seed=0)
+        np.testing.assert_array_equal([0], sampler.next_batch())
+
+    def test_batches_are_deterministic_given_seed(self):
+        sampler_a = BucketedBatchSampler(self.n_node, self.n_edge, max_elements=12, seed=7)
+        sampler_b = BucketedBatchSampler(self.n_node, self.n_edge, max_elements=12, seed=7)
+
+        for _ in range(10):
+            np.testing.assert_array_equal(sampler_a.next_batch(), sampler_b.next_batch())
+
+    def test_exception_raised_if_max_elements_is_not_positive(self):
+        with self.assertRaises(ValueError):
+            BucketedBatchSampler(self.n_node, self.n_edge, max_elements=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+#
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+#
+
+
+import tensorflow as tf
+from graph_nets.graphs import GraphsTuple
+
+# The GraphsTuple fields passed through the dataset. All of them must be present in the graphs given
+FIELDS = ('nodes', 'edges', 'receivers', 'senders', 'globals', 'n_node', 'n_edge')
+
+
+def _graphs_tuple_arrays(graphs_tuple):
+    return [getattr(graphs_tuple, field) for field in FIELDS]
+
+
+def create_batch_dataset(get_batch, num_batches, input_ph, target_ph, num_parallel_calls=4, prefetch_size=2):
+    """
+    Creates a `tf.data.Dataset` of input and target graph batches. Each batch is made in Python by `get_batch`, and
+    batches are made in parallel and ahead of when they are needed, so that preparing the batches for later training
+    iterations overlaps with running the current one
+
+    Args:
+        get_batch: Function taking the number of a batch and returning its input and target graphs, as numpy
+            `GraphsTuple`s. It may be called from several threads at once and out of order, so must not rely on state
+            that changes between calls
+        num_batches: The number of batches in the dataset
+        input_ph: The input graphs' placeholders, which give the dtypes and shapes of the input graphs
+        target_ph: The target graphs' placeholders, which give the dtypes and shapes of the target graphs
+        num_parallel_calls: Number of batches to make at once
+        prefetch_size: Number of batches to have ready ahead of the one being trained on
+
+    Returns:
+        The dataset, whose elements are tuples of input and target `GraphsTuple`s of tensors
+    """
+    templates = _graphs_tuple_arrays(input_ph) + _graphs_tuple_arrays(target_ph)
+
+    def make_batch(batch_number):
+        input_graphs, target_graphs = get_batch(int(batch_number))
+        arrays = _graphs_tuple_arrays(input_graphs) + _graphs_tuple_arrays(target_graphs)
+        return [array.astype(template.dtype.as_numpy_dtype, copy=False) for array, template in zip(arrays, templates)]
+
+    def load_batch(batch_number):
+        tensors = tf.py_func(make_batch, [batch_number], [template.dtype for template in templates], stateful=False)
+        for tensor, template in zip(tensors, templates):
+            tensor.set_shape(template.shape)
+        return (GraphsTuple(**dict(zip(FIELDS, tensors[:len(FIELDS)]))),
+                GraphsTuple(**dict(zip(FIELDS, tensors[len(FIELDS):]))))
+
+    dataset = tf.data.Dataset.range(num_batches)
+    dataset = dataset.map(load_batch, num_parallel_calls=num_parallel_calls)
+    return dataset.prefetch(prefetch_size)
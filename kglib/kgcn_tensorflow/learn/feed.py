@@ -18,17 +18,59 @@
 #
 
 from graph_nets import utils_tf, utils_np
+from graph_nets.graphs import GraphsTuple
+
+from kglib.kgcn_data_loader.dataset.graph_shards import GraphShard
+
+
+def is_data_dicts(graphs):
+    """Whether `graphs` are given as graph_nets data dicts, rather than networkx graphs"""
+    return len(graphs) > 0 and isinstance(graphs[0], dict)
+
+
+def graphs_to_graphs_tuple(graphs):
+    """
+    Converts graphs to a numpy `GraphsTuple`
+
+    Args:
+        graphs: A list of networkx graphs, a list of graph_nets data dicts, or a `GraphShard`
+
+    Returns:
+        The graphs as a numpy `GraphsTuple`. For a `GraphShard` this wraps the shard's memory-mapped arrays without
+        copying them
+    """
+    if isinstance(graphs, GraphShard):
+        return GraphsTuple(**graphs.fields)
+    if is_data_dicts(graphs):
+        return utils_np.data_dicts_to_graphs_tuple(graphs)
+    return utils_np.networkxs_to_graphs_tuple(graphs)
+
+
+def create_placeholder(graphs, name):
+    """
+    Creates a placeholder with the feature sizes of the given graphs, which can be networkx graphs or graph_nets data
+    dicts. The number of graphs, nodes and edges fed to it can vary.
+    Returns:
+    The graphs' placeholders, as a graph namedtuple.
+    """
+    if isinstance(graphs, GraphShard):
+        # Only the feature sizes are needed, so avoid reading the whole shard
+        graphs = [graphs[0]]
+    if is_data_dicts(graphs):
+        return utils_tf.placeholders_from_data_dicts(graphs, name=f"{name}_placeholders_from_data_dicts")
+    return utils_tf.placeholders_from_networkxs(graphs, name=f"{name}_placeholders_from_networkxs")
 
 
 def create_placeholders(input_graphs, target_graphs):
     """
-    Creates placeholders for the model training and evaluation.
+    Creates placeholders for the model training and evaluation. The graphs can be networkx graphs or graph_nets data
+    dicts.
     Returns:
     input_ph: The input graph's placeholders, as a graph namedtuple.
     target_ph: The target graph's placeholders, as a graph namedtuple.
     """
-    input_ph = utils_tf.placeholders_from_networkxs(input_graphs, name="input_placeholders_from_networksx")
-    target_ph = utils_tf.placeholders_from_networkxs(target_graphs, name="target_placeholders_from_networkxs")
+    input_ph = create_placeholder(input_graphs, "input")
+    target_ph = create_placeholder(target_graphs, "target")
     return input_ph, target_ph
 
 
@@ -44,12 +86,80 @@ def create_feed_dict(input_ph, target_ph, inputs, targets):
     Returns:
         feed_dict: The feed `dict` of input and target placeholders and data.
     """
-    input_graphs = utils_np.networkxs_to_graphs_tuple(inputs)
-    target_graphs = utils_np.networkxs_to_graphs_tuple(targets)
+    input_graphs = graphs_to_graphs_tuple(inputs)
+    target_graphs = graphs_to_graphs_tuple(targets)
     feed_dict = {input_ph: input_graphs, target_ph: target_graphs}
     return feed_dict
 
 
+class GraphsTupleCache:
+    """
+    Converts a list of networkx graphs (or graph_nets data dicts) to a numpy `GraphsTuple` once, and returns that same
+    `GraphsTuple` for as long as it is called with the same graphs. The conversion is only redone if the list given
+    holds different graph objects. Graphs modified in-place after conversion are not detected. A `GraphShard` is cached
+    by identity, as it is read-only.
+    """
+    def __init__(self):
+        self._graphs = None
+        self._graphs_tuple = None
+
+    def __call__(self, graphs):
+        """
+        Args:
+            graphs: The networkx graphs, or graph_nets data dicts, to convert
+
+        Returns:
+            The graphs as a numpy `GraphsTuple`
+        """
+        if not self._is_cached(graphs):
+            self._graphs_tuple = graphs_to_graphs_tuple(graphs)
+            self._graphs = graphs if isinstance(graphs, GraphShard) else list(graphs)
+        return self._graphs_tuple
+
+    def _is_cached(self, graphs):
+        if isinstance(graphs, GraphShard) or isinstance(self._graphs, GraphShard):
+            return self._graphs is graphs
+        if self._graphs is None or len(self._graphs) != len(graphs):
+            return False
+        return all(cached is graph for cached, graph in zip(self._graphs, graphs))
+
+    def clear(self):
+        self._graphs = None
+        self._graphs_tuple = None
+
+
+class FeedDictCache:
+    """
+    Creates feed dicts in the same way as `create_feed_dict`, but only converts the input and target graphs to
+    `GraphsTuple`s when they differ from those given in the previous call
+    """
+    def __init__(self, input_ph, target_ph):
+        """
+        Args:
+            input_ph: The input graph's placeholders, as a graph namedtuple.
+            target_ph: The target graph's placeholders, as a graph namedtuple.
+        """
+        self._input_ph = input_ph
+        self._target_ph = target_ph
+        self._input_cache = GraphsTupleCache()
+        self._target_cache = GraphsTupleCache()
+
+    def __call__(self, inputs, targets):
+        """
+        Args:
+            inputs: The input graphs
+            targets: The target graphs
+
+        Returns:
+            feed_dict: The feed `dict` of input and target placeholders and data.
+        """
+        return {self._input_ph: self._input_cache(inputs), self._target_ph: self._target_cache(targets)}
+
+    def clear(self):
+        self._input_cache.clear()
+        self._target_cache.clear()
+
+
 def make_all_runnable_in_session(*args):
     """Lets an iterable of TF graphs be output from a session as NP graphs."""
     return [utils_tf.make_runnable_in_session(a) for a in args]
\ No newline at end of file
@@ -0,0 +1,115 @@
+#
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+#
+
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import networkx as nx
+import numpy as np
+from graph_nets import utils_np
+
+from kglib.kgcn_data_loader.dataset.graph_shards import write_graph_shard, GraphShard
+from kglib.kgcn_tensorflow.learn.batch import GraphsTupleStore
+from kglib.kgcn_tensorflow.learn.feed import GraphsTupleCache, FeedDictCache, graphs_to_graphs_tuple
+
+
+def create_graph(num_nodes):
+    graph = nx.MultiDiGraph()
+    for node in range(num_nodes):
+        graph.add_node(node, features=np.array([0, node, 0], dtype=np.float32))
+    for node in range(1, num_nodes):
+        graph.add_edge(node - 1, node, features=np.array([0, 1, 0], dtype=np.float32))
+    graph.graph['features'] = np.zeros(5, dtype=np.float32)
+    return graph
+
+
+class TestGraphsTupleCache(unittest.TestCase):
+
+    def test_graphs_converted_once_for_the_same_graphs(self):
+        graphs = [create_graph(2), create_graph(3)]
+        cache = GraphsTupleCache()
+
+        with patch.object(utils_np, 'networkxs_to_graphs_tuple', wraps=utils_np.networkxs_to_graphs_tuple) as convert:
+            first = cache(graphs)
+            second = cache(list(graphs))
+
+        self.assertEqual(1, convert.call_count)
+        self.assertIs(first, second)
+        np.testing.assert_array_equal(np.array([2, 3]), first.n_node)
+
+    def test_graphs_reconverted_when_graphs_change(self):
+        graphs = [create_graph(2), create_graph(3)]
+        cache = GraphsTupleCache()
+
+        with patch.object(utils_np, 'networkxs_to_graphs_tuple', wraps=utils_np.networkxs_to_graphs_tuple) as convert:
+            cache(graphs)
+            changed = cache([graphs[0], create_graph(4)])
+            shorter = cache(graphs[:1])
+
+        self.assertEqual(3, convert.call_count)
+        np.testing.assert_array_equal(np.array([2, 4]), changed.n_node)
+        np.testing.assert_array_equal(np.array([2]), shorter.n_node)
+
+
+class TestGraphsToGraphsTupleFromShard(unittest.TestCase):
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.graphs = [create_graph(2), create_graph(3), create_graph(4)]
+        write_graph_shard(self._directory.name,
+                          [utils_np.networkx_to_data_dict(graph) for graph in self.graphs])
+        self.shard = GraphShard(self._directory.name)
+
+    def tearDown(self):
+        del self.shard
+        self._directory.cleanup()
+
+    def test_shard_arrays_are_not_copied(self):
+        graphs_tuple = graphs_to_graphs_tuple(self.shard)
+        self.assertIs(self.shard.fields['nodes'], graphs_tuple.nodes)
+
+    def test_batches_gathered_from_shard_match_those_from_graphs(self):
+        expected = GraphsTupleStore(utils_np.networkxs_to_graphs_tuple(self.graphs)).get([2, 0])
+        batch = GraphsTupleStore(graphs_to_graphs_tuple(self.shard)).get([2, 0])
+        for field in ('nodes', 'edges', 'senders', 'receivers', 'globals', 'n_node', 'n_edge'):
+            np.testing.assert_array_equal(getattr(expected, field), getattr(batch, field))
+
+    def test_shard_is_cached_by_identity(self):
+        cache = GraphsTupleCache()
+        self.assertIs(cache(self.shard), cache(self.shard))
+        self.assertIsNot(cache(self.shard), cache(self.graphs))
+
+
+class TestFeedDictCache(unittest.TestCase):
+
+    def test_feed_dict_is_as_expected(self):
+        inputs = [create_graph(2)]
+        targets = [create_graph(2)]
+        cache = FeedDictCache('input_ph', 'target_ph')
+
+        feed_dict = cache(inputs, targets)
+
+        self.assertCountEqual(['input_ph', 'target_ph'], feed_dict.keys())
+        np.testing.assert_array_equal(np.array([[0, 0, 0], [0, 1, 0]], dtype=np.float32), feed_dict['input_ph'].nodes)
+        self.assertIs(feed_dict['target_ph'], cache(inputs, targets)['target_ph'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+#
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+#
+
+import tensorflow as tf
+from graph_nets import utils_tf
+
+from kglib.kgcn_tensorflow.learn.feed import create_placeholder, graphs_to_graphs_tuple
+
+
+class KGCNInference:
+    """
+    Scores graphs with a KGCN restored from a checkpoint saved by `KGCNLearner`. Only the ops needed to produce the
+    final output of the model are built, in a TensorFlow graph of its own, so no training ops are built or run.
+    """
+    def __init__(self, model_fn, checkpoint_path, example_input_graphs, num_processing_steps_ge=10):
+        """
+        Args:
+            model_fn: Callable taking no arguments, returning a new KGCN built in the same way as the one trained. A
+                new model is needed since a Sonnet module can only be connected to one TensorFlow graph
+            checkpoint_path: Path prefix of the checkpoint saved by `KGCNLearner`
+            example_input_graphs: One or more input graphs, as networkx graphs or graph_nets data dicts, with the
+                same feature sizes as the graphs to be scored
+            num_processing_steps_ge: Number of processing (message-passing) steps to run
+        """
+        self._graph = tf.Graph()
+        with self._graph.as_default():
+            input_ph = create_placeholder(example_input_graphs, "input")
+            # The number of features of the graphs the model can score
+            self.feature_sizes = {field: getattr(input_ph, field).shape.as_list()[-1]
+                                  for field in ('nodes', 'edges', 'globals')}
+            model = model_fn()
+            self._output_op = model(input_ph, num_processing_steps_ge)[-1]
+            self._input_ph = utils_tf.make_runnable_in_session(input_ph)
+
+            self._session = tf.Session(graph=self._graph)
+            # The saver only holds the model's variables, so the optimiser's variables in the checkpoint are ignored
+            tf.train.Saver().restore(self._session, checkpoint_path)
+        self._graph.finalize()
+
+    def __call__(self, input_graphs):
+        """
+        Args:
+            input_graphs: The input graphs to score, as networkx graphs or graph_nets data dicts
+
+        Returns:
+            The output of the final processing step for all of the graphs, as a numpy `GraphsTuple`
+        """
+        return self._session.run(self._output_op, feed_dict={self._input_ph: graphs_to_graphs_tuple(input_graphs)})
+
+    def close(self):
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
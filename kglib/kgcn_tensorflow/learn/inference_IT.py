@@ -0,0 +1,77 @@
+#
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+#
+
+import os
+import tempfile
+import unittest
+
+import networkx as nx
+import numpy as np
+
+from kglib.kgcn_tensorflow.learn.inference import KGCNInference
+from kglib.kgcn_tensorflow.learn.learn import KGCNLearner
+from kglib.kgcn_tensorflow.models.core import KGCN
+from kglib.kgcn_tensorflow.models.embedding import ThingEmbedder, RoleEmbedder
+
+
+def create_kgcn():
+    thing_embedder = ThingEmbedder(node_types=['a', 'b', 'c'], type_embedding_dim=5,
+                                   attr_embedding_dim=6, categorical_attributes={}, continuous_attributes={})
+
+    role_embedder = RoleEmbedder(num_edge_types=2, type_embedding_dim=5)
+
+    return KGCN(thing_embedder, role_embedder, edge_output_size=3, node_output_size=3)
+
+
+def create_graph(node_features, edge_features):
+    graph = nx.MultiDiGraph()
+    graph.add_node(0, features=node_features)
+    graph.add_edge(1, 0, features=edge_features)
+    graph.add_node(1, features=node_features)
+    graph.add_edge(1, 2, features=edge_features)
+    graph.add_node(2, features=node_features)
+    graph.graph['features'] = np.zeros(5, dtype=np.float32)
+    return graph
+
+
+class ITKGCNInference(unittest.TestCase):
+    def test_inference_matches_learner_generalisation_output(self):
+        input_graph = create_graph(np.array([0, 1, 2], dtype=np.float32), np.array([0, 1, 2], dtype=np.float32))
+        target_graph = create_graph(np.array([0, 1, 0], dtype=np.float32), np.array([0, 0, 1], dtype=np.float32))
+
+        learner = KGCNLearner(create_kgcn(), num_processing_steps_tr=2, num_processing_steps_ge=2)
+
+        with tempfile.TemporaryDirectory() as checkpoint_dir:
+            save_path = os.path.join(checkpoint_dir, 'kgcn')
+            _, test_values, _ = learner([input_graph], [target_graph], [input_graph], [target_graph],
+                                        num_training_iterations=1, save_path=save_path)
+
+            with KGCNInference(create_kgcn, save_path, [input_graph], num_processing_steps_ge=2) as inference:
+                output = inference([input_graph, input_graph])
+                feature_sizes = inference.feature_sizes
+
+        self.assertEqual(dict(nodes=3, edges=3, globals=5), feature_sizes)
+
+        expected = test_values["outputs"][-1]
+        np.testing.assert_allclose(np.concatenate([expected.nodes] * 2), output.nodes, rtol=1e-5)
+        np.testing.assert_allclose(np.concatenate([expected.edges] * 2), output.edges, rtol=1e-5)
+
+
+if __name__ == "__main__":
+    unittest.main()
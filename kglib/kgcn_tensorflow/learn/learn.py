@@ -21,7 +21,10 @@ import time
 
 import tensorflow as tf
 
-from kglib.kgcn_tensorflow.learn.feed import create_placeholders, create_feed_dict, make_all_runnable_in_session
+from kglib.kgcn_tensorflow.learn.batch import GraphsTupleStore, MiniBatchSampler, BucketedBatchSampler
+from kglib.kgcn_tensorflow.learn.dataset import create_batch_dataset
+from kglib.kgcn_tensorflow.learn.feed import create_placeholders, make_all_runnable_in_session, FeedDictCache, \
+    graphs_to_graphs_tuple
 from kglib.kgcn_tensorflow.learn.loss import loss_ops_preexisting_no_penalty
 from kglib.kgcn_tensorflow.learn.metrics import existence_accuracy
 
@@ -43,16 +46,44 @@ class KGCNLearner:
                  num_training_iterations=1000,
                  learning_rate=1e-3,
                  log_every_epochs=20,
-                 log_dir=None):
+                 log_dir=None,
+                 batch_size=None,
+                 batch_seed=0,
+                 batch_max_elements=None,
+                 use_tf_data=False,
+                 num_parallel_batches=4,
+                 prefetch_size=2,
+                 save_path=None,
+                 restore_path=None):
         """
         Args:
-            tr_graphs: In-memory graphs of Grakn concepts for training
-            ge_graphs: In-memory graphs of Grakn concepts for generalisation
+            tr_graphs: In-memory graphs of Grakn concepts for training, as networkx graphs or graph_nets data dicts,
+                or as `GraphShard`s of preprocessed graphs. Batches are gathered straight from a shard's memory-mapped
+                arrays
+            ge_graphs: In-memory graphs of Grakn concepts for generalisation, as networkx graphs or graph_nets data
+                dicts
             num_processing_steps_tr: Number of processing (message-passing) steps for training.
             num_processing_steps_ge: Number of processing (message-passing) steps for generalization.
             num_training_iterations: Number of training iterations
             log_every_seconds: The time to wait between logging and printing the next set of results.
             log_dir: Directory to store TensorFlow events files
+            batch_size: Number of training graphs to use in each training iteration. If None, all of the training
+                graphs are used in every iteration
+            batch_seed: Seed for shuffling the training graphs into batches when `batch_size` or `batch_max_elements`
+                is given
+            batch_max_elements: Total number of nodes and edges to aim for in each training iteration. If given, the
+                training graphs are bucketed by size and batched so that every iteration does a similar amount of
+                work, in place of batching by `batch_size`
+            use_tf_data: Whether to feed the training graphs through a `tf.data` pipeline, which prepares the batches
+                for the coming iterations in background threads while the current iteration runs, rather than feeding
+                each one synchronously
+            num_parallel_batches: Number of training batches to prepare at once when `use_tf_data` is True
+            prefetch_size: Number of training batches to keep ready ahead of the current iteration when `use_tf_data`
+                is True
+            save_path: Path prefix to save a checkpoint of the trained variables to, for use by `KGCNInference`. If
+                None, no checkpoint is saved
+            restore_path: Path prefix of a checkpoint saved by a previous run, to continue training from. If None, the
+                variables are freshly initialised
 
         Returns:
 
@@ -62,12 +93,44 @@ class KGCNLearner:
 
         input_ph, target_ph = create_placeholders(tr_input_graphs, tr_target_graphs)
 
+        use_batches = batch_size is not None or batch_max_elements is not None
+        if use_batches:
+            # Concatenate all training graphs once, and gather each mini-batch from them
+            tr_input_store = GraphsTupleStore(graphs_to_graphs_tuple(tr_input_graphs))
+            tr_target_store = GraphsTupleStore(graphs_to_graphs_tuple(tr_target_graphs))
+            if batch_max_elements is not None:
+                batch_sampler = BucketedBatchSampler(tr_input_store.n_node, tr_input_store.n_edge, batch_max_elements,
+                                                     seed=batch_seed)
+            else:
+                batch_sampler = MiniBatchSampler(len(tr_input_store), batch_size, seed=batch_seed)
+
+        if use_tf_data:
+            if use_batches:
+                # Draw the batches up front, so that they can be gathered concurrently and still be reproducible
+                tr_batch_indices = [batch_sampler.next_batch() for _ in range(num_training_iterations)]
+
+                def get_batch(iteration):
+                    indices = tr_batch_indices[iteration]
+                    return tr_input_store.get(indices), tr_target_store.get(indices)
+            else:
+                tr_graphs_tuples = graphs_to_graphs_tuple(tr_input_graphs), graphs_to_graphs_tuple(tr_target_graphs)
+
+                def get_batch(iteration):
+                    return tr_graphs_tuples
+
+            tr_dataset = create_batch_dataset(get_batch, num_training_iterations, input_ph, target_ph,
+                                              num_parallel_calls=num_parallel_batches, prefetch_size=prefetch_size)
+            tr_iterator = tr_dataset.make_initializable_iterator()
+            tr_input, tr_target = tr_iterator.get_next()
+        else:
+            tr_input, tr_target = input_ph, target_ph
+
         # A list of outputs, one per processing step.
-        output_ops_tr = self._model(input_ph, self._num_processing_steps_tr)
+        output_ops_tr = self._model(tr_input, self._num_processing_steps_tr)
         output_ops_ge = self._model(input_ph, self._num_processing_steps_ge)
 
         # Training loss.
-        loss_ops_tr = loss_ops_preexisting_no_penalty(target_ph, output_ops_tr)
+        loss_ops_tr = loss_ops_preexisting_no_penalty(tr_target, output_ops_tr)
         # Loss across processing steps.
         loss_op_tr = sum(loss_ops_tr) / self._num_processing_steps_tr
 
@@ -91,7 +154,7 @@ class KGCNLearner:
         gradients, _ = tf.clip_by_global_norm(gradients, 5.0)
         step_op = optimizer.apply_gradients(zip(gradients, variables))
 
-        input_ph, target_ph = make_all_runnable_in_session(input_ph, target_ph)
+        input_ph, target_ph, tr_target = make_all_runnable_in_session(input_ph, target_ph, tr_target)
 
         sess = tf.Session()
         merged_summaries = tf.summary.merge_all()
@@ -101,8 +164,16 @@ class KGCNLearner:
         if log_dir is not None:
             train_writer = tf.summary.FileWriter(log_dir, sess.graph)
 
+        saver = tf.train.Saver()
+
         sess.run(tf.global_variables_initializer())
 
+        if restore_path is not None:
+            saver.restore(sess, restore_path)
+
+        if use_tf_data:
+            sess.run(tr_iterator.initializer)
+
         logged_iterations = []
         losses_tr = []
         corrects_tr = []
@@ -118,16 +189,28 @@ class KGCNLearner:
               "Cge (test/generalization fraction nodes/edges labeled correctly), "
               "Sge (test/generalization fraction examples solved correctly)")
 
+        # The graphs don't change between iterations, so only convert them to GraphsTuples once
+        tr_feed_dict_cache = FeedDictCache(input_ph, target_ph)
+        ge_feed_dict_cache = FeedDictCache(input_ph, target_ph)
+
         start_time = time.time()
         for iteration in range(num_training_iterations):
-            feed_dict = create_feed_dict(input_ph, target_ph, tr_input_graphs, tr_target_graphs)
+            if use_tf_data:
+                # The training graphs come from the dataset, so nothing needs feeding
+                feed_dict = None
+            elif not use_batches:
+                feed_dict = tr_feed_dict_cache(tr_input_graphs, tr_target_graphs)
+            else:
+                batch_indices = batch_sampler.next_batch()
+                feed_dict = {input_ph: tr_input_store.get(batch_indices),
+                             target_ph: tr_target_store.get(batch_indices)}
 
             if iteration % log_every_epochs == 0:
 
                 train_values = sess.run(
                     {
                         "step": step_op,
-                        "target": target_ph,
+                        "target": tr_target,
                         "loss": loss_op_tr,
                         "outputs": output_ops_tr,
                         "summary": merged_summaries
@@ -137,7 +220,7 @@ class KGCNLearner:
                 if train_writer is not None:
                     train_writer.add_summary(train_values["summary"], iteration)
 
-                feed_dict = create_feed_dict(input_ph, target_ph, ge_input_graphs, ge_target_graphs)
+                feed_dict = ge_feed_dict_cache(ge_input_graphs, ge_target_graphs)
                 test_values = sess.run(
                     {
                         "target": target_ph,
@@ -166,11 +249,15 @@ class KGCNLearner:
                 train_values = sess.run(
                     {
                         "step": step_op,
-                        "target": target_ph,
+                        "target": tr_target,
                         "loss": loss_op_tr,
                         "outputs": output_ops_tr
                     },
                     feed_dict=feed_dict)
 
+        if save_path is not None:
+            saved_path = saver.save(sess, save_path)
+            print(f"Saved checkpoint to {saved_path}")
+
         training_info = logged_iterations, losses_tr, losses_ge, corrects_tr, corrects_ge, solveds_tr, solveds_ge
         return train_values, test_values, training_info
@@ -21,40 +21,57 @@ import unittest
 
 import networkx as nx
 import numpy as np
+import tensorflow as tf
 
 from kglib.kgcn_tensorflow.learn.learn import KGCNLearner
 from kglib.kgcn_tensorflow.models.core import KGCN
 from kglib.kgcn_tensorflow.models.embedding import ThingEmbedder, RoleEmbedder
 
 
-class ITKGCNLearner(unittest.TestCase):
-    def test_learner_runs(self):
-        input_graph = nx.MultiDiGraph()
-        input_graph.add_node(0, features=np.array([0, 1, 2], dtype=np.float32))
-        input_graph.add_edge(1, 0, features=np.array([0, 1, 2], dtype=np.float32))
-        input_graph.add_node(1, features=np.array([0, 1, 2], dtype=np.float32))
-        input_graph.add_edge(1, 2, features=np.array([0, 1, 2], dtype=np.float32))
-        input_graph.add_node(2, features=np.array([0, 1, 2], dtype=np.float32))
-        input_graph.graph['features'] = np.zeros(5, dtype=np.float32)
+def create_graphs():
+    input_graph = nx.MultiDiGraph()
+    input_graph.add_node(0, features=np.array([0, 1, 2], dtype=np.float32))
+    input_graph.add_edge(1, 0, features=np.array([0, 1, 2], dtype=np.float32))
+    input_graph.add_node(1, features=np.array([0, 1, 2], dtype=np.float32))
+    input_graph.add_edge(1, 2, features=np.array([0, 1, 2], dtype=np.float32))
+    input_graph.add_node(2, features=np.array([0, 1, 2], dtype=np.float32))
+    input_graph.graph['features'] = np.zeros(5, dtype=np.float32)
+
+    target_graph = nx.MultiDiGraph()
+    target_graph.add_node(0, features=np.array([0, 1, 0], dtype=np.float32))
+    target_graph.add_edge(1, 0, features=np.array([0, 0, 1], dtype=np.float32))
+    target_graph.add_node(1, features=np.array([0, 0, 1], dtype=np.float32))
+    target_graph.add_edge(1, 2, features=np.array([0, 0, 1], dtype=np.float32))
+    target_graph.add_node(2, features=np.array([0, 1, 0], dtype=np.float32))
+    target_graph.graph['features'] = np.zeros(5, dtype=np.float32)
+
+    return input_graph, target_graph
 
-        target_graph = nx.MultiDiGraph()
-        target_graph.add_node(0, features=np.array([0, 1, 0], dtype=np.float32))
-        target_graph.add_edge(1, 0, features=np.array([0, 0, 1], dtype=np.float32))
-        target_graph.add_node(1, features=np.array([0, 0, 1], dtype=np.float32))
-        target_graph.add_edge(1, 2, features=np.array([0, 0, 1], dtype=np.float32))
-        target_graph.add_node(2, features=np.array([0, 1, 0], dtype=np.float32))
-        target_graph.graph['features'] = np.zeros(5, dtype=np.float32)
 
-        thing_embedder = ThingEmbedder(node_types=['a', 'b', 'c'], type_embedding_dim=5,
-                                       attr_embedding_dim=6, categorical_attributes={}, continuous_attributes={})
+def create_learner():
+    thing_embedder = ThingEmbedder(node_types=['a', 'b', 'c'], type_embedding_dim=5,
+                                   attr_embedding_dim=6, categorical_attributes={}, continuous_attributes={})
 
-        role_embedder = RoleEmbedder(num_edge_types=2, type_embedding_dim=5)
+    role_embedder = RoleEmbedder(num_edge_types=2, type_embedding_dim=5)
 
-        kgcn = KGCN(thing_embedder, role_embedder, edge_output_size=3, node_output_size=3)
+    kgcn = KGCN(thing_embedder, role_embedder, edge_output_size=3, node_output_size=3)
 
-        learner = KGCNLearner(kgcn, num_processing_steps_tr=2, num_processing_steps_ge=2)
+    return KGCNLearner(kgcn, num_processing_steps_tr=2, num_processing_steps_ge=2)
+
+
+class ITKGCNLearner(unittest.TestCase):
+    def test_learner_runs(self):
+        input_graph, target_graph = create_graphs()
+        with tf.Graph().as_default():
+            learner = create_learner()
+            learner([input_graph], [target_graph], [input_graph], [target_graph], num_training_iterations=50)
 
-        learner([input_graph], [target_graph], [input_graph], [target_graph], num_training_iterations=50)
+    def test_learner_runs_with_tf_data(self):
+        input_graph, target_graph = create_graphs()
+        with tf.Graph().as_default():
+            learner = create_learner()
+            learner([input_graph, input_graph], [target_graph, target_graph], [input_graph], [target_graph],
+                    num_training_iterations=50, batch_size=1, use_tf_data=True)
 
 
 if __name__ == "__main__":
@@ -17,17 +17,13 @@
 #  under the License.
 #
 
-import numpy as np
 import sonnet as snt
+import tensorflow as tf
 from graph_nets import modules
 from graph_nets import utils_tf
 from graph_nets.modules import GraphIndependent
 
 
-def softmax(x):
-    return np.exp(x) / np.sum(np.exp(x))
-
-
 def make_mlp_model(latent_size=16, num_layers=2):
     """Instantiates a new MLP, followed by LayerNorm.
 
@@ -43,6 +39,41 @@ def make_mlp_model(latent_size=16, num_layers=2):
     ])
 
 
+def add_reverse_edges(graphs):
+    """
+    Duplicates every edge in the reverse direction, in-graph. Within each graph the reversed edges follow the originals,
+    in the same order, as they do for `EncodedGraph.add_reverse_edges`, so the graphs' edges stay contiguous
+
+    Args:
+        graphs: A `GraphsTuple` of tensors
+
+    Returns:
+        The `GraphsTuple` with its edges doubled, and the indices of the original edges among the doubled edges
+    """
+    n_edge = graphs.n_edge
+    num_edges = tf.reduce_sum(n_edge)
+    edge_offsets = tf.cumsum(n_edge, exclusive=True)
+
+    # For each doubled edge, find the graph it belongs to and its position within that graph's doubled edges
+    graph_index = utils_tf.repeat(tf.range(tf.shape(n_edge)[0]), 2 * n_edge)
+    local_index = tf.range(2 * num_edges) - tf.gather(2 * edge_offsets, graph_index)
+    graph_n_edge = tf.gather(n_edge, graph_index)
+    is_reversed = local_index >= graph_n_edge
+    # Index into the original edges followed by the reversed edges
+    source_index = (tf.gather(edge_offsets, graph_index) + local_index
+                    + tf.where(is_reversed, num_edges - graph_n_edge, tf.zeros_like(graph_n_edge)))
+
+    doubled = graphs.replace(
+        edges=None if graphs.edges is None else tf.gather(tf.concat([graphs.edges, graphs.edges], axis=0),
+                                                          source_index),
+        senders=tf.gather(tf.concat([graphs.senders, graphs.receivers], axis=0), source_index),
+        receivers=tf.gather(tf.concat([graphs.receivers, graphs.senders], axis=0), source_index),
+        n_edge=2 * n_edge)
+
+    original_index = utils_tf.repeat(edge_offsets, n_edge) + tf.range(num_edges)
+    return doubled, original_index
+
+
 class MLPGraphIndependent(snt.AbstractModule):
     """GraphIndependent with MLP edge, node, and global models."""
 
@@ -81,7 +112,14 @@ class KGCN(snt.AbstractModule):
                  node_output_size=3,
                  latent_size=16,
                  num_layers=2,
+                 reverse_edges=False,
                  name="KGCN"):
+        """
+        Args:
+            reverse_edges: Whether to pass messages along every edge in both directions, by duplicating the edges in
+                reverse inside the model. The outputs hold only the original edges. This replaces duplicating the edges
+                of the input graphs beforehand, which makes them twice the size
+        """
         super(KGCN, self).__init__(name=name)
 
         self._thing_embedder = thing_embedder
@@ -89,6 +127,7 @@ class KGCN(snt.AbstractModule):
 
         self._latent_size = latent_size
         self._num_layers = num_layers
+        self._reverse_edges = reverse_edges
 
         # Transforms the outputs into the appropriate shapes.
         if edge_output_size is None:
@@ -119,12 +158,24 @@ class KGCN(snt.AbstractModule):
         return GraphIndependent(self._edge_model, self._node_model, name='kg_encoder')
 
     def _build(self, input_op, num_processing_steps):
-        latent = self._encoder(input_op)
+        if self._reverse_edges:
+            graphs, original_edge_index = add_reverse_edges(input_op)
+        else:
+            graphs = input_op
+        latent = self._encoder(graphs)
         latent0 = latent
         output_ops = []
         for _ in range(num_processing_steps):
             core_input = utils_tf.concat([latent0, latent], axis=1)
             latent = self._core(core_input)
             decoded_op = self._decoder(latent)
-            output_ops.append(self._output_transform(decoded_op))
+            output_op = self._output_transform(decoded_op)
+            if self._reverse_edges:
+                # Give outputs for the original edges only, so that they line up with the input graphs
+                output_op = output_op.replace(
+                    edges=None if output_op.edges is None else tf.gather(output_op.edges, original_edge_index),
+                    senders=input_op.senders,
+                    receivers=input_op.receivers,
+                    n_edge=input_op.n_edge)
+            output_ops.append(output_op)
         return output_ops
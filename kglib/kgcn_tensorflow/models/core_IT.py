@@ -23,7 +23,7 @@ import numpy as np
 import tensorflow as tf
 from graph_nets.graphs import GraphsTuple
 
-from kglib.kgcn_tensorflow.models.core import KGCN
+from kglib.kgcn_tensorflow.models.core import KGCN, add_reverse_edges
 from kglib.kgcn_tensorflow.models.embedding import ThingEmbedder, RoleEmbedder
 
 
@@ -50,6 +50,65 @@ class ITKGCN(unittest.TestCase):
 
         kgcn(graph, 2)
 
+    def test_kgcn_reversing_edges_matches_edges_duplicated_on_the_host(self):
+        tf.enable_eager_execution()
+
+        nodes = np.array([[1, 2, 0], [1, 0, 0], [1, 1, 0]], dtype=np.float32)
+
+        def create_graph(edges, senders, receivers):
+            return GraphsTuple(nodes=tf.convert_to_tensor(nodes),
+                               edges=tf.convert_to_tensor(np.array(edges, dtype=np.float32)),
+                               globals=tf.convert_to_tensor(np.array([[0, 0, 0, 0, 0]], dtype=np.float32)),
+                               receivers=tf.convert_to_tensor(np.array(receivers, dtype=np.int32)),
+                               senders=tf.convert_to_tensor(np.array(senders, dtype=np.int32)),
+                               n_node=tf.convert_to_tensor(np.array([3], dtype=np.int32)),
+                               n_edge=tf.convert_to_tensor(np.array([len(edges)], dtype=np.int32)))
+
+        graph = create_graph([[1, 0, 0], [1, 1, 0]], senders=[0, 1], receivers=[1, 2])
+        # The same graph with its edges duplicated in reverse before being given to the model
+        duplicated_graph = create_graph([[1, 0, 0], [1, 1, 0], [1, 0, 0], [1, 1, 0]],
+                                        senders=[0, 1, 1, 2], receivers=[1, 2, 0, 1])
+
+        thing_embedder = ThingEmbedder(node_types=['a', 'b', 'c'], type_embedding_dim=5, attr_embedding_dim=6,
+                                       categorical_attributes={'a': ['a1', 'a2', 'a3'], 'b': ['b1', 'b2', 'b3']},
+                                       continuous_attributes={'c': (0, 1)})
+
+        role_embedder = RoleEmbedder(num_edge_types=2, type_embedding_dim=5)
+
+        kgcn = KGCN(thing_embedder, role_embedder, edge_output_size=3, node_output_size=3)
+
+        expected = kgcn(duplicated_graph, 2)[-1]
+        # Connecting the same module again reuses its variables, so only the way edges are reversed differs
+        kgcn._reverse_edges = True
+        output = kgcn(graph, 2)[-1]
+
+        np.testing.assert_allclose(expected.nodes.numpy(), output.nodes.numpy(), rtol=1e-5, atol=1e-6)
+        np.testing.assert_allclose(expected.edges.numpy()[:2], output.edges.numpy(), rtol=1e-5, atol=1e-6)
+        np.testing.assert_array_equal([0, 1], output.senders.numpy())
+        np.testing.assert_array_equal([2], output.n_edge.numpy())
+
+
+class ITAddReverseEdges(unittest.TestCase):
+
+    def test_reversed_edges_follow_the_originals_in_each_graph(self):
+        tf.enable_eager_execution()
+
+        graphs = GraphsTuple(nodes=tf.zeros((5, 1)),
+                             edges=tf.convert_to_tensor(np.array([[0], [1], [2]], dtype=np.float32)),
+                             globals=None,
+                             receivers=tf.convert_to_tensor(np.array([1, 2, 4], dtype=np.int32)),
+                             senders=tf.convert_to_tensor(np.array([0, 1, 3], dtype=np.int32)),
+                             n_node=tf.convert_to_tensor(np.array([3, 2], dtype=np.int32)),
+                             n_edge=tf.convert_to_tensor(np.array([2, 1], dtype=np.int32)))
+
+        doubled, original_index = add_reverse_edges(graphs)
+
+        np.testing.assert_array_equal([0, 1, 1, 2, 3, 4], doubled.senders.numpy())
+        np.testing.assert_array_equal([1, 2, 0, 1, 4, 3], doubled.receivers.numpy())
+        np.testing.assert_array_equal([[0], [1], [0], [1], [2], [2]], doubled.edges.numpy())
+        np.testing.assert_array_equal([4, 2], doubled.n_edge.numpy())
+        np.testing.assert_array_equal([0, 1, 4], original_index.numpy())
+
 
 if __name__ == "__main__":
     tf.enable_eager_execution()
@@ -17,19 +17,14 @@
 #  under the License.
 #
 
-import networkx as nx
-import numpy as np
-from graph_nets.utils_np import graphs_tuple_to_networkxs
-
 from kglib.kgcn_tensorflow.learn.learn import KGCNLearner
-from kglib.kgcn_tensorflow.models.core import softmax, KGCN
+from kglib.kgcn_tensorflow.models.core import KGCN
 from kglib.kgcn_tensorflow.models.embedding import ThingEmbedder, RoleEmbedder
 from kglib.kgcn_tensorflow.plot.plotting import plot_across_training, plot_predictions
 
-from kglib.kgcn_data_loader.encoding.standard_encode import encode_types, create_input_graph, create_target_graph, encode_values
-from kglib.kgcn_data_loader.utils import apply_logits_to_graphs, duplicate_edges_in_reverse
-from kglib.utils.graph.iterate import multidigraph_node_data_iterator, multidigraph_data_iterator, \
-    multidigraph_edge_data_iterator
+from kglib.kgcn_data_loader.encoding.standard_encode import create_input_and_target_data_dicts, SchemaEncoder
+from kglib.kgcn_data_loader.utils import apply_graphs_tuple_logits_to_graphs, original_edge_rows
+from kglib.kgcn_tensorflow.pipeline.preprocess import encode_graphs_to_data_dicts, encode_indexed_graph, index_graph
 
 def pipeline(graphs,
              tr_ge_split,
@@ -44,28 +39,29 @@ def pipeline(graphs,
              attr_embedding_dim=6,
              edge_output_size=3,
              node_output_size=3,
-             output_dir=None):
+             output_dir=None,
+             num_workers=None,
+             reverse_edges_in_model=False):
 
     ############################################################
     # Manipulate the graph data
     ############################################################
 
-    # Encode attribute values
-    graphs = [encode_values(graph, categorical_attributes, continuous_attributes) for graph in graphs]
-
-    indexed_graphs = [nx.convert_node_labels_to_integers(graph, label_attribute='concept') for graph in graphs]
-    graphs = [duplicate_edges_in_reverse(graph) for graph in indexed_graphs]
-
-    graphs = [encode_types(graph, multidigraph_node_data_iterator, node_types) for graph in graphs]
-    graphs = [encode_types(graph, multidigraph_edge_data_iterator, edge_types) for graph in graphs]
+    encoder = SchemaEncoder(node_types, edge_types, categorical_attributes, continuous_attributes)
 
-    input_graphs = [create_input_graph(graph) for graph in graphs]
-    target_graphs = [create_target_graph(graph) for graph in graphs]
+    # Only the training graphs' arrays are needed, so they can be encoded in worker processes. The generalisation
+    # graphs are kept here, since the predictions are written back onto them
+    # The KGCN can pass messages along edges in reverse itself, in which case the graphs are kept half the size
+    duplicate_in_reverse = not reverse_edges_in_model
+    tr_input_graphs, tr_target_graphs = encode_graphs_to_data_dicts(graphs[:tr_ge_split], encoder, num_workers,
+                                                                    duplicate_in_reverse)
 
-    tr_input_graphs = input_graphs[:tr_ge_split]
-    tr_target_graphs = target_graphs[:tr_ge_split]
-    ge_input_graphs = input_graphs[tr_ge_split:]
-    ge_target_graphs = target_graphs[tr_ge_split:]
+    # The predictions are stored on the indexed graphs, which have each of their original edges only once
+    ge_indexed_graphs = [index_graph(graph, encoder) for graph in graphs[tr_ge_split:]]
+    ge_graphs = [encode_indexed_graph(graph, encoder, duplicate_in_reverse) for graph in ge_indexed_graphs]
+    ge_edge_rows = original_edge_rows(ge_indexed_graphs, ge_graphs)
+    ge_input_graphs, ge_target_graphs = map(list, zip(*[create_input_and_target_data_dicts(graph)
+                                                        for graph in ge_graphs]))
 
     ############################################################
     # Build and run the KGCN
@@ -79,7 +75,8 @@ def pipeline(graphs,
     kgcn = KGCN(thing_embedder,
                 role_embedder,
                 edge_output_size=edge_output_size,
-                node_output_size=node_output_size)
+                node_output_size=node_output_size,
+                reverse_edges=reverse_edges_in_model)
 
     learner = KGCNLearner(kgcn,
                           num_processing_steps_tr=num_processing_steps_tr,
@@ -93,18 +90,11 @@ def pipeline(graphs,
                                                  log_dir=output_dir)
 
     plot_across_training(*tr_info, output_file=f'{output_dir}learning.png')
-    plot_predictions(graphs[tr_ge_split:], test_values, num_processing_steps_ge, output_file=f'{output_dir}graph.png')
-
-    logit_graphs = graphs_tuple_to_networkxs(test_values["outputs"][-1])
-
-    indexed_ge_graphs = indexed_graphs[tr_ge_split:]
-    ge_graphs = [apply_logits_to_graphs(graph, logit_graph) for graph, logit_graph in
-                 zip(indexed_ge_graphs, logit_graphs)]
+    plot_predictions(ge_graphs, test_values, num_processing_steps_ge, output_file=f'{output_dir}graph.png')
 
-    for ge_graph in ge_graphs:
-        for data in multidigraph_data_iterator(ge_graph):
-            data['probabilities'] = softmax(data['logits'])
-            data['prediction'] = int(np.argmax(data['probabilities']))
+    # Decode the predictions for all of the generalisation graphs at once, then store them on each graph
+    ge_indexed_graphs = apply_graphs_tuple_logits_to_graphs(ge_indexed_graphs, test_values["outputs"][-1],
+                                                            ge_edge_rows)
 
     _, _, _, _, _, solveds_tr, solveds_ge = tr_info
-    return ge_graphs, solveds_tr, solveds_ge
+    return ge_indexed_graphs, solveds_tr, solveds_ge
@@ -0,0 +1,121 @@
+#
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+#
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import networkx as nx
+
+from kglib.kgcn_data_loader.encoding.encoded_graph import EncodedGraph
+from kglib.kgcn_data_loader.utils import duplicate_edges_in_reverse
+
+
+def index_graph(graph, encoder):
+    """
+    Encodes the attribute values of a graph of Grakn concepts and labels its nodes by consecutive integers from 0
+
+    Args:
+        graph: The graph to index
+        encoder: The `SchemaEncoder` to encode values with
+
+    Returns:
+        A new graph with its nodes labelled by integers, each node's concept kept as 'concept'
+    """
+    graph = encoder.encode_values(graph)
+    return nx.convert_node_labels_to_integers(graph, label_attribute='concept')
+
+
+def encode_indexed_graph(indexed_graph, encoder, duplicate_in_reverse=True):
+    """
+    Encodes a graph made by `index_graph` ready for learning. The indexed graph is left as it is, so that predictions
+    can be stored on its original edges only
+
+    Args:
+        indexed_graph: The graph to encode
+        encoder: The `SchemaEncoder` to encode types with
+        duplicate_in_reverse: Whether to duplicate the graph's edges in reverse. Not needed for a KGCN that reverses
+            edges itself
+
+    Returns:
+        A copy of the graph with its edges duplicated in reverse if requested and its types encoded
+    """
+    graph = indexed_graph.copy()
+    if duplicate_in_reverse:
+        graph = duplicate_edges_in_reverse(graph)
+    return encoder.encode_types(graph)
+
+
+def encode_graph(graph, encoder, duplicate_in_reverse=True):
+    """
+    Encodes a graph of Grakn concepts ready for learning
+
+    Args:
+        graph: The graph to encode
+        encoder: The `SchemaEncoder` to encode types and values with
+        duplicate_in_reverse: Whether to duplicate the graph's edges in reverse. Not needed for a KGCN that reverses
+            edges itself
+
+    Returns:
+        A new graph with its nodes labelled by integers, its edges duplicated in reverse if requested and its types and
+        values encoded
+    """
+    return encode_indexed_graph(index_graph(graph, encoder), encoder, duplicate_in_reverse)
+
+
+def encode_graph_to_data_dicts(graph, encoder, duplicate_in_reverse=True):
+    """
+    Encodes a graph and creates its input and target graphs as data dicts, which are made of numpy arrays and so are
+    cheap to send between processes. The graph is encoded straight into an `EncodedGraph`, so it is neither modified
+    nor copied
+    """
+    encoded_graph = EncodedGraph.from_networkx(graph, encoder)
+    if duplicate_in_reverse:
+        encoded_graph = encoded_graph.add_reverse_edges()
+    return encoded_graph.to_data_dicts()
+
+
+def encode_graphs_to_data_dicts(graphs, encoder, num_workers=None, duplicate_in_reverse=True):
+    """
+    Encodes many graphs, creating the input and target data dicts of each. The graphs are independent, so the work can
+    be sharded across a pool of processes
+
+    Args:
+        graphs: The graphs to encode
+        encoder: The `SchemaEncoder` to encode types and values with
+        num_workers: Number of processes to use. If None, the graphs are encoded in this process
+        duplicate_in_reverse: Whether to duplicate the graphs' edges in reverse
+
+    Returns:
+        A list of input data dicts and a list of target data dicts, in the same order as `graphs`
+    """
+    if len(graphs) == 0:
+        return [], []
+
+    if num_workers is None:
+        data_dicts = [encode_graph_to_data_dicts(graph, encoder, duplicate_in_reverse) for graph in graphs]
+    else:
+        # Send several graphs to a worker at a time, so that the encoder isn't pickled once per graph
+        chunksize = max(1, len(graphs) // (4 * num_workers))
+        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+            data_dicts = list(executor.map(partial(encode_graph_to_data_dicts, encoder=encoder,
+                                                   duplicate_in_reverse=duplicate_in_reverse), graphs,
+                                           chunksize=chunksize))
+
+    input_data_dicts, target_data_dicts = zip(*data_dicts)
+    return list(input_data_dicts), list(target_data_dicts)
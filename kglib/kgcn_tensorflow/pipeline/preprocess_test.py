@@ -0,0 +1,100 @@
+#
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+#
+
+import unittest
+
+import networkx as nx
+import numpy as np
+
+from kglib.kgcn_data_loader.encoding.standard_encode import SchemaEncoder
+from kglib.kgcn_tensorflow.pipeline.preprocess import encode_graph, encode_graphs_to_data_dicts, index_graph, \
+    encode_indexed_graph
+
+
+def create_graph(age):
+    graph = nx.MultiDiGraph()
+    graph.add_node('p', type='person', solution=0)
+    graph.add_node('a', type='age', value=age, solution=1)
+    graph.add_edge('p', 'a', type='has', solution=2)
+    return graph
+
+
+class TestEncodeGraph(unittest.TestCase):
+
+    def test_graph_is_indexed_duplicated_and_encoded(self):
+        encoder = SchemaEncoder(['person', 'age'], ['has'], continuous_attributes={'age': (0, 100)})
+        graph = encode_graph(create_graph(50), encoder)
+
+        self.assertEqual([0, 1], list(graph.nodes))
+        self.assertEqual('a', graph.nodes[1]['concept'])
+        self.assertEqual(0.5, graph.nodes[1]['encoded_value'])
+        self.assertEqual(1, graph.nodes[1]['categorical_type'])
+        self.assertEqual([(0, 1), (1, 0)], sorted((sender, receiver) for sender, receiver in graph.edges()))
+
+    def test_edges_not_duplicated_if_not_requested(self):
+        encoder = SchemaEncoder(['person', 'age'], ['has'], continuous_attributes={'age': (0, 100)})
+        graph = encode_graph(create_graph(50), encoder, duplicate_in_reverse=False)
+
+        self.assertEqual([(0, 1)], list(graph.edges()))
+
+    def test_indexed_graph_is_not_duplicated_or_type_encoded(self):
+        encoder = SchemaEncoder(['person', 'age'], ['has'], continuous_attributes={'age': (0, 100)})
+        indexed_graph = index_graph(create_graph(50), encoder)
+        graph = encode_indexed_graph(indexed_graph, encoder)
+
+        self.assertEqual(2, graph.number_of_edges())
+        self.assertEqual([(0, 1)], list(indexed_graph.edges()))
+        self.assertEqual(0.5, indexed_graph.nodes[1]['encoded_value'])
+        self.assertNotIn('categorical_type', indexed_graph.nodes[1])
+
+
+class TestEncodeGraphsToDataDicts(unittest.TestCase):
+
+    def setUp(self):
+        self.encoder = SchemaEncoder(['person', 'age'], ['has'], continuous_attributes={'age': (0, 100)})
+
+    def test_workers_give_same_result_as_sequential(self):
+        ages = [10, 20, 30, 40, 50]
+        expected_inputs, expected_targets = encode_graphs_to_data_dicts([create_graph(a) for a in ages], self.encoder)
+        inputs, targets = encode_graphs_to_data_dicts([create_graph(a) for a in ages], self.encoder, num_workers=2)
+
+        self.assertEqual(len(ages), len(inputs))
+        self.assertEqual(len(ages), len(targets))
+        for expected, actual in zip(expected_inputs + expected_targets, inputs + targets):
+            self.assertEqual(expected.keys(), actual.keys())
+            for key in expected:
+                np.testing.assert_array_equal(expected[key], actual[key])
+
+    def test_graphs_stay_in_order(self):
+        inputs, _ = encode_graphs_to_data_dicts([create_graph(a) for a in [10, 90]], self.encoder, num_workers=2)
+        self.assertAlmostEqual(0.1, inputs[0]['nodes'][1, 2])
+        self.assertAlmostEqual(0.9, inputs[1]['nodes'][1, 2])
+
+    def test_edges_not_duplicated_if_not_requested(self):
+        inputs, targets = encode_graphs_to_data_dicts([create_graph(10)], self.encoder, duplicate_in_reverse=False)
+        np.testing.assert_array_equal([0], inputs[0]['senders'])
+        np.testing.assert_array_equal([1], inputs[0]['receivers'])
+        self.assertEqual(1, len(targets[0]['edges']))
+
+    def test_no_graphs(self):
+        self.assertEqual(([], []), encode_graphs_to_data_dicts([], self.encoder, num_workers=2))
+
+
+if __name__ == "__main__":
+    unittest.main()
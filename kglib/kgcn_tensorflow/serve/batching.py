@@ -0,0 +1,236 @@
+#
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+#
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from graph_nets import utils_np
+
+
+def num_nodes(graph):
+    """Number of nodes in a networkx graph or a graph_nets data dict"""
+    if isinstance(graph, dict):
+        return len(graph['nodes'])
+    return graph.number_of_nodes()
+
+
+class _Request:
+    __slots__ = ('graphs', 'future', 'num_nodes', 'submitted_at')
+
+    def __init__(self, graphs, future):
+        self.graphs = graphs
+        self.future = future
+        self.num_nodes = sum(num_nodes(graph) for graph in graphs)
+        self.submitted_at = time.monotonic()
+
+
+class BatchingStats:
+    """
+    Running totals of the batches scored by a `MicroBatcher`, to tune its budgets against latency. Batch fill is the
+    fraction of the graph or node budget used by a batch, whichever is larger. Wait is the time from a request being
+    submitted to its batch being scored.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._num_batches = 0
+        self._num_requests = 0
+        self._num_graphs = 0
+        self._num_nodes = 0
+        self._total_fill = 0.0
+        self._max_queue_depth = 0
+        self._total_wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+
+    def record_batch(self, batch, fill, queue_depth):
+        now = time.monotonic()
+        waits = [now - request.submitted_at for request in batch]
+        with self._lock:
+            self._num_batches += 1
+            self._num_requests += len(batch)
+            self._num_graphs += sum(len(request.graphs) for request in batch)
+            self._num_nodes += sum(request.num_nodes for request in batch)
+            self._total_fill += fill
+            self._max_queue_depth = max(self._max_queue_depth, queue_depth)
+            self._total_wait_seconds += sum(waits)
+            self._max_wait_seconds = max([self._max_wait_seconds] + waits)
+
+    def summary(self):
+        """
+        Returns:
+            dict of the number of batches, requests and graphs scored, the mean graphs, nodes and fill per batch, the
+            largest queue depth seen when a batch was formed, and the mean and largest wait of requests
+        """
+        with self._lock:
+            num_batches = max(self._num_batches, 1)
+            num_requests = max(self._num_requests, 1)
+            return dict(num_batches=self._num_batches,
+                        num_requests=self._num_requests,
+                        num_graphs=self._num_graphs,
+                        mean_batch_graphs=self._num_graphs / num_batches,
+                        mean_batch_nodes=self._num_nodes / num_batches,
+                        mean_batch_fill=self._total_fill / num_batches,
+                        max_queue_depth=self._max_queue_depth,
+                        mean_wait_seconds=self._total_wait_seconds / num_requests,
+                        max_wait_seconds=self._max_wait_seconds)
+
+
+class MicroBatcher:
+    """
+    Groups the graphs of requests that arrive close together in time into one batch, so that they are scored in a
+    single call to the model rather than one call each. A batch is scored once it reaches its graph or node budget, or
+    once its first request has waited `max_wait_seconds`. Batches are scored in order by a single background thread.
+    """
+    def __init__(self, score_fn, max_batch_size=64, max_wait_seconds=0.005, max_batch_nodes=None):
+        """
+        Args:
+            score_fn: Callable taking a list of graphs and returning the model's output for all of them as a numpy
+                `GraphsTuple`, such as a `KGCNInference`
+            max_batch_size: Maximum number of graphs to score together
+            max_wait_seconds: Maximum time from a request being submitted until its batch is scored, unless the model
+                is busy scoring an earlier batch
+            max_batch_nodes: Maximum total number of nodes in the graphs scored together. If None, batches are only
+                limited by `max_batch_size`
+
+        A request with more graphs or nodes than the budgets allow is scored as a batch of its own. If scoring a batch
+        fails, its requests are scored again one at a time, so that only the requests that can't be scored fail.
+        """
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be at least 1, got {max_batch_size}")
+        if max_batch_nodes is not None and max_batch_nodes < 1:
+            raise ValueError(f"max_batch_nodes must be at least 1, got {max_batch_nodes}")
+        self._score_fn = score_fn
+        self._max_batch_size = max_batch_size
+        self._max_wait_seconds = max_wait_seconds
+        self._max_batch_nodes = max_batch_nodes
+        self._requests = queue.Queue()
+        self._closed = False
+        # A request that didn't fit in the previous batch, which starts the next one
+        self._carried_request = None
+        self.stats = BatchingStats()
+        self._thread = threading.Thread(target=self._run, name="MicroBatcher", daemon=True)
+        self._thread.start()
+
+    @property
+    def queue_depth(self):
+        """Number of requests waiting to be put into a batch"""
+        return self._requests.qsize() + (self._carried_request is not None)
+
+    def submit(self, graphs):
+        """
+        Args:
+            graphs: List of graphs to score, in the form accepted by `score_fn`
+
+        Returns:
+            A `Future` of the model's output for each of the graphs, as a list of graph_nets data dicts
+        """
+        if self._closed:
+            raise RuntimeError("Cannot submit graphs to a closed MicroBatcher")
+        future = Future()
+        self._requests.put(_Request(list(graphs), future))
+        return future
+
+    def close(self):
+        """Scores any requests already submitted, then stops the background thread"""
+        if not self._closed:
+            self._closed = True
+            self._requests.put(None)
+            self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch, stopping = self._next_batch()
+            if batch:
+                self._score(batch)
+
+    def _fits(self, num_graphs, num_nodes):
+        if num_graphs > self._max_batch_size:
+            return False
+        return self._max_batch_nodes is None or num_nodes <= self._max_batch_nodes
+
+    def _fill(self, num_graphs, num_nodes):
+        fill = num_graphs / self._max_batch_size
+        if self._max_batch_nodes is not None:
+            fill = max(fill, num_nodes / self._max_batch_nodes)
+        return fill
+
+    def _next_batch(self):
+        """
+        Blocks until a request arrives, then collects further requests until the batch is full or the first request's
+        deadline passes
+
+        Returns:
+            The requests in the batch, and whether the batcher has been closed
+        """
+        if self._carried_request is not None:
+            request, self._carried_request = self._carried_request, None
+        else:
+            request = self._requests.get()
+        if request is None:
+            return [], True
+
+        batch = [request]
+        batch_graphs = len(request.graphs)
+        batch_nodes = request.num_nodes
+        deadline = request.submitted_at + self._max_wait_seconds
+        stopping = False
+        while self._fits(batch_graphs + 1, batch_nodes + 1):
+            try:
+                request = self._requests.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+            if request is None:
+                stopping = True
+                break
+            if not self._fits(batch_graphs + len(request.graphs), batch_nodes + request.num_nodes):
+                self._carried_request = request
+                break
+            batch.append(request)
+            batch_graphs += len(request.graphs)
+            batch_nodes += request.num_nodes
+
+        self.stats.record_batch(batch, self._fill(batch_graphs, batch_nodes), self.queue_depth)
+        return batch, stopping
+
+    def _score(self, batch):
+        graphs = [graph for request in batch for graph in request.graphs]
+        try:
+            outputs = utils_np.graphs_tuple_to_data_dicts(self._score_fn(graphs))
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0].future.set_exception(e)
+                return
+            # Score the requests one at a time, so that a request the model can't score only fails itself
+            for request in batch:
+                self._score([request])
+            return
+
+        start = 0
+        for request in batch:
+            end = start + len(request.graphs)
+            request.future.set_result(outputs[start:end])
+            start = end
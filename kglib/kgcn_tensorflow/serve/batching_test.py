@@ -0,0 +1,170 @@
+#
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+#
+
+import threading
+import time
+import unittest
+
+import numpy as np
+from graph_nets import utils_np
+
+from kglib.kgcn_tensorflow.serve.batching import MicroBatcher
+
+
+def create_data_dict(value, num_nodes=2):
+    return dict(nodes=np.full((num_nodes, 3), value, dtype=np.float32),
+                edges=np.full((1, 3), value, dtype=np.float32),
+                senders=np.array([0], dtype=np.int32),
+                receivers=np.array([1], dtype=np.int32),
+                globals=np.zeros(5, dtype=np.float32))
+
+
+class RecordingScorer:
+    """Scores graphs by doubling their features, recording the number of graphs in each call"""
+    def __init__(self):
+        self.batch_sizes = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, graphs):
+        self.release.wait()
+        self.batch_sizes.append(len(graphs))
+        graphs_tuple = utils_np.data_dicts_to_graphs_tuple(graphs)
+        return graphs_tuple.replace(nodes=graphs_tuple.nodes * 2, edges=graphs_tuple.edges * 2)
+
+
+class TestMicroBatcher(unittest.TestCase):
+
+    def test_each_request_gets_its_own_outputs(self):
+        scorer = RecordingScorer()
+        with MicroBatcher(scorer, max_batch_size=10, max_wait_seconds=0.05) as batcher:
+            futures = [batcher.submit([create_data_dict(i), create_data_dict(i + 10)]) for i in range(3)]
+            results = [future.result(timeout=5) for future in futures]
+
+        for i, outputs in enumerate(results):
+            self.assertEqual(2, len(outputs))
+            np.testing.assert_array_equal(np.full((2, 3), 2 * i), outputs[0]['nodes'])
+            np.testing.assert_array_equal(np.full((1, 3), 2 * (i + 10)), outputs[1]['edges'])
+
+    def test_concurrent_requests_are_batched(self):
+        scorer = RecordingScorer()
+        scorer.release.clear()
+        with MicroBatcher(scorer, max_batch_size=10, max_wait_seconds=0.05) as batcher:
+            # The first request holds up the scorer, so the rest queue up and are scored together
+            futures = [batcher.submit([create_data_dict(i)]) for i in range(5)]
+            scorer.release.set()
+            for future in futures:
+                future.result(timeout=5)
+
+        self.assertEqual(5, sum(scorer.batch_sizes))
+        self.assertLess(len(scorer.batch_sizes), 5)
+
+    def test_batches_do_not_exceed_max_batch_size(self):
+        scorer = RecordingScorer()
+        scorer.release.clear()
+        with MicroBatcher(scorer, max_batch_size=3, max_wait_seconds=0.05) as batcher:
+            futures = [batcher.submit([create_data_dict(i), create_data_dict(i)]) for i in range(4)]
+            scorer.release.set()
+            for future in futures:
+                future.result(timeout=5)
+
+        self.assertEqual([2, 2, 2, 2], scorer.batch_sizes)
+
+    def test_batches_do_not_exceed_max_batch_nodes(self):
+        scorer = RecordingScorer()
+        scorer.release.clear()
+        with MicroBatcher(scorer, max_batch_size=100, max_wait_seconds=0.05, max_batch_nodes=6) as batcher:
+            futures = [batcher.submit([create_data_dict(i, num_nodes=3)]) for i in range(5)]
+            scorer.release.set()
+            for future in futures:
+                future.result(timeout=5)
+
+        self.assertEqual(5, sum(scorer.batch_sizes))
+        self.assertTrue(all(batch_size <= 2 for batch_size in scorer.batch_sizes))
+
+    def test_request_larger_than_node_budget_is_scored_alone(self):
+        scorer = RecordingScorer()
+        with MicroBatcher(scorer, max_wait_seconds=0.05, max_batch_nodes=2) as batcher:
+            outputs = batcher.submit([create_data_dict(1, num_nodes=5)]).result(timeout=5)
+
+        self.assertEqual((5, 3), outputs[0]['nodes'].shape)
+
+    def test_batch_is_scored_at_deadline_when_not_full(self):
+        scorer = RecordingScorer()
+        with MicroBatcher(scorer, max_batch_size=100, max_wait_seconds=0.05) as batcher:
+            start = time.monotonic()
+            batcher.submit([create_data_dict(0)]).result(timeout=5)
+            elapsed = time.monotonic() - start
+
+        self.assertGreaterEqual(elapsed, 0.05)
+        self.assertLess(elapsed, 1)
+
+    def test_stats_report_batch_fill_and_waits(self):
+        scorer = RecordingScorer()
+        with MicroBatcher(scorer, max_batch_size=4, max_wait_seconds=0.01) as batcher:
+            batcher.submit([create_data_dict(0), create_data_dict(1)]).result(timeout=5)
+            stats = batcher.stats.summary()
+            self.assertEqual(0, batcher.queue_depth)
+
+        self.assertEqual(1, stats['num_batches'])
+        self.assertEqual(1, stats['num_requests'])
+        self.assertEqual(2, stats['num_graphs'])
+        self.assertEqual(4, stats['mean_batch_nodes'])
+        self.assertEqual(0.5, stats['mean_batch_fill'])
+        self.assertGreaterEqual(stats['max_wait_seconds'], 0.01)
+
+    def test_scoring_exception_is_given_to_every_request_in_batch(self):
+        def fail(graphs):
+            raise RuntimeError("model failed")
+
+        with MicroBatcher(fail, max_batch_size=10, max_wait_seconds=0.05) as batcher:
+            futures = [batcher.submit([create_data_dict(i)]) for i in range(2)]
+            for future in futures:
+                with self.assertRaises(RuntimeError):
+                    future.result(timeout=5)
+
+    def test_scoring_exception_is_only_given_to_the_failing_request(self):
+        def fail_on_negative_features(graphs):
+            if any(np.any(graph['nodes'] < 0) for graph in graphs):
+                raise ValueError("negative features")
+            return utils_np.data_dicts_to_graphs_tuple(graphs)
+
+        with MicroBatcher(fail_on_negative_features, max_batch_size=10, max_wait_seconds=0.05) as batcher:
+            good_future = batcher.submit([create_data_dict(1)])
+            bad_future = batcher.submit([create_data_dict(-1)])
+
+            np.testing.assert_array_equal(np.ones((2, 3)), good_future.result(timeout=5)[0]['nodes'])
+            with self.assertRaises(ValueError):
+                bad_future.result(timeout=5)
+
+    def test_submit_after_close_raises(self):
+        batcher = MicroBatcher(RecordingScorer())
+        batcher.close()
+        with self.assertRaises(RuntimeError):
+            batcher.submit([create_data_dict(0)])
+
+    def test_invalid_max_batch_size_raises(self):
+        with self.assertRaises(ValueError):
+            MicroBatcher(RecordingScorer(), max_batch_size=0)
+        with self.assertRaises(ValueError):
+            MicroBatcher(RecordingScorer(), max_batch_nodes=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+#
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+#
+
+import json
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+import numpy as np
+
+from kglib.kgcn_data_loader.utils import decode_predictions
+from kglib.kgcn_tensorflow.serve.batching import MicroBatcher
+
+
+def graph_from_json(graph_json, feature_sizes=None):
+    """
+    Creates an input graph data dict from its JSON form, which holds the input features of the nodes and edges as
+    lists of lists, and the senders and receivers of the edges as lists of node indices
+
+    Args:
+        graph_json: The graph in JSON form
+        feature_sizes: dict of the number of features the model expects for 'nodes', 'edges' and 'globals'. If None,
+            feature sizes are only checked to be consistent within the graph
+
+    Returns:
+        The graph as a data dict
+
+    Raises:
+        ValueError: If the graph is not well-formed, or its feature sizes are not those given
+    """
+    feature_sizes = feature_sizes or {}
+    nodes = np.array(graph_json['nodes'], dtype=np.float32)
+    edges = np.array(graph_json['edges'], dtype=np.float32)
+    senders = np.array(graph_json['senders'], dtype=np.int32)
+    receivers = np.array(graph_json['receivers'], dtype=np.int32)
+    globals_ = np.array(graph_json.get('globals', np.zeros(feature_sizes.get('globals', 5))), dtype=np.float32)
+
+    if nodes.ndim != 2 or len(nodes) == 0:
+        raise ValueError(f"nodes must be a non-empty list of feature lists, got shape {nodes.shape}")
+    if len(edges) == 0:
+        # Nodes and edges have the same input features
+        edges = edges.reshape(0, feature_sizes.get('edges', nodes.shape[1]))
+    if edges.ndim != 2:
+        raise ValueError(f"edges must be a list of feature lists, got shape {edges.shape}")
+    for field, size in [('nodes', nodes.shape[1]), ('edges', edges.shape[1]), ('globals', len(globals_))]:
+        if field in feature_sizes and size != feature_sizes[field]:
+            raise ValueError(f"{field} must have {feature_sizes[field]} features, got {size}")
+
+    for field, indices in [('senders', senders), ('receivers', receivers)]:
+        if indices.shape != (len(edges),):
+            raise ValueError(f"{field} must hold one node index per edge, got shape {indices.shape}")
+        if np.any(indices < 0) or np.any(indices >= len(nodes)):
+            raise ValueError(f"{field} must be node indices in [0, {len(nodes)})")
+
+    return dict(nodes=nodes, edges=edges, senders=senders, receivers=receivers, globals=globals_)
+
+
+def output_to_json(output):
+    """Converts the model's output for a graph to JSON form, with the logits and probabilities of each node and edge"""
+    node_probabilities, _ = decode_predictions(output['nodes'])
+    edge_probabilities, _ = decode_predictions(output['edges'])
+    return dict(node_logits=output['nodes'].tolist(),
+                node_probabilities=node_probabilities.tolist(),
+                edge_logits=output['edges'].tolist(),
+                edge_probabilities=edge_probabilities.tolist())
+
+
+class InferenceRequestHandler(BaseHTTPRequestHandler):
+    """
+    Handles POST requests to /score, with a JSON body of the form {"graphs": [...]}, each graph in the form read by
+    `graph_from_json`. Responds with {"graphs": [...]}, each graph in the form given by `output_to_json`.
+    GET requests to /stats are answered with the batcher's current queue depth and its `BatchingStats` summary
+    """
+    def do_GET(self):
+        if self.path != '/stats':
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+
+        stats = dict(queue_depth=self.server.batcher.queue_depth, **self.server.batcher.stats.summary())
+        self._send_json(stats)
+
+    def do_POST(self):
+        if self.path != '/score':
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+
+        try:
+            body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            graphs = [graph_from_json(graph_json, self.server.feature_sizes) for graph_json in body['graphs']]
+        except (ValueError, KeyError, TypeError) as e:
+            self.send_error(HTTPStatus.BAD_REQUEST, f"Invalid request: {e}")
+            return
+
+        try:
+            outputs = self.server.batcher.submit(graphs).result()
+        except Exception as e:
+            self.send_error(HTTPStatus.INTERNAL_SERVER_ERROR, f"Scoring failed: {e}")
+            return
+
+        self._send_json(dict(graphs=[output_to_json(output) for output in outputs]))
+
+    def _send_json(self, body):
+        response = json.dumps(body).encode('utf-8')
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class InferenceServer(ThreadingMixIn, HTTPServer):
+    """
+    HTTP server scoring graphs with a model that is kept loaded between requests. Each request is handled in its own
+    thread, and the graphs of concurrent requests are scored together by a `MicroBatcher`
+    """
+    daemon_threads = True
+
+    def __init__(self, server_address, batcher, verbose=False, feature_sizes=None):
+        super().__init__(server_address, InferenceRequestHandler)
+        self.batcher = batcher
+        # Graphs whose feature sizes don't match the model's are rejected, rather than failing the batch they are in
+        self.feature_sizes = feature_sizes
+        self.verbose = verbose
+
+
+def serve(inference, host='localhost', port=8000, max_batch_size=64, max_wait_seconds=0.005, max_batch_nodes=None):
+    """
+    Serves a trained KGCN over HTTP until interrupted
+
+    Args:
+        inference: A `KGCNInference`, or other callable scoring a list of graphs. If it has `feature_sizes`, as a
+            `KGCNInference` does, requests with graphs of other feature sizes are rejected
+        host: Host to listen on
+        port: Port to listen on
+        max_batch_size: Maximum number of graphs to score in one call to the model
+        max_wait_seconds: Maximum time to hold a request while waiting for others to batch it with
+        max_batch_nodes: Maximum total number of nodes to score in one call to the model. If None, there is no limit
+    """
+    with MicroBatcher(inference, max_batch_size, max_wait_seconds, max_batch_nodes) as batcher:
+        server = InferenceServer((host, port), batcher, feature_sizes=getattr(inference, 'feature_sizes', None))
+        print(f"Serving KGCN predictions at http://{host}:{server.server_port}/score")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
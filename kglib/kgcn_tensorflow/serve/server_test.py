@@ -0,0 +1,135 @@
+#
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+#
+
+import json
+import threading
+import unittest
+import urllib.error
+import urllib.request
+
+import numpy as np
+from graph_nets import utils_np
+
+from kglib.kgcn_tensorflow.serve.batching import MicroBatcher
+from kglib.kgcn_tensorflow.serve.server import InferenceServer, graph_from_json
+
+
+def identity_scorer(graphs):
+    return utils_np.data_dicts_to_graphs_tuple(graphs)
+
+
+GRAPH_JSON = dict(nodes=[[1, 0, 0], [0, 0, 0]], edges=[[0, 1, 0]], senders=[0], receivers=[1])
+
+
+class TestGraphFromJson(unittest.TestCase):
+
+    def test_arrays_have_expected_types_and_shapes(self):
+        graph = graph_from_json(GRAPH_JSON)
+        self.assertEqual(np.float32, graph['nodes'].dtype)
+        self.assertEqual(np.int32, graph['senders'].dtype)
+        self.assertEqual((2, 3), graph['nodes'].shape)
+        self.assertEqual((5,), graph['globals'].shape)
+
+    def test_graph_without_edges(self):
+        graph = graph_from_json(dict(nodes=[[1, 0, 0]], edges=[], senders=[], receivers=[]))
+        self.assertEqual((0, 3), graph['edges'].shape)
+
+    def test_sender_out_of_range_raises(self):
+        with self.assertRaises(ValueError):
+            graph_from_json(dict(GRAPH_JSON, senders=[2]))
+
+    def test_negative_receiver_raises(self):
+        with self.assertRaises(ValueError):
+            graph_from_json(dict(GRAPH_JSON, receivers=[-1]))
+
+    def test_senders_not_matching_edges_raises(self):
+        with self.assertRaises(ValueError):
+            graph_from_json(dict(GRAPH_JSON, senders=[0, 1]))
+
+    def test_graph_without_nodes_raises(self):
+        with self.assertRaises(ValueError):
+            graph_from_json(dict(nodes=[], edges=[], senders=[], receivers=[]))
+
+    def test_ragged_features_raise(self):
+        with self.assertRaises(ValueError):
+            graph_from_json(dict(GRAPH_JSON, nodes=[[1, 0, 0], [0, 0]]))
+
+    def test_feature_sizes_not_matching_the_model_raise(self):
+        graph_from_json(GRAPH_JSON, dict(nodes=3, edges=3, globals=5))
+        with self.assertRaises(ValueError):
+            graph_from_json(GRAPH_JSON, dict(nodes=4, edges=3, globals=5))
+        with self.assertRaises(ValueError):
+            graph_from_json(GRAPH_JSON, dict(nodes=3, edges=2, globals=5))
+
+
+class TestInferenceServer(unittest.TestCase):
+
+    def setUp(self):
+        self.batcher = MicroBatcher(identity_scorer, max_wait_seconds=0.01)
+        self.server = InferenceServer(('localhost', 0), self.batcher)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.url = f"http://localhost:{self.server.server_port}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.batcher.close()
+
+    def post(self, path, body):
+        request = urllib.request.Request(self.url + path, data=body, headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return json.loads(response.read())
+
+    def test_graphs_are_scored(self):
+        response = self.post('/score', json.dumps(dict(graphs=[GRAPH_JSON, GRAPH_JSON])).encode('utf-8'))
+
+        self.assertEqual(2, len(response['graphs']))
+        graph = response['graphs'][0]
+        self.assertEqual([[1, 0, 0], [0, 0, 0]], graph['node_logits'])
+        self.assertEqual([[0, 1, 0]], graph['edge_logits'])
+        np.testing.assert_allclose(np.ones(2), np.sum(graph['node_probabilities'], axis=-1), rtol=1e-6)
+
+    def test_stats_are_reported(self):
+        self.post('/score', json.dumps(dict(graphs=[GRAPH_JSON])).encode('utf-8'))
+        with urllib.request.urlopen(self.url + '/stats', timeout=5) as response:
+            stats = json.loads(response.read())
+
+        self.assertEqual(0, stats['queue_depth'])
+        self.assertEqual(1, stats['num_batches'])
+        self.assertIn('mean_batch_fill', stats)
+
+    def test_invalid_request_is_rejected(self):
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            self.post('/score', b'{"not_graphs": []}')
+        self.assertEqual(400, context.exception.code)
+
+    def test_malformed_graph_is_rejected(self):
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            self.post('/score', json.dumps(dict(graphs=[dict(GRAPH_JSON, senders=[5])])).encode('utf-8'))
+        self.assertEqual(400, context.exception.code)
+
+    def test_unknown_path_is_not_found(self):
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            self.post('/other', b'{}')
+        self.assertEqual(404, context.exception.code)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -16,30 +16,56 @@
 #  specific language governing permissions and limitations
 #  under the License.
 #
-from grakn.api.concept.type.attribute_type import AttributeType
+import sys
 
-from kglib.utils.grakn.object.comparable import PropertyComparable
+from grakn.api.concept.type.attribute_type import AttributeType
 
 VALUE_TYPES = (AttributeType.ValueType.OBJECT, AttributeType.ValueType.BOOLEAN, AttributeType.ValueType.LONG, AttributeType.ValueType.DOUBLE, AttributeType.ValueType.STRING, AttributeType.ValueType.DATETIME)
 
 
-class Thing(PropertyComparable):
-    def __init__(self, id, type_label, base_type_label, value_type=None, value=None):
-        self.id = id
-        self.type_label = type_label
-        self.base_type_label = base_type_label  # TODO rename to base_type in line with Client Python
-
-        # If the thing is an attribute
-        self.value_type = value_type
-        self.value = value
+class Thing:
+    """
+    An immutable, compact representation of a Grakn thing. Things are equal, and hash, by their id alone. Type labels
+    are interned, so that the many Things of the same type share one label string.
+    """
+    __slots__ = ('id', 'type_label', 'base_type_label', 'value_type', 'value')
 
+    def __init__(self, id, type_label, base_type_label, value_type=None, value=None):
         # TODO Make attribute a separate class
-        if self.base_type_label == 'attribute':
-            if self.value_type is None:
+        if base_type_label == 'attribute':
+            if value_type is None:
                 raise ValueError('Attribute value_type must be provided')
-            if self.value is None:
+            if value is None:
                 raise ValueError('Attribute value must be provided')
 
+        object.__setattr__(self, 'id', id)
+        object.__setattr__(self, 'type_label', sys.intern(type_label))
+        # TODO rename to base_type in line with Client Python
+        object.__setattr__(self, 'base_type_label', sys.intern(base_type_label))
+
+        # If the thing is an attribute
+        object.__setattr__(self, 'value_type', value_type)
+        object.__setattr__(self, 'value', value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{self.__class__.__name__} is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError(f'{self.__class__.__name__} is immutable')
+
+    def __eq__(self, other):
+        if isinstance(other, Thing):
+            return self.id == other.id
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __reduce__(self):
+        # Slotted, immutable objects can't be unpickled by setting attributes, so rebuild through __init__, which also
+        # re-interns the labels
+        return self.__class__, (self.id, self.type_label, self.base_type_label, self.value_type, self.value)
+
     def __str__(self):
         string = f'<{self.type_label}, {self.id}'
         if self.base_type_label == 'attribute':
@@ -50,18 +76,21 @@ class Thing(PropertyComparable):
         return self.__str__()
 
 
+def get_base_type_label(grakn_thing):
+    if grakn_thing.is_entity():
+        return "entity"
+    elif grakn_thing.is_relation():
+        return "relation"
+    elif grakn_thing.is_attribute():
+        return "attribute"
+    raise RuntimeError("Unexpected Concept")
+
+
 def build_thing(grakn_thing):
 
     id = grakn_thing.get_iid()
     type_label = grakn_thing.get_type().get_label().name()
-    if grakn_thing.is_entity():
-        base_type_label = "entity"
-    elif grakn_thing.is_relation():
-        base_type_label = "relation"
-    elif grakn_thing.is_attribute():
-        base_type_label = "attribute"
-    else:
-        raise RuntimeError("Unexpected Concept")
+    base_type_label = get_base_type_label(grakn_thing)
 
     if base_type_label == 'attribute':
         value_type = grakn_thing.get_type().get_value_type()
@@ -71,3 +100,45 @@ def build_thing(grakn_thing):
         return Thing(id, type_label, base_type_label, value_type, value)
 
     return Thing(id, type_label, base_type_label)
+
+
+class ThingCache:
+    """
+    Builds Things as `build_thing` does, but remembers the Thing built for each IID, and the label and value type of
+    each type, so that a concept or type seen again needs no further client calls. Concepts can change between
+    transactions, so use a new cache for each transaction.
+    """
+    def __init__(self):
+        self._things = {}
+        self._type_labels = {}
+        self._value_types = {}
+
+    def __len__(self):
+        return len(self._things)
+
+    def build_thing(self, grakn_thing):
+        id = grakn_thing.get_iid()
+        thing = self._things.get(id)
+        if thing is None:
+            thing = self._build_new_thing(id, grakn_thing)
+            self._things[id] = thing
+        return thing
+
+    def _build_new_thing(self, id, grakn_thing):
+        grakn_type = grakn_thing.get_type()
+        type_label = self._type_labels.get(grakn_type)
+        if type_label is None:
+            type_label = grakn_type.get_label().name()
+            self._type_labels[grakn_type] = type_label
+
+        base_type_label = get_base_type_label(grakn_thing)
+
+        if base_type_label == 'attribute':
+            value_type = self._value_types.get(grakn_type)
+            if value_type is None:
+                value_type = grakn_type.get_value_type()
+                assert value_type in VALUE_TYPES
+                self._value_types[grakn_type] = value_type
+            return Thing(id, type_label, base_type_label, value_type, grakn_thing.get_value())
+
+        return Thing(id, type_label, base_type_label)
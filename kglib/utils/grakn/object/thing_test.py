@@ -0,0 +1,121 @@
+#
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+#
+
+import pickle
+import unittest
+
+from grakn.api.concept.type.attribute_type import AttributeType
+
+from kglib.utils.grakn.object.thing import Thing, ThingCache
+from kglib.utils.grakn.test.mock.concept import MockThing, MockType, MockAttribute, MockAttributeType
+
+
+class TestThing(unittest.TestCase):
+
+    def test_things_with_same_id_are_equal_and_hash_equally(self):
+        thing = Thing('V123', 'person', 'entity')
+        same = Thing('V123', 'person', 'entity')
+
+        self.assertEqual(thing, same)
+        self.assertEqual(hash(thing), hash(same))
+        self.assertEqual(1, len({thing, same}))
+
+    def test_things_with_different_ids_are_not_equal(self):
+        self.assertNotEqual(Thing('V123', 'person', 'entity'), Thing('V124', 'person', 'entity'))
+
+    def test_thing_is_immutable(self):
+        thing = Thing('V123', 'person', 'entity')
+        with self.assertRaises(AttributeError):
+            thing.type_label = 'disease'
+        with self.assertRaises(AttributeError):
+            thing.name = 'Alice'
+
+    def test_type_labels_are_interned(self):
+        first = Thing('V123', ''.join(['per', 'son']), 'entity')
+        second = Thing('V124', ''.join(['pers', 'on']), 'entity')
+        self.assertIs(first.type_label, second.type_label)
+
+    def test_thing_survives_pickling(self):
+        thing = Thing('V123', 'age', 'attribute', AttributeType.ValueType.LONG, 66)
+        unpickled = pickle.loads(pickle.dumps(thing))
+
+        self.assertEqual(thing, unpickled)
+        self.assertEqual(('age', 'attribute', 66), (unpickled.type_label, unpickled.base_type_label, unpickled.value))
+
+    def test_attribute_without_value_raises(self):
+        with self.assertRaises(ValueError):
+            Thing('V123', 'age', 'attribute', AttributeType.ValueType.LONG)
+
+
+class CountingType(MockType):
+    def __init__(self, id, label, base_type):
+        super().__init__(id, label, base_type)
+        self.label_calls = 0
+
+    def get_label(self):
+        self.label_calls += 1
+        return super().get_label()
+
+
+class CountingAttributeType(MockAttributeType):
+    def __init__(self, id, label, base_type, value_type):
+        super().__init__(id, label, base_type, value_type)
+        self.value_type_calls = 0
+
+    def get_value_type(self):
+        self.value_type_calls += 1
+        return AttributeType.ValueType.LONG
+
+
+class TestThingCache(unittest.TestCase):
+
+    def test_thing_is_built_once_per_iid(self):
+        person_type = CountingType('V1', 'person', 'ENTITY')
+        cache = ThingCache()
+
+        first = cache.build_thing(MockThing('V123', person_type))
+        second = cache.build_thing(MockThing('V123', person_type))
+
+        self.assertIs(first, second)
+        self.assertEqual(1, len(cache))
+        self.assertEqual(1, person_type.label_calls)
+
+    def test_type_label_is_looked_up_once_per_type(self):
+        person_type = CountingType('V1', 'person', 'ENTITY')
+        cache = ThingCache()
+
+        things = [cache.build_thing(MockThing(f'V12{i}', person_type)) for i in range(3)]
+
+        self.assertEqual(['person'] * 3, [thing.type_label for thing in things])
+        self.assertEqual(3, len(cache))
+        self.assertEqual(1, person_type.label_calls)
+
+    def test_attribute_value_type_is_looked_up_once_per_type(self):
+        age_type = CountingAttributeType('V1', 'age', 'ATTRIBUTE', 'LONG')
+        cache = ThingCache()
+
+        things = [cache.build_thing(MockAttribute(f'V12{i}', 60 + i, age_type)) for i in range(3)]
+
+        self.assertEqual([60, 61, 62], [thing.value for thing in things])
+        self.assertEqual(AttributeType.ValueType.LONG, things[0].value_type)
+        self.assertEqual(1, age_type.value_type_calls)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -18,6 +18,7 @@
 #
 
 import inspect
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 import numpy as np
 from grakn.client import *
@@ -25,9 +26,14 @@ from grakn.client import *
 from kglib.utils.grakn.synthetic.statistics.pmf import PMF
 
 
-def get_example_queries(pmf, example_id):
+def normal_dist(mean, var):
+    return lambda rng: round(rng.normal(mean, var), 2)
 
-    variable_values = pmf.select()
+
+def get_example_queries(pmf, example_id, variable_values=None):
+
+    if variable_values is None:
+        variable_values = pmf.select()
 
     queries = [f'insert $p isa person, has example-id {example_id};',
                f'insert $doc isa person, has example-id {20000 + example_id};']
@@ -40,7 +46,7 @@ def get_example_queries(pmf, example_id):
                 $doc isa person, has example-id {20000 + example_id};
                 insert
                 $diagnosis (patient: $p, diagnosed-disease: $d, doctor: $doc) isa diagnosis;
-                $p has age {int(variable_values['Multiple Sclerosis']['age']())};'''))
+                $p has age {int(variable_values['Multiple Sclerosis']['age'](pmf.rng))};'''))
 
     if variable_values['Diabetes Type II'] is not False:
         queries.append(inspect.cleandoc(f'''                 
@@ -50,7 +56,7 @@ def get_example_queries(pmf, example_id):
                 $doc isa person, has example-id {20000 + example_id};
                 insert
                 $diagnosis (patient: $p, diagnosed-disease: $d, doctor: $doc) isa diagnosis;
-                $p has age {int(variable_values['Diabetes Type II']['age']())};'''))
+                $p has age {int(variable_values['Diabetes Type II']['age'](pmf.rng))};'''))
 
     if variable_values['Fatigue'] is not False:
         queries.append(inspect.cleandoc(f'''
@@ -59,7 +65,7 @@ def get_example_queries(pmf, example_id):
                 $s isa symptom, has name "Fatigue";
                 insert
                 $sp (presented-symptom: $s, symptomatic-patient: $p) isa 
-                symptom-presentation, has severity {variable_values['Fatigue']['severity']()};'''))
+                symptom-presentation, has severity {variable_values['Fatigue']['severity'](pmf.rng)};'''))
 
     if variable_values['Blurred vision'] is not False:
         queries.append(inspect.cleandoc(f'''
@@ -68,7 +74,7 @@ def get_example_queries(pmf, example_id):
                 $s isa symptom, has name "Blurred vision";
                 insert
                 $sp (presented-symptom: $s, symptomatic-patient: $p) isa 
-                symptom-presentation, has severity {variable_values['Blurred vision']['severity']()};'''))
+                symptom-presentation, has severity {variable_values['Blurred vision']['severity'](pmf.rng)};'''))
 
     if variable_values['Drinking'] is not False:
         queries.append(inspect.cleandoc(f'''
@@ -77,7 +83,7 @@ def get_example_queries(pmf, example_id):
                 $s isa substance, has name "Alcohol";
                 insert
                 $c (consumer: $p, consumed-substance: $s) isa consumption, 
-                has units-per-week {int(variable_values['Drinking']['units-per-week']())};'''))
+                has units-per-week {int(variable_values['Drinking']['units-per-week'](pmf.rng))};'''))
 
     if variable_values['Parent has Diabetes Type II'] is not False:
         queries.append(inspect.cleandoc(f'''
@@ -97,17 +103,16 @@ def get_example_queries(pmf, example_id):
                 $s isa substance, has name "Cigarettes";
                 insert
                 $c (consumer: $p, consumed-substance: $s) isa consumption, 
-                has units-per-week {int(variable_values['Cigarettes']['units-per-week']())};'''))
+                has units-per-week {int(variable_values['Cigarettes']['units-per-week'](pmf.rng))};'''))
 
     return queries
 
 
-def generate_example_graphs(num_examples, database="diagnosis", address="localhost:1729"):
-
-    client = Grakn.core_client(address)
-    session = client.session(database, SessionType.DATA)
-
-    pmf_array = np.zeros([2, 2, 2, 2, 3, 2, 3], dtype=np.float)
+def create_pmf(seed=0):
+    """
+    Creates the probability mass function that the diagnosis examples are sampled from
+    """
+    pmf_array = np.zeros([2, 2, 2, 2, 3, 2, 3], dtype=np.float64)
     pmf_array[0, 1, 0, 1, 0, 0, 0] = 0.1
     pmf_array[1, 0, 1, 0, 0, 0, 0] = 0.05
     pmf_array[1, 0, 1, 0, 2, 0, 0] = 0.1
@@ -121,9 +126,6 @@ def generate_example_graphs(num_examples, database="diagnosis", address="localho
     pmf_array[1, 0, 1, 1, 0, 0, 0] = 0.05
     pmf_array[1, 0, 1, 1, 2, 1, 2] = 0.1
 
-    def normal_dist(mean, var):
-        return lambda: round(np.random.normal(mean, var, 1)[0], 2)
-
     pmf = PMF({
         'Diabetes Type II':             [False, {'age': normal_dist(60, 10)}],
         'Multiple Sclerosis':           [False, {'age': normal_dist(30, 10)}],
@@ -132,19 +134,101 @@ def generate_example_graphs(num_examples, database="diagnosis", address="localho
         'Drinking':                     [False, {'units-per-week': normal_dist(5, 1)}, {'units-per-week': normal_dist(20, 3)}],
         'Parent has Diabetes Type II':  [False, True],
         'Cigarettes':                   [False, {'units-per-week': normal_dist(5, 1)}, {'units-per-week': normal_dist(20, 3)}],
-    }, pmf_array, seed=0)
+    }, pmf_array, seed=seed)
+
+    return pmf
+
 
-    # print(pmf.to_dataframe()) # TODO Remove pandas if this is not needed now
+def transaction_queries(pmf, num_examples, examples_per_transaction=1):
+    """
+    Samples the queries of each example in turn, grouped into the queries to make in each transaction. The examples of
+    each transaction are sampled together from a PMF spawned from `pmf`, so each transaction's examples come from an
+    independent random stream, and are the same for the same seed and `examples_per_transaction`
 
-    for example_id in range(0, num_examples):
-        tx = session.transaction(TransactionType.WRITE)
-        for query in get_example_queries(pmf, example_id):
-            #print(query)
+    Args:
+        pmf: The PMF to sample the examples from
+        num_examples: Number of examples to sample
+        examples_per_transaction: Number of examples to insert in each transaction
+
+    Returns:
+        Generator of lists of queries, one list per transaction
+    """
+    for start in range(0, num_examples, examples_per_transaction):
+        example_ids = range(start, min(start + examples_per_transaction, num_examples))
+        transaction_pmf, = pmf.spawn(1)
+        samples = transaction_pmf.sample(len(example_ids))
+
+        queries = []
+        for i, example_id in enumerate(example_ids):
+            variable_values = {variable: values[i] for variable, values in samples.items()}
+            queries.extend(get_example_queries(transaction_pmf, example_id, variable_values))
+        yield queries
+
+
+def insert_queries(session, queries):
+    """Makes the insert queries in order in a single write transaction, and commits it"""
+    with session.transaction(TransactionType.WRITE) as tx:
+        for query in queries:
             tx.query().insert(query)
         tx.commit()
 
-    session.close()
-    client.close()
+
+def insert_queries_concurrently(session, queries_per_transaction, num_workers):
+    """
+    Commits the transactions over a pool of concurrent write transactions. Only a few transactions' queries are
+    sampled ahead of the writers, so that the queries of all examples are never held in memory at once
+    """
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        pending = set()
+        for queries in queries_per_transaction:
+            if len(pending) >= 2 * num_workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+            pending.add(executor.submit(insert_queries, session, queries))
+        for future in pending:
+            future.result()
+
+
+def write_queries_to_file(queries_per_transaction, path):
+    """Writes the Graql of every query to a file, instead of inserting it"""
+    with open(path, 'w') as f:
+        for queries in queries_per_transaction:
+            for query in queries:
+                f.write(query + '\n\n')
+
+
+def generate_example_graphs(num_examples, database="diagnosis", address="localhost:1729", examples_per_transaction=1,
+                            num_workers=1, dry_run_file=None):
+    """
+    Generates synthetic diagnosis examples and inserts them into Grakn
+
+    Args:
+        num_examples: Number of examples to generate
+        database: The name of the database to insert the examples into
+        address: The address of the running Grakn instance
+        examples_per_transaction: Number of examples to insert in each write transaction
+        num_workers: Number of write transactions to commit concurrently
+        dry_run_file: If given, the Graql of the examples is written to this file, and Grakn is not connected to
+    """
+    queries_per_transaction = transaction_queries(create_pmf(), num_examples, examples_per_transaction)
+
+    if dry_run_file is not None:
+        write_queries_to_file(queries_per_transaction, dry_run_file)
+        return
+
+    client = Grakn.core_client(address)
+    session = client.session(database, SessionType.DATA)
+
+    try:
+        if num_workers == 1:
+            for queries in queries_per_transaction:
+                insert_queries(session, queries)
+        else:
+            insert_queries_concurrently(session, queries_per_transaction, num_workers)
+    finally:
+        session.close()
+        client.close()
 
 
 if __name__ == '__main__':
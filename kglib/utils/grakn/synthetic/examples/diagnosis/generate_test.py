@@ -0,0 +1,88 @@
+#
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+#
+
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from kglib.utils.grakn.synthetic.examples.diagnosis.generate import create_pmf, generate_example_graphs, \
+    transaction_queries, insert_queries_concurrently
+
+
+class TestTransactionQueries(unittest.TestCase):
+
+    def test_examples_are_grouped_into_transactions(self):
+        queries_per_transaction = list(transaction_queries(create_pmf(), 5, examples_per_transaction=2))
+
+        self.assertEqual(3, len(queries_per_transaction))
+        person_inserts = [[query for query in queries if query.startswith('insert $p isa person')]
+                          for queries in queries_per_transaction]
+        self.assertEqual([['insert $p isa person, has example-id 0;', 'insert $p isa person, has example-id 1;'],
+                          ['insert $p isa person, has example-id 2;', 'insert $p isa person, has example-id 3;'],
+                          ['insert $p isa person, has example-id 4;']], person_inserts)
+
+    def test_queries_are_reproducible(self):
+        first = list(transaction_queries(create_pmf(seed=3), 6, examples_per_transaction=2))
+        second = list(transaction_queries(create_pmf(seed=3), 6, examples_per_transaction=2))
+        self.assertEqual(first, second)
+
+    def test_transactions_are_sampled_from_independent_streams(self):
+        pmf = create_pmf(seed=3)
+        transaction_pmfs = pmf.spawn(2)
+        self.assertNotEqual(transaction_pmfs[0].rng.random(), transaction_pmfs[1].rng.random())
+
+
+class TestInsertQueriesConcurrently(unittest.TestCase):
+
+    def test_every_transaction_is_committed(self):
+        session = MagicMock()
+        tx = session.transaction.return_value.__enter__.return_value
+
+        insert_queries_concurrently(session, ([f'insert {i}', f'insert {i}'] for i in range(10)), num_workers=3)
+
+        self.assertEqual(10, tx.commit.call_count)
+        self.assertEqual(20, tx.query.return_value.insert.call_count)
+
+    def test_failed_transaction_raises(self):
+        session = MagicMock()
+        session.transaction.return_value.__enter__.return_value.commit.side_effect = Exception('commit failed')
+
+        with self.assertRaises(Exception):
+            insert_queries_concurrently(session, ([f'insert {i}'] for i in range(3)), num_workers=2)
+
+
+class TestGenerateExampleGraphs(unittest.TestCase):
+
+    def test_dry_run_writes_graql_to_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'examples.gql')
+            with patch('kglib.utils.grakn.synthetic.examples.diagnosis.generate.Grakn') as grakn:
+                generate_example_graphs(3, dry_run_file=path)
+                grakn.core_client.assert_not_called()
+
+            with open(path) as f:
+                graql = f.read()
+
+        for example_id in range(3):
+            self.assertIn(f'insert $p isa person, has example-id {example_id};', graql)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -33,6 +33,8 @@ class PMF:
                 `variables`. Each variable is represented by a dimension of the array. For example, when there are 3
                 variables, element (0, 0, 0) indicates the probability that all variables take the first value given
                 for them in `variables`
+            seed: Seed, or `np.random.SeedSequence`, of this PMF's own random number generator. If None, fresh
+                entropy is used. The global numpy random state is neither used nor changed
 
         Raises:
             IndexError if `variables` and `pmf_array` are inconsistent
@@ -48,8 +50,20 @@ class PMF:
             raise IndexError(f'Variable values have combined shape {values_shape}, whereas the PMF array given has '
                              f'shape {self._pmf_array.shape}')
 
-        if seed is not None:
-            np.random.seed(seed)
+        if isinstance(seed, np.random.SeedSequence):
+            self._seed_sequence = seed
+        else:
+            self._seed_sequence = np.random.SeedSequence(seed)
+        self.rng = np.random.default_rng(self._seed_sequence)
+
+        # Precomputed once, so that each selection doesn't need to enumerate all of the outcomes
+        self._flattened = self._pmf_array.flatten()
+        self._cdf = np.cumsum(self._flattened)
+        self._value_arrays = []
+        for discrete_values in self._variables.values():
+            value_array = np.empty(len(discrete_values), dtype=object)
+            value_array[:] = discrete_values
+            self._value_arrays.append(value_array)
 
     def select(self):
         """
@@ -58,18 +72,43 @@ class PMF:
         Returns:
             A dict key: variable names; values: the chosen value of each variable
         """
-        flattened = self._pmf_array.flatten()
-
         answer = {}
 
-        indices = list(np.ndindex(self._pmf_array.shape))
-        int_index = list(range(len(indices)))
-        chosen_int = np.random.choice(int_index, p=flattened)
-        chosen_index = indices[chosen_int]
+        chosen_int = self.rng.choice(len(self._flattened), p=self._flattened)
+        chosen_index = np.unravel_index(chosen_int, self._pmf_array.shape)
         for index, (variable, discrete_values) in zip(chosen_index, self._variables.items()):
             answer[variable] = discrete_values[index]
         return answer
 
+    def sample(self, n):
+        """
+        Select `n` sets of variable values from the PMF at once, using the probabilities supplied in `pmf_array` as
+        weights.
+
+        Returns:
+            A dict key: variable names; values: object array of length `n` of the chosen value of each variable
+        """
+        uniform = self.rng.random(n) * self._cdf[-1]
+        chosen_ints = np.minimum(np.searchsorted(self._cdf, uniform, side='right'), len(self._cdf) - 1)
+        chosen_indices = np.unravel_index(chosen_ints, self._pmf_array.shape)
+        return {variable: value_array[indices] for variable, value_array, indices in
+                zip(self._variables.keys(), self._value_arrays, chosen_indices)}
+
+    def spawn(self, n):
+        """
+        Creates PMFs of the same variables and probabilities, each with its own random number generator. Their random
+        streams are independent of this PMF's and of each other's, and are the same each time for the same seed, so
+        they can be given to parallel workers to generate reproducible data.
+
+        Args:
+            n: Number of PMFs to create
+
+        Returns:
+            List of `n` child PMFs
+        """
+        return [PMF(self._variables, self._pmf_array, seed=child_seed_sequence)
+                for child_seed_sequence in self._seed_sequence.spawn(n)]
+
     def to_dataframe(self):
         """
         Creates a DataFrame of the PMF, most useful for visualisation purposes
@@ -49,6 +49,59 @@ class TestPMF(unittest.TestCase):
         self.assertEqual(str(context.exception), ('Variable values have combined shape (2, 2, 2, 2), whereas the PMF '
                                                   'array given has shape (2, 2, 2, 1)'))
 
+    def test_samples_have_expected_values(self):
+        a = np.zeros([2, 2, 2, 2])
+        a[0, 1, 1, 1] = 1.0
+
+        pmf = PMF({'Flu': [False, True], 'Meningitis': [False, True], 'Light Sensitivity': [False, True],
+                   'Fever': [False, True]}, a)
+        samples = pmf.sample(3)
+
+        self.assertEqual(['Flu', 'Meningitis', 'Light Sensitivity', 'Fever'], list(samples.keys()))
+        self.assertEqual([False, False, False], list(samples['Flu']))
+        self.assertEqual([True, True, True], list(samples['Fever']))
+
+    def test_samples_follow_probabilities(self):
+        a = np.array([[0.1, 0.0, 0.2], [0.0, 0.3, 0.4]])
+        values = {'Drinking': [False, {'units-per-week': 5}], 'Severity': ['low', 'medium', 'high']}
+
+        pmf = PMF(values, a, seed=0)
+        samples = pmf.sample(100000)
+
+        counts = np.zeros([2, 3])
+        for drinking, severity in zip(samples['Drinking'], samples['Severity']):
+            counts[values['Drinking'].index(drinking), values['Severity'].index(severity)] += 1
+        np.testing.assert_allclose(a, counts / 100000, atol=0.01)
+        self.assertEqual(0, counts[0, 1])
+        self.assertEqual(0, counts[1, 0])
+
+    def test_global_random_state_is_not_changed(self):
+        a = np.array([0.5, 0.5])
+        state = np.random.get_state()[1].copy()
+
+        pmf = PMF({'Flu': [False, True]}, a, seed=0)
+        pmf.select()
+        pmf.sample(10)
+
+        np.testing.assert_array_equal(state, np.random.get_state()[1])
+
+    def test_same_seed_gives_same_samples(self):
+        a = np.array([0.2, 0.3, 0.5])
+        first = PMF({'Severity': ['low', 'medium', 'high']}, a, seed=7).sample(20)
+        second = PMF({'Severity': ['low', 'medium', 'high']}, a, seed=7).sample(20)
+        np.testing.assert_array_equal(first['Severity'], second['Severity'])
+
+    def test_spawned_pmfs_are_reproducible_and_independent(self):
+        a = np.array([0.2, 0.3, 0.5])
+        variables = {'Severity': ['low', 'medium', 'high']}
+
+        children = PMF(variables, a, seed=7).spawn(2)
+        children_again = PMF(variables, a, seed=7).spawn(2)
+
+        for child, child_again in zip(children, children_again):
+            np.testing.assert_array_equal(child.sample(20)['Severity'], child_again.sample(20)['Severity'])
+        self.assertFalse(np.array_equal(children[0].rng.random(20), children[1].rng.random(20)))
+
     def test_to_dataframe_is_as_expected(self):
         features = ['Flu', 'Meningitis', 'Light Sensitivity', 'Fever']
         feat_values = [[False, True], [False, True], [False, True], [False, True]]
@@ -23,6 +23,14 @@ class MockConcept:
         self.id = id
 
 
+class MockLabel:
+    def __init__(self, name):
+        self._name = name
+
+    def name(self):
+        return self._name
+
+
 class MockType(MockConcept):
     def __init__(self, id, label, base_type):
         super().__init__(id)
@@ -31,7 +39,7 @@ class MockType(MockConcept):
         self.base_type = base_type
 
     def get_label(self):
-        return self._label
+        return MockLabel(self._label)
 
 
 class ValueType:
@@ -48,6 +56,9 @@ class MockAttributeType(MockType):
     def value_type(self):
         return self._value_type
 
+    def get_value_type(self):
+        return self._value_type
+
 
 class MockThing(MockConcept):
     def __init__(self, id, type):
@@ -84,3 +95,6 @@ class MockAttribute(MockThing):
 
     def value(self):
         return self._value
+
+    def get_value(self):
+        return self._value
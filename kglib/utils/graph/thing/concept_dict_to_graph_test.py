@@ -21,7 +21,7 @@ import unittest
 import networkx as nx
 
 from kglib.utils.grakn.object.thing import Thing
-from kglib.utils.graph.thing.concept_dict_to_networkx_graph import concept_dict_to_graph
+from kglib.utils.graph.thing.concept_dict_to_networkx_graph import concept_dict_to_graph, add_concept_dict_to_graph
 from kglib.utils.graph.test.case import GraphTestCase
 
 
@@ -181,5 +181,63 @@ class TestConceptDictToGraknGraph(GraphTestCase):
         self.assertGraphsEqual(expected_grakn_graph, grakn_graph)
 
 
+class TestAddConceptDictToGraph(GraphTestCase):
+
+    def setUp(self):
+        self.variable_graph = nx.MultiDiGraph()
+        self.variable_graph.add_node('x')
+        self.variable_graph.add_node('y')
+        self.variable_graph.add_node('r')
+        self.variable_graph.add_edge('r', 'x', type='child')
+        self.variable_graph.add_edge('r', 'y', type='parent')
+
+        self.parentship = Thing('V567', 'parentship', 'relation')
+        self.child = Thing('V123', 'person', 'entity')
+
+    def test_common_things_and_edges_are_not_duplicated(self):
+        parent_a = Thing('V456', 'person', 'entity')
+        parent_b = Thing('V789', 'person', 'entity')
+
+        graph = nx.MultiDiGraph()
+        add_concept_dict_to_graph({'x': self.child, 'y': parent_a, 'r': self.parentship}, self.variable_graph, graph)
+        add_concept_dict_to_graph({'x': self.child, 'y': parent_b, 'r': self.parentship}, self.variable_graph, graph)
+        add_concept_dict_to_graph({'x': self.child, 'y': parent_a, 'r': self.parentship}, self.variable_graph, graph)
+
+        expected_graph = nx.MultiDiGraph()
+        expected_graph.add_node(self.child, type='person')
+        expected_graph.add_node(parent_a, type='person')
+        expected_graph.add_node(parent_b, type='person')
+        expected_graph.add_node(self.parentship, type='parentship')
+        expected_graph.add_edge(self.parentship, self.child, type='child')
+        expected_graph.add_edge(self.parentship, parent_a, type='parent')
+        expected_graph.add_edge(self.parentship, parent_b, type='parent')
+
+        self.assertGraphsEqual(expected_graph, graph)
+
+    def test_edges_with_different_roles_between_the_same_things_are_kept(self):
+        graph = nx.MultiDiGraph()
+        add_concept_dict_to_graph({'x': self.child, 'y': self.child, 'r': self.parentship}, self.variable_graph, graph)
+        add_concept_dict_to_graph({'x': self.child, 'y': self.child, 'r': self.parentship}, self.variable_graph, graph)
+
+        self.assertCountEqual(['child', 'parent'], [data['type'] for _, _, data in graph.edges(data=True)])
+
+    def test_parallel_edges_of_the_same_role_within_one_answer_are_kept(self):
+        variable_graph = nx.MultiDiGraph()
+        variable_graph.add_node('x')
+        variable_graph.add_node('y')
+        variable_graph.add_node('r')
+        variable_graph.add_edge('r', 'x', type='parent')
+        variable_graph.add_edge('r', 'y', type='parent')
+
+        graph = nx.MultiDiGraph()
+        concept_dict = {'x': self.child, 'y': self.child, 'r': self.parentship}
+        add_concept_dict_to_graph(concept_dict, variable_graph, graph)
+        self.assertEqual(2, graph.number_of_edges(self.parentship, self.child))
+
+        # A later answer repeating both edges adds no more
+        add_concept_dict_to_graph(concept_dict, variable_graph, graph)
+        self.assertEqual(2, graph.number_of_edges(self.parentship, self.child))
+
+
 if __name__ == "__main__":
     unittest.main()
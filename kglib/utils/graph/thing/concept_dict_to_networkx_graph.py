@@ -17,6 +17,8 @@
 #  under the License.
 #
 
+from collections import Counter
+
 import networkx as nx
 
 
@@ -32,7 +34,25 @@ def concept_dict_to_graph(concept_dict, variable_graph):
     Returns:
         A graph with Things as nodes. Edges connecting the nodes have only role/has type information in their data
     """
-    grakn_graph = nx.MultiDiGraph()
+    return add_concept_dict_to_graph(concept_dict, variable_graph, nx.MultiDiGraph())
+
+
+def add_concept_dict_to_graph(concept_dict, variable_graph, grakn_graph):
+    """
+    Add the Things of a concept_dict, and the edges between them described by a `variable_graph`, directly to an
+    existing graph. Things already in the graph are recognised by their id. Edges are deduplicated only against those
+    added by earlier concept_dicts: if this concept_dict gives n edges of the same type between the same sender and
+    receiver, the graph ends up with at least n such edges, and no more than the most any one concept_dict gave.
+
+    Args:
+        concept_dict: A dictionary with variable names as keys, values are Things
+        variable_graph: A graph with variable names as nodes, edges represent roles and has connections, indicated by
+            the key "type" stored on each edge
+        grakn_graph: The graph of Things to add to, updated in-place
+
+    Returns:
+        `grakn_graph`
+    """
     node_to_var = {}
 
     if set(variable_graph.nodes()) != set(concept_dict.keys()):
@@ -46,7 +66,9 @@ def concept_dict_to_graph(concept_dict, variable_graph):
 
     # This assumes that all variables are nodes, which would not be the case for variable roles
     for variable, thing in concept_dict.items():
-        data = variable_graph.nodes[variable]
+        # Copy the variable's data rather than updating it in place, since the variable_graph may be shared between
+        # concurrently processed answers
+        data = dict(variable_graph.nodes[variable])
         data.update(type=thing.type_label)
         if thing.base_type_label == 'attribute':
             data.update(value_type=thing.value_type, value=thing.value)
@@ -57,6 +79,8 @@ def concept_dict_to_graph(concept_dict, variable_graph):
         assert variable not in node_to_var
         node_to_var[variable] = thing
 
+    # Counts the edges of this concept_dict between the same things with the same type, which are all kept
+    occurrences = Counter()
     for sending_var, receiving_var, data in variable_graph.edges(data=True):
         sender = node_to_var[sending_var]
         receiver = node_to_var[receiving_var]
@@ -65,9 +89,34 @@ def concept_dict_to_graph(concept_dict, variable_graph):
                 receiver.base_type_label == 'attribute' and data['type'] == 'has'):
             raise ValueError('An edge in the variable_graph originates from a non-relation, check the variable_graph!')
 
-        if data['type'] == 'has':
-            grakn_graph.add_edge(sender, receiver, **data)
-        else:
-            grakn_graph.add_edge(sender, receiver, **data)
+        edge = (sender, receiver, data.get('type'))
+        add_typed_edge(grakn_graph, sender, receiver, data, occurrence=occurrences[edge])
+        occurrences[edge] += 1
 
     return grakn_graph
+
+
+def add_typed_edge(graph, sender, receiver, data, occurrence=0):
+    """
+    Add an edge to a multigraph unless the graph already has more than `occurrence` edges of the same "type" (role or
+    has) from `sender` to `receiver`, in which case the data of the edge at that position is updated instead
+
+    Args:
+        graph: The multigraph to add to
+        sender: The sending node, which must already be in the graph
+        receiver: The receiving node, which must already be in the graph
+        data: The edge data, including its "type"
+        occurrence: How many edges of the same type between `sender` and `receiver` come before this one in the same
+            answer. Parallel edges within one answer are kept, while edges repeated by a later answer are not
+
+    Returns:
+        The key of the added or updated edge
+    """
+    existing_edges = graph.get_edge_data(sender, receiver, default={})
+    same_type = [(key, existing_data) for key, existing_data in existing_edges.items()
+                 if existing_data.get('type') == data.get('type')]
+    if occurrence < len(same_type):
+        key, existing_data = same_type[occurrence]
+        existing_data.update(data)
+        return key
+    return graph.add_edge(sender, receiver, **data)
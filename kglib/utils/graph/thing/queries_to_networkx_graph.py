@@ -17,23 +17,53 @@
 #  under the License.
 #
 import warnings
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 
-from kglib.utils.grakn.object.thing import build_thing
-from kglib.utils.graph.thing.concept_dict_to_networkx_graph import concept_dict_to_graph
+import networkx as nx
+from grakn.client import TransactionType
 
+from kglib.utils.grakn.object.thing import build_thing, ThingCache
+from kglib.utils.graph.thing.concept_dict_to_networkx_graph import concept_dict_to_graph, add_concept_dict_to_graph, \
+    add_typed_edge
 
-def concept_dict_from_concept_map(concept_map):
+
+def concept_dict_from_concept_map(concept_map, thing_cache=None):
     """
     Given a concept map, build a dictionary of the variables present and the concepts they refer to, locally storing any
     information required about those concepts.
 
     Args:
         concept_map: A dict of Concepts provided by Grakn keyed by query variables
+        thing_cache: Optional ThingCache of the transaction the concept map came from, to reuse the Things already
+            built for concepts seen in earlier answers
 
     Returns:
         A dictionary of concepts keyed by query variables
     """
-    return {variable: build_thing(grakn_concept) for variable, grakn_concept in concept_map.map().items()}
+    build = build_thing if thing_cache is None else thing_cache.build_thing
+    return {variable: build(grakn_concept) for variable, grakn_concept in concept_map.map().items()}
+
+
+def merge_graph_into(target_graph, graph):
+    """
+    Add the nodes and edges of `graph` to `target_graph`, in-place, recognising nodes common to both graphs
+
+    Args:
+        target_graph: The graph to add to
+        graph: The graph to add
+
+    Returns:
+        `target_graph`
+    """
+    target_graph.graph.update(graph.graph)
+    target_graph.add_nodes_from(graph.nodes(data=True))
+
+    if graph.is_multigraph():
+        target_graph.add_edges_from(graph.edges(keys=True, data=True))
+    else:
+        target_graph.add_edges_from(graph.edges(data=True))
+    return target_graph
 
 
 def combine_graphs_single_pass(graphs_list):
@@ -48,22 +78,173 @@ def combine_graphs_single_pass(graphs_list):
         """
     combined_graph = graphs_list[0].__class__()
     for graph in graphs_list:
-        combined_graph.graph.update(graph.graph)
-        combined_graph.add_nodes_from(graph.nodes(data=True))
+        merge_graph_into(combined_graph, graph)
+
+    return combined_graph
+
+
+def concept_graphs_from_query(query, sampler, variable_graph, grakn_transaction,
+                              concept_dict_converter=concept_dict_to_graph, thing_cache=None):
+    """
+    Lazily builds a graph for each answer to a query, consuming the answers from Grakn only as each graph is requested
+
+    Args:
+        query: A Graql match query
+        sampler: A function to sample the answers of the query
+        variable_graph: A graph representing the query
+        grakn_transaction: A Grakn transaction
+        concept_dict_converter: The function to use to convert from concept_dicts to a Grakn model
+        thing_cache: ThingCache of `grakn_transaction`. If None, a new cache is used for this query
+
+    Returns:
+        A generator of networkx graphs, one per answer
+    """
+    if thing_cache is None:
+        thing_cache = ThingCache()
+    concept_maps = sampler(grakn_transaction.query().match(query))
+
+    for concept_map in concept_maps:
+        concept_dict = concept_dict_from_concept_map(concept_map, thing_cache)
+        try:
+            yield concept_dict_converter(concept_dict, variable_graph)
+        except ValueError as e:
+            raise ValueError(str(e) + f'Encountered processing query:\n \"{query}\"')
+
+
+def merge_concept_graph_into(target_graph, graph):
+    """
+    Add the nodes and edges of a graph of Things to `target_graph`, in-place. Things common to both graphs are
+    recognised by their id, and edges by their sender, receiver and type (role or has). Parallel edges of the same type
+    within `graph` are all kept.
+
+    Args:
+        target_graph: The graph to add to
+        graph: The graph to add
+
+    Returns:
+        `target_graph`
+    """
+    target_graph.graph.update(graph.graph)
+    target_graph.add_nodes_from(graph.nodes(data=True))
+    occurrences = Counter()
+    for sender, receiver, data in graph.edges(data=True):
+        edge = (sender, receiver, data.get('type'))
+        add_typed_edge(target_graph, sender, receiver, data, occurrence=occurrences[edge])
+        occurrences[edge] += 1
+    return target_graph
+
+
+def add_query_to_graph(graph, query, sampler, variable_graph, grakn_transaction, concept_dict_converter=None,
+                       thing_cache=None):
+    """
+    Folds each answer to a query into `graph` as soon as the answer is received, so that the answers are never all
+    held in memory at once. By default each answer is written straight into `graph`, without building a graph per
+    answer.
+
+    Args:
+        graph: The graph to add to, or None to start a new graph
+        query: A Graql match query
+        sampler: A function to sample the answers of the query
+        variable_graph: A graph representing the query
+        grakn_transaction: A Grakn transaction
+        concept_dict_converter: The function to use to convert from concept_dicts to a Grakn model. If None, each
+            answer is added to `graph` directly with `add_concept_dict_to_graph`
+        thing_cache: ThingCache of `grakn_transaction`, shared by the queries made in it. If None, a new cache is used
+            for this query
+
+    Returns:
+        The graph with the answers added, None if `graph` was None and the query returned no results
+    """
+    print("working on query: " + query)
 
-        if graph.is_multigraph():
-            combined_graph.add_edges_from(graph.edges(keys=True, data=True))
+    if thing_cache is None:
+        thing_cache = ThingCache()
+
+    num_answers = 0
+    if concept_dict_converter is None:
+        target_graph = nx.MultiDiGraph() if graph is None else graph
+        for concept_map in sampler(grakn_transaction.query().match(query)):
+            concept_dict = concept_dict_from_concept_map(concept_map, thing_cache)
+            try:
+                add_concept_dict_to_graph(concept_dict, variable_graph, target_graph)
+            except ValueError as e:
+                raise ValueError(str(e) + f'Encountered processing query:\n \"{query}\"')
+            num_answers += 1
+        if num_answers > 0:
+            graph = target_graph
+    else:
+        for answer_concept_graph in concept_graphs_from_query(query, sampler, variable_graph, grakn_transaction,
+                                                              concept_dict_converter, thing_cache):
+            num_answers += 1
+            if graph is None:
+                graph = answer_concept_graph
+            else:
+                merge_graph_into(graph, answer_concept_graph)
+    print(f"added {num_answers} answers")
+
+    if num_answers == 0:
+        warnings.warn(f'There were no results for query: \n\"{query}\"\nand so nothing will be added to the '
+                      f'graph for this query')
+    return graph
+
+
+def build_graph_from_query(query, sampler, variable_graph, grakn_transaction,
+                           concept_dict_converter=None):
+    """
+    Builds a graph of Things from the answers to a single query, over a Grakn transaction
+
+    Args:
+        query: A Graql match query
+        sampler: A function to sample the answers of the query
+        variable_graph: A graph representing the query
+        grakn_transaction: A Grakn transaction
+        concept_dict_converter: The function to use to convert from concept_dicts to a Grakn model. If None, answers
+            are added directly to the graph being built
+
+    Returns:
+        A networkx graph, or None if the query returned no results
+    """
+    return add_query_to_graph(None, query, sampler, variable_graph, grakn_transaction, concept_dict_converter)
+
+
+def raise_no_results(query_sampler_variable_graph_tuples):
+    # Raise exception when none of the queries returned any results
+    raise RuntimeError(f'The graph from queries: {[query_sampler_variable_graph_tuple[0] for query_sampler_variable_graph_tuple in query_sampler_variable_graph_tuples]}\n'
+                       f'could not be created, since none of these queries returned results')
+
+
+def combine_query_graphs(query_sampler_variable_graph_tuples, query_concept_graphs):
+    """
+    Combines the graphs built for each query into a single graph
+
+    Args:
+        query_sampler_variable_graph_tuples: The query handles the graphs were built from
+        query_concept_graphs: The graph built for each query, None where the query returned no results
+
+    Returns:
+        A networkx graph
+    """
+    combined_graph = None
+    for query_concept_graph in query_concept_graphs:
+        if query_concept_graph is None:
+            continue
+        if combined_graph is None:
+            combined_graph = query_concept_graph
         else:
-            combined_graph.add_edges_from(graph.edges(data=True))
+            merge_concept_graph_into(combined_graph, query_concept_graph)
 
+    if combined_graph is None:
+        raise_no_results(query_sampler_variable_graph_tuples)
     return combined_graph
 
 
 def build_graph_from_queries(query_sampler_variable_graph_tuples, grakn_transaction,
-                             concept_dict_converter=concept_dict_to_graph):
+                             concept_dict_converter=None):
     """
     Builds a graph of Things, interconnected by roles (and *has*), from a set of queries and graphs representing those
-    queries (variable graphs)of those queries, over a Grakn transaction
+    queries (variable graphs)of those queries, over a Grakn transaction. The answers are streamed from Grakn and each is
+    folded into the graph as it arrives, so memory use is proportional to the size of the graph built, rather than to
+    the number of answers.
 
     Args:
         infer: whether to use Grakn's inference engine
@@ -71,44 +252,57 @@ def build_graph_from_queries(query_sampler_variable_graph_tuples, grakn_transact
             and a variable_graph
         grakn_transaction: A Grakn transaction
         concept_dict_converter: The function to use to convert from concept_dicts to a Grakn model. This could be
-            a typical model or a mathematical model
+            a typical model or a mathematical model. If None, each answer is added directly to the graph being built
 
     Returns:
         A networkx graph
     """
+    # The queries share a transaction, so concepts common to several queries are only built once
+    thing_cache = ThingCache()
+    concept_graph = None
+    for query, sampler, variable_graph in query_sampler_variable_graph_tuples:
+        concept_graph = add_query_to_graph(concept_graph, query, sampler, variable_graph, grakn_transaction,
+                                           concept_dict_converter, thing_cache)
 
-    query_concept_graphs = []
+    if concept_graph is None:
+        raise_no_results(query_sampler_variable_graph_tuples)
+    return concept_graph
 
-    for query, sampler, variable_graph in query_sampler_variable_graph_tuples:
 
-        print("working on query: " + query)
-        concept_maps = sampler(grakn_transaction.query().match(query))
-        print("query completed")
+def build_graphs_from_queries_concurrently(query_handles_per_example, grakn_session, options=None, max_workers=8,
+                                           concept_dict_converter=None):
+    """
+    Builds one graph per example, as `build_graph_from_queries` does, but runs the queries of all of the examples
+    concurrently. Each query is run in its own read transaction over the shared `grakn_session`, and at most
+    `max_workers` transactions are open at once.
 
-        concept_dicts = [concept_dict_from_concept_map(concept_map) for concept_map in concept_maps]
-        print("constructed concept_dicts")
+    Args:
+        query_handles_per_example: A list with an element per example, each element a list of query handles, as
+            given to `build_graph_from_queries`
+        grakn_session: A Grakn session of type SessionType.DATA
+        options: GraknOptions to open the read transactions with
+        max_workers: The maximum number of queries to run at once
+        concept_dict_converter: The function to use to convert from concept_dicts to a Grakn model. If None, answers
+            are added directly to the graph being built
 
-        answer_concept_graphs = []
-        for concept_dict in concept_dicts:
-            try:
-                answer_concept_graphs.append(concept_dict_converter(concept_dict, variable_graph))
-            except ValueError as e:
-                raise ValueError(str(e) + f'Encountered processing query:\n \"{query}\"')
+    Returns:
+        A networkx graph for each example, in the order given
+    """
 
-        if len(answer_concept_graphs) > 1:
-            query_concept_graph = combine_graphs_single_pass(answer_concept_graphs)
-            query_concept_graphs.append(query_concept_graph)
+    def build_in_transaction(query, sampler, variable_graph):
+        if options is None:
+            tx = grakn_session.transaction(TransactionType.READ)
         else:
-            if len(answer_concept_graphs) > 0:
-                query_concept_graphs.append(answer_concept_graphs[0])
-            else:
-                warnings.warn(f'There were no results for query: \n\"{query}\"\nand so nothing will be added to the '
-                              f'graph for this query')
+            tx = grakn_session.transaction(TransactionType.READ, options)
+        with tx:
+            return build_graph_from_query(query, sampler, variable_graph, tx, concept_dict_converter)
 
-    if len(query_concept_graphs) == 0:
-        # Raise exception when none of the queries returned any results
-        raise RuntimeError(f'The graph from queries: {[query_sampler_variable_graph_tuple[0] for query_sampler_variable_graph_tuple in query_sampler_variable_graph_tuples]}\n'
-                           f'could not be created, since none of these queries returned results')
-
-    concept_graph = combine_graphs_single_pass(query_concept_graphs)
-    return concept_graph
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures_per_example = [
+            [executor.submit(build_in_transaction, *query_handle) for query_handle in query_handles]
+            for query_handles in query_handles_per_example
+        ]
+        return [
+            combine_query_graphs(query_handles, [future.result() for future in futures])
+            for query_handles, futures in zip(query_handles_per_example, futures_per_example)
+        ]
@@ -17,15 +17,19 @@
 #  under the License.
 #
 
+import threading
+import time
 import unittest
 
 import networkx as nx
 
-from kglib.utils.grakn.object.thing import Thing
+from kglib.utils.grakn.object.thing import Thing, ThingCache
 from kglib.utils.grakn.test.mock.answer import MockConceptMap
 from kglib.utils.grakn.test.mock.concept import MockType, MockThing
-from kglib.utils.graph.thing.queries_to_networkx_graph import concept_dict_from_concept_map, combine_graphs_single_pass
+from kglib.utils.graph.thing.queries_to_networkx_graph import concept_dict_from_concept_map, combine_graphs_single_pass, \
+    build_graphs_from_queries_concurrently, build_graph_from_queries
 from kglib.utils.graph.test.case import GraphTestCase
+from kglib.utils.graph.thing.concept_dict_to_networkx_graph import concept_dict_to_graph
 
 
 class TestConceptDictsFromQuery(unittest.TestCase):
@@ -52,6 +56,15 @@ class TestConceptDictsFromQuery(unittest.TestCase):
 
         self.assertEqual(expected_concept_dict, concept_dicts)
 
+    def test_concepts_seen_in_earlier_answers_are_reused_from_cache(self):
+        person_type = MockType('V456', 'person', 'ENTITY')
+        thing_cache = ThingCache()
+
+        first = concept_dict_from_concept_map(MockConceptMap({'x': MockThing('V123', person_type)}), thing_cache)
+        second = concept_dict_from_concept_map(MockConceptMap({'y': MockThing('V123', person_type)}), thing_cache)
+
+        self.assertIs(first['x'], second['y'])
+
 
 class TestCombineGraphs(GraphTestCase):
 
@@ -132,5 +145,164 @@ class TestCombineGraphs(GraphTestCase):
                           'In graph b: {\'type\': \'has\', \'input\': 1, \'solution\': 0}'), str(context.exception))
 
 
+class MockQueryManager:
+    def __init__(self, answers):
+        self._answers = answers
+
+    def match(self, query):
+        return self._answers[query]
+
+
+class MockReadTransaction:
+    def __init__(self, session):
+        self._session = session
+
+    def __enter__(self):
+        self._session.opened()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._session.closed()
+
+    def query(self):
+        # Hold the transaction open briefly so that concurrently open transactions overlap
+        time.sleep(0.01)
+        return MockQueryManager(self._session.answers)
+
+
+class MockSession:
+    def __init__(self, answers):
+        self.answers = answers
+        self.max_open = 0
+        self.num_transactions = 0
+        self._open = 0
+        self._lock = threading.Lock()
+
+    def transaction(self, transaction_type, options=None):
+        return MockReadTransaction(self)
+
+    def opened(self):
+        with self._lock:
+            self._open += 1
+            self.num_transactions += 1
+            self.max_open = max(self.max_open, self._open)
+
+    def closed(self):
+        with self._lock:
+            self._open -= 1
+
+
+class TestBuildGraphsFromQueriesConcurrently(GraphTestCase):
+
+    def setUp(self):
+        person_graph = nx.MultiDiGraph()
+        person_graph.add_node('x')
+        employment_graph = nx.MultiDiGraph()
+        employment_graph.add_node('x')
+        employment_graph.add_node('e')
+        employment_graph.add_edge('e', 'x', type='employee')
+
+        answers = {}
+        self.query_handles_per_example = []
+        for example_id in range(6):
+            person = MockThing(f'V{example_id}', MockType('V1', 'person', 'ENTITY'))
+            employment = MockThing(f'V10{example_id}', MockType('V2', 'employment', 'RELATION'))
+            answers[f'person {example_id}'] = [MockConceptMap({'x': person})]
+            answers[f'employment {example_id}'] = [MockConceptMap({'x': person, 'e': employment})]
+            self.query_handles_per_example.append([
+                (f'person {example_id}', lambda x: x, person_graph),
+                (f'employment {example_id}', lambda x: x, employment_graph),
+            ])
+        self.session = MockSession(answers)
+
+    def test_graphs_are_built_as_expected_in_example_order(self):
+        graphs = build_graphs_from_queries_concurrently(self.query_handles_per_example, self.session, max_workers=4)
+
+        self.assertEqual(6, len(graphs))
+        for example_id, graph in enumerate(graphs):
+            person = Thing(f'V{example_id}', 'person', 'entity')
+            employment = Thing(f'V10{example_id}', 'employment', 'relation')
+            expected_graph = nx.MultiDiGraph()
+            expected_graph.add_node(person, type='person')
+            expected_graph.add_node(employment, type='employment')
+            expected_graph.add_edge(employment, person, type='employee')
+            self.assertGraphsEqual(expected_graph, graph)
+
+    def test_number_of_open_transactions_is_bounded(self):
+        build_graphs_from_queries_concurrently(self.query_handles_per_example, self.session, max_workers=3)
+
+        self.assertEqual(12, self.session.num_transactions)
+        self.assertLessEqual(self.session.max_open, 3)
+        self.assertGreater(self.session.max_open, 1)
+
+
+class MockTransaction:
+    def __init__(self, answers):
+        self._answers = answers
+
+    def query(self):
+        return MockQueryManager(self._answers)
+
+
+class TestBuildGraphFromQueries(GraphTestCase):
+
+    def test_answers_are_consumed_lazily_and_folded_into_one_graph(self):
+        variable_graph = nx.MultiDiGraph()
+        variable_graph.add_node('x')
+        variable_graph.add_node('e')
+        variable_graph.add_edge('e', 'x', type='employee')
+
+        num_answers_received = []
+        person = MockThing('V1', MockType('V10', 'person', 'ENTITY'))
+
+        def answers():
+            for i in range(3):
+                num_answers_received.append(i)
+                yield MockConceptMap({'x': person, 'e': MockThing(f'V2{i}', MockType('V11', 'employment', 'RELATION'))})
+
+        num_answers_received_at_conversion = []
+
+        def converter(concept_dict, variable_graph):
+            num_answers_received_at_conversion.append(len(num_answers_received))
+            return concept_dict_to_graph(concept_dict, variable_graph)
+
+        tx = MockTransaction({'match employment': answers()})
+        graph = build_graph_from_queries([('match employment', lambda x: x, variable_graph)], tx,
+                                         concept_dict_converter=converter)
+
+        self.assertEqual([1, 2, 3], num_answers_received_at_conversion)
+
+        person_ex = Thing('V1', 'person', 'entity')
+        expected_graph = nx.MultiDiGraph()
+        expected_graph.add_node(person_ex, type='person')
+        for i in range(3):
+            employment_ex = Thing(f'V2{i}', 'employment', 'relation')
+            expected_graph.add_node(employment_ex, type='employment')
+            expected_graph.add_edge(employment_ex, person_ex, type='employee')
+        self.assertGraphsEqual(expected_graph, graph)
+
+    def test_warning_given_when_one_query_gives_no_results(self):
+        variable_graph = nx.MultiDiGraph()
+        variable_graph.add_node('x')
+        person = MockThing('V1', MockType('V10', 'person', 'ENTITY'))
+        tx = MockTransaction({'match person': [MockConceptMap({'x': person})], 'match nobody': []})
+
+        with self.assertWarns(UserWarning) as context:
+            graph = build_graph_from_queries([('match person', lambda x: x, variable_graph),
+                                              ('match nobody', lambda x: x, variable_graph)], tx)
+
+        self.assertEqual('There were no results for query: \n"match nobody"\nand so nothing will be added to the '
+                         'graph for this query', str(context.warning))
+        self.assertEqual(1, graph.number_of_nodes())
+
+    def test_exception_is_raised_when_there_are_no_results_for_any_query(self):
+        variable_graph = nx.MultiDiGraph()
+        variable_graph.add_node('x')
+        tx = MockTransaction({'match nobody': []})
+
+        with self.assertRaises(RuntimeError):
+            build_graph_from_queries([('match nobody', lambda x: x, variable_graph)], tx)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,167 @@
+#
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+#
+
+import hashlib
+import os
+import pickle
+import tempfile
+import zlib
+
+
+def sampler_identity(sampler):
+    """
+    Describes a sampling function by its code, rather than by its (per-process) object identity, so that the same
+    sampler defined in a later run is recognised as the same
+
+    Args:
+        sampler: A function to sample the answers of a query
+
+    Returns:
+        A string identifying the sampler
+    """
+    code = getattr(sampler, '__code__', None)
+    if code is None:
+        return repr(sampler)
+    closure = getattr(sampler, '__closure__', None) or ()
+    return '|'.join([
+        getattr(sampler, '__module__', '') or '',
+        getattr(sampler, '__qualname__', ''),
+        code.co_code.hex(),
+        repr(code.co_consts),
+        repr(code.co_names),
+        repr([cell.cell_contents for cell in closure]),
+    ])
+
+
+def query_graph_structure(variable_graph):
+    """
+    Describes the variables and edges of a query graph, along with their data, independently of insertion order
+
+    Args:
+        variable_graph: A graph representing a query
+
+    Returns:
+        A string describing the graph
+    """
+    nodes = sorted(repr((node, sorted(data.items()))) for node, data in variable_graph.nodes(data=True))
+    edges = sorted(repr((sender, receiver, sorted(data.items())))
+                   for sender, receiver, data in variable_graph.edges(data=True))
+    return repr((nodes, edges))
+
+
+class SubgraphCache:
+    """
+    A persistent cache of the graphs built by `build_graph_from_queries`, stored on disk. Graphs are addressed by a hash
+    of everything that determines their content: the query text, sampler and query graph of every query handle, whether
+    inference is used, and the database queried. Each graph is stored as a compressed pickle.
+    """
+    def __init__(self, cache_dir, database, infer):
+        """
+        Args:
+            cache_dir: Directory to store the cached graphs in, created if it doesn't exist
+            database: Name of the database the graphs are queried from
+            infer: Whether the graphs are queried using Grakn's inference engine
+        """
+        self._cache_dir = cache_dir
+        self._database = database
+        self._infer = infer
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def key(self, query_sampler_variable_graph_tuples):
+        """
+        Args:
+            query_sampler_variable_graph_tuples: The query handles a graph is built from
+
+        Returns:
+            The hex digest addressing the graph built from these query handles
+        """
+        digest = hashlib.sha256()
+        digest.update(repr((self._database, bool(self._infer))).encode())
+        for query, sampler, variable_graph in query_sampler_variable_graph_tuples:
+            handle = (query, sampler_identity(sampler), query_graph_structure(variable_graph))
+            digest.update(repr(handle).encode())
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self._cache_dir, key + '.graph')
+
+    def load(self, query_sampler_variable_graph_tuples):
+        """
+        Args:
+            query_sampler_variable_graph_tuples: The query handles a graph is built from
+
+        Returns:
+            The cached graph, or None if there isn't one
+        """
+        path = self._path(self.key(query_sampler_variable_graph_tuples))
+        try:
+            with open(path, 'rb') as f:
+                return pickle.loads(zlib.decompress(f.read()))
+        except FileNotFoundError:
+            return None
+
+    def save(self, query_sampler_variable_graph_tuples, graph):
+        """
+        Store a graph, replacing any graph already cached for the same query handles. The file is written atomically,
+        so that concurrent readers never see a partially written graph.
+
+        Args:
+            query_sampler_variable_graph_tuples: The query handles the graph was built from
+            graph: The graph to store
+        """
+        path = self._path(self.key(query_sampler_variable_graph_tuples))
+        data = zlib.compress(pickle.dumps(graph, protocol=pickle.HIGHEST_PROTOCOL))
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self._cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(file_descriptor, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    def get_or_build(self, query_sampler_variable_graph_tuples, build):
+        """
+        Args:
+            query_sampler_variable_graph_tuples: The query handles a graph is built from
+            build: Function to build the graph if it isn't cached, taking the query handles as its argument
+
+        Returns:
+            The cached graph if there is one, otherwise the newly built (and now cached) graph
+        """
+        return self.get_or_build_many([query_sampler_variable_graph_tuples], lambda handles: [build(handles[0])])[0]
+
+    def get_or_build_many(self, query_handles_per_example, build_many):
+        """
+        Args:
+            query_handles_per_example: The query handles of each graph
+            build_many: Function to build the graphs that aren't cached, taking a list of their query handles as its
+                argument and returning a list of graphs in the same order
+
+        Returns:
+            A graph for each element of `query_handles_per_example`
+        """
+        graphs = [self.load(query_handles) for query_handles in query_handles_per_example]
+        missing = [i for i, graph in enumerate(graphs) if graph is None]
+        if len(missing) > 0:
+            built_graphs = build_many([query_handles_per_example[i] for i in missing])
+            for i, graph in zip(missing, built_graphs):
+                self.save(query_handles_per_example[i], graph)
+                graphs[i] = graph
+        return graphs
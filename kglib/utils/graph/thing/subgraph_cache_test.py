@@ -0,0 +1,119 @@
+#
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+#
+
+import shutil
+import tempfile
+import unittest
+
+import networkx as nx
+
+from kglib.utils.grakn.object.thing import Thing
+from kglib.utils.graph.query.query_graph import QueryGraph
+from kglib.utils.graph.test.case import GraphTestCase
+from kglib.utils.graph.thing.subgraph_cache import SubgraphCache
+
+
+def identity_sampler(answers):
+    return answers
+
+
+def first_answer_sampler(answers):
+    return answers[:1]
+
+
+def make_query_handles(query='match $x isa person;', sampler=identity_sampler, solution=0):
+    return [(query, sampler, QueryGraph().add_vars(['x'], solution))]
+
+
+def make_graph():
+    graph = nx.MultiDiGraph()
+    person = Thing('V123', 'person', 'entity')
+    employment = Thing('V567', 'employment', 'relation')
+    graph.add_node(person, type='person', solution=0)
+    graph.add_node(employment, type='employment', solution=0)
+    graph.add_edge(employment, person, type='employee', solution=0)
+    return graph
+
+
+class TestSubgraphCache(GraphTestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = SubgraphCache(self.cache_dir, database='diagnosis', infer=True)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_key_is_the_same_for_identical_query_handles(self):
+        self.assertEqual(self.cache.key(make_query_handles()), self.cache.key(make_query_handles()))
+
+    def test_key_differs_when_any_part_of_the_query_handles_differs(self):
+        key = self.cache.key(make_query_handles())
+        self.assertNotEqual(key, self.cache.key(make_query_handles(query='match $x isa disease;')))
+        self.assertNotEqual(key, self.cache.key(make_query_handles(sampler=first_answer_sampler)))
+        self.assertNotEqual(key, self.cache.key(make_query_handles(solution=2)))
+
+    def test_key_differs_for_database_and_infer(self):
+        key = self.cache.key(make_query_handles())
+        other_database = SubgraphCache(self.cache_dir, database='other', infer=True)
+        no_inference = SubgraphCache(self.cache_dir, database='diagnosis', infer=False)
+        self.assertNotEqual(key, other_database.key(make_query_handles()))
+        self.assertNotEqual(key, no_inference.key(make_query_handles()))
+
+    def test_load_returns_none_when_not_cached(self):
+        self.assertIsNone(self.cache.load(make_query_handles()))
+
+    def test_saved_graph_is_loaded_as_expected(self):
+        self.cache.save(make_query_handles(), make_graph())
+
+        reloaded_cache = SubgraphCache(self.cache_dir, database='diagnosis', infer=True)
+        self.assertGraphsEqual(make_graph(), reloaded_cache.load(make_query_handles()))
+
+    def test_graph_is_only_built_when_not_cached(self):
+        built = []
+
+        def build(query_handles):
+            built.append(query_handles)
+            return make_graph()
+
+        first = self.cache.get_or_build(make_query_handles(), build)
+        second = self.cache.get_or_build(make_query_handles(), build)
+
+        self.assertEqual(1, len(built))
+        self.assertGraphsEqual(first, second)
+
+    def test_only_uncached_graphs_are_built_in_order(self):
+        self.cache.save(make_query_handles(solution=1), make_graph())
+        built = []
+
+        def build_many(query_handles_per_example):
+            built.extend(query_handles_per_example)
+            return [nx.MultiDiGraph(name=query_handles[0][0]) for query_handles in query_handles_per_example]
+
+        graphs = self.cache.get_or_build_many(
+            [make_query_handles(query='a'), make_query_handles(solution=1), make_query_handles(query='b')], build_many)
+
+        self.assertEqual(['a', 'b'], [query_handles[0][0] for query_handles in built])
+        self.assertEqual('a', graphs[0].name)
+        self.assertGraphsEqual(make_graph(), graphs[1])
+        self.assertEqual('b', graphs[2].name)
+
+
+if __name__ == "__main__":
+    unittest.main()